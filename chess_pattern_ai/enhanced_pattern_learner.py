@@ -580,11 +580,11 @@ class EnhancedPatternLearner:
     
     def _evaluate_center_control(self, board: chess.Board) -> str:
         """Evaluate center control"""
-        center_squares = [chess.D4, chess.D5, chess.E4, chess.E5]
+        center_squares = chess.SquareSet(chess.BB_CENTER)
         our_control = sum(1 for sq in center_squares 
-                         if board.attackers(board.turn, sq))
+                         if board.attackers_mask(board.turn, sq))
         their_control = sum(1 for sq in center_squares 
-                           if board.attackers(not board.turn, sq))
+                           if board.attackers_mask(not board.turn, sq))
         
         if our_control > their_control:
             return 'dominant'
@@ -595,12 +595,9 @@ class EnhancedPatternLearner:
     
     def _evaluate_development(self, board: chess.Board) -> str:
         """Evaluate development phase"""
-        # Count developed pieces (simplified)
-        developed = 0
-        for square, piece in board.piece_map().items():
-            if piece.color == board.turn and piece.piece_type in [chess.KNIGHT, chess.BISHOP]:
-                if chess.square_rank(square) not in [0, 7]:  # Moved from back rank
-                    developed += 1
+        # Count developed pieces (simplified): knights and bishops off the back ranks
+        minor_pieces = (board.knights | board.bishops) & board.occupied_co[board.turn]
+        developed = chess.popcount(minor_pieces & ~chess.BB_BACKRANKS)
         
         if developed >= 3:
             return 'developed'
@@ -85,7 +85,6 @@ class PositionClusteringIntegrator:
 
         # 2. Piece activity (average centralization)
         activity = 0
-        center_squares = [chess.D4, chess.D5, chess.E4, chess.E5]
         for square in chess.SQUARES:
             piece = board.piece_at(square)
             if piece and piece.piece_type != chess.KING:
@@ -147,12 +146,8 @@ class PositionClusteringIntegrator:
         features.append(white_control / 40)
 
         # 8. Center control (d4, d5, e4, e5)
-        center_control = 0
-        center_squares = [chess.D4, chess.D5, chess.E4, chess.E5]
-        for sq in center_squares:
-            piece = board.piece_at(sq)
-            if piece:
-                center_control += 1 if piece.color == chess.WHITE else -1
+        center_control = (chess.popcount(board.occupied_co[chess.WHITE] & chess.BB_CENTER) -
+                          chess.popcount(board.occupied_co[chess.BLACK] & chess.BB_CENTER))
         features.append(center_control)
 
         # 9. Position openness (open files)
@@ -234,8 +234,8 @@ class IntegratedChessAI:
         for square in chess.SQUARES:
             piece = board.piece_at(square)
             if piece and piece.color == perspective:
-                attackers = len(list(board.attackers(not perspective, square)))
-                defenders = len(list(board.attackers(perspective, square)))
+                attackers = chess.popcount(board.attackers_mask(not perspective, square))
+                defenders = chess.popcount(board.attackers_mask(perspective, square))
 
                 if attackers > defenders:
                     piece_value = self.material_evaluator.piece_values.get(
@@ -8,6 +8,7 @@ No hardcoded chess knowledge - pure statistical learning.
 import sqlite3
 import logging
 import sys
+import chess
 from typing import Dict, List, Tuple
 from collections import defaultdict
 from dataclasses import dataclass
@@ -46,6 +47,18 @@ class MobilityEvaluator:
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
 
+        # Tune for a read-heavy discovery workload with batched writes:
+        # WAL lets readers proceed during writes and NORMAL sync only fsyncs
+        # at checkpoints (a crash may lose the last transaction, never
+        # corrupt the db). Temp tables/sorts (ORDER BY RANDOM()) stay in
+        # memory, and the file is memory-mapped (256MB) with a 64MB cache.
+        if self.db_path != ':memory:':
+            self.cursor.execute('PRAGMA journal_mode=WAL')
+        self.cursor.execute('PRAGMA synchronous=NORMAL')
+        self.cursor.execute('PRAGMA temp_store=MEMORY')
+        self.cursor.execute('PRAGMA mmap_size=268435456')
+        self.cursor.execute('PRAGMA cache_size=-65536')
+
     def discover_mobility_correlation(self) -> MobilityDiscovery:
         """
         Discover fine-grained mobility patterns: which pieces on which squares have good mobility.
@@ -75,7 +88,11 @@ class MobilityEvaluator:
             'total_value': 0.0
         })
 
-        import chess
+        # Bind hot-loop module attributes to locals once
+        SQUARES = chess.SQUARES
+        WHITE = chess.WHITE
+        BLACK = chess.BLACK
+        square_name = chess.square_name
 
         for game_id, result in games:
             # Sample positions from the game
@@ -88,6 +105,7 @@ class MobilityEvaluator:
             ''', (game_id,))
 
             positions = self.cursor.fetchall()
+            winner = WHITE if result == '1-0' else BLACK
 
             for fen, move_num in positions:
                 try:
@@ -101,33 +119,28 @@ class MobilityEvaluator:
 
                     board = chess.Board(fen)
 
-                    # Analyze mobility for each piece
-                    for square in chess.SQUARES:
-                        piece = board.piece_at(square)
-                        if piece is None:
-                            continue
-
-                        # Count squares this piece can move to
-                        piece_moves = [m for m in board.legal_moves if m.from_square == square]
-                        num_squares = len(piece_moves)
+                    # Count legal moves per origin square in a single move
+                    # generation pass (only the side to move has any)
+                    moves_from = [0] * 64
+                    for move in board.legal_moves:
+                        moves_from[move.from_square] += 1
 
+                    # Analyze mobility for each piece
+                    for square in SQUARES:
+                        num_squares = moves_from[square]
                         if num_squares == 0:
                             continue
 
+                        piece = board.piece_at(square)
+
                         # Create fine-grained pattern signature
                         piece_type = piece.symbol().upper()
-                        square_name = chess.square_name(square)
 
                         # FIXED: Fine-grained pattern instead of just counting total moves
-                        pattern_sig = f"{piece_type}_on_{square_name}_controls_{num_squares}_squares_{phase}"
+                        pattern_sig = f"{piece_type}_on_{square_name(square)}_controls_{num_squares}_squares_{phase}"
 
-                        # Determine if this is a winning or losing position for the piece's side
-                        side_to_move = 'white' if fen.split()[1] == 'w' else 'black'
-                        piece_side = 'white' if piece.color == chess.WHITE else 'black'
-
-                        # Track pattern outcome
-                        is_winning = (piece_side == 'white' and result == '1-0') or \
-                                    (piece_side == 'black' and result == '0-1')
+                        # Track pattern outcome for the piece's side
+                        is_winning = piece.color == winner
 
                         if is_winning:
                             mobility_patterns[pattern_sig]['wins'] += 1
@@ -313,28 +326,24 @@ class MobilityEvaluator:
     def evaluate_mobility(self, fen: str) -> float:
         """
         Evaluate mobility for a position.
-        Returns RELATIVE mobility advantage (white_mobility - black_mobility).
+        Returns RELATIVE mobility advantage (white_mobility - black_mobility),
+        measured in pseudo-legal moves.
         Phase-specific weighting is applied by TemporalEvaluator.
         """
         if not self.mobility_weight:
             # Load from database
             self._load_mobility_weight()
 
-        # Parse FEN to get current side to move
-        import chess
         board = chess.Board(fen)
 
-        # Calculate white's mobility
-        if board.turn == chess.WHITE:
-            white_mobility = len(list(board.legal_moves))
-            # Switch turn to calculate black's mobility
-            board.turn = chess.BLACK
-            black_mobility = len(list(board.legal_moves))
-        else:
-            black_mobility = len(list(board.legal_moves))
-            # Switch turn to calculate white's mobility
-            board.turn = chess.WHITE
-            white_mobility = len(list(board.legal_moves))
+        # Count pseudo-legal moves for each side. This skips the pin/check
+        # filtering of full legal move generation, so it is an approximation
+        # (moves that would leave the king in check are counted), which is
+        # fine for a statistical mobility heuristic.
+        board.turn = chess.WHITE
+        white_mobility = board.pseudo_legal_moves.count()
+        board.turn = chess.BLACK
+        black_mobility = board.pseudo_legal_moves.count()
 
         # CRITICAL FIX: Return RELATIVE mobility (white - black), not absolute!
         # This ensures equal positions score 0, not +20
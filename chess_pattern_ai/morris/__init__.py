@@ -16,8 +16,8 @@ Perfect for testing pattern learning because:
 - Mill formation is naturally pattern-based
 """
 
-from .morris_board import MorrisBoard, Piece, Color
+from .morris_board import MorrisBoard, Color
 from .morris_game import MorrisGame
 from .morris_scorer import MorrisScorer
 
-__all__ = ['MorrisBoard', 'Piece', 'Color', 'MorrisGame', 'MorrisScorer']
+__all__ = ['MorrisBoard', 'Color', 'MorrisGame', 'MorrisScorer']
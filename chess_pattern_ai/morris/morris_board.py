@@ -23,11 +23,118 @@ Positions 0-23 arranged in 3 concentric squares:
 - Inner ring: 16, 17, 18, 19, 20, 21, 22, 23
 """
 
-from typing import Tuple, Optional, List, Set
-from dataclasses import dataclass
+import random
+from typing import Iterator, Tuple, Optional, List, Set
 from enum import Enum
 
 
+def _popcount(bb: int) -> int:
+    """Number of set bits in a bitboard"""
+    return bin(bb).count('1')
+
+
+def bitboard_positions(bb: int) -> List[int]:
+    """Positions of the set bits in a bitboard, lowest first"""
+    positions = []
+    while bb:
+        lsb = bb & -bb
+        positions.append(lsb.bit_length() - 1)
+        bb ^= lsb
+    return positions
+
+
+def _zobrist_table() -> Tuple[Tuple[int, int], ...]:
+    """Random 64-bit keys per (position, white/black), fixed seed for stable hashes"""
+    rng = random.Random(0x4D4F5252)
+    return tuple((rng.getrandbits(64), rng.getrandbits(64)) for _ in range(24))
+
+
+# ZOBRIST[pos][0] keys a white piece at pos, ZOBRIST[pos][1] a black piece
+ZOBRIST = _zobrist_table()
+
+
+# Board geometry lookup tables, built once at import
+
+# Define adjacency graph (which positions connect to which),
+# indexed by position
+ADJACENCIES = (
+    (1, 7), (0, 2, 9), (1, 3),
+    (2, 11), (5, 11), (4, 6, 13),
+    (5, 7), (0, 6, 15), (9, 15),
+    (1, 8, 10, 17), (9, 11), (3, 4, 10, 19),
+    (13, 19), (5, 12, 14, 21), (13, 15),
+    (7, 8, 14, 23), (17, 23), (9, 16, 18),
+    (17, 19), (11, 12, 18), (21, 19),
+    (13, 20, 22), (21, 23), (15, 16, 22)
+)
+
+# Adjacency as bitboards: ADJACENCY_BB[pos] has a bit set per neighbor
+ADJACENCY_BB = tuple(sum(1 << n for n in neighbors) for neighbors in ADJACENCIES)
+
+# Bitboard with all 24 positions set
+ALL_POSITIONS = (1 << 24) - 1
+
+# Define all possible mills (3 in a row)
+MILLS = (
+    # Outer square
+    (0, 1, 2), (2, 3, 4), (4, 5, 6), (6, 7, 0),
+    # Middle square
+    (8, 9, 10), (10, 11, 12), (12, 13, 14), (14, 15, 8),
+    # Inner square
+    (16, 17, 18), (18, 19, 20), (20, 21, 22), (22, 23, 16),
+    # Connecting lines (vertical)
+    (1, 9, 17), (3, 11, 19), (5, 13, 21), (7, 15, 23)
+)
+
+# Each mill as a 24-bit mask (bit n = position n)
+MILL_MASKS = tuple(sum(1 << p for p in mill) for mill in MILLS)
+
+# Indices of the mills passing through each position
+MILLS_AT = tuple(tuple(i for i, mill in enumerate(MILLS) if pos in mill)
+                 for pos in range(24))
+
+# Same as MILLS_AT, as a bitmask over mill indices
+MILL_BITS_AT = tuple(sum(1 << i for i in mills) for mills in MILLS_AT)
+
+# (mill bit, mill mask) pairs for the mills through each position
+_MILL_UPDATES_AT = tuple(tuple((1 << i, MILL_MASKS[i]) for i in mills)
+                         for mills in MILLS_AT)
+
+
+# Plain-int board primitives, usable on bitboards without a MorrisBoard
+
+def completes_mill(bb: int, pos: int) -> bool:
+    """Check if bitboard bb holds a complete mill through pos"""
+    for _, mask in _MILL_UPDATES_AT[pos]:
+        if bb & mask == mask:
+            return True
+    return False
+
+
+def potential_mill_counts(white_bb: int, black_bb: int,
+                          pieces_needed: int) -> Tuple[int, int]:
+    """
+    Count potential mills for both colors (see
+    MorrisBoard.count_potential_mills) in a single sweep over the mills.
+
+    Returns (white_count, black_count).
+    """
+    have = 3 - pieces_needed
+    white_count = black_count = 0
+
+    for mask in MILL_MASKS:
+        white_in_mill = white_bb & mask
+        black_in_mill = black_bb & mask
+        if not black_in_mill:
+            if _popcount(white_in_mill) == have:
+                white_count += 1
+        elif not white_in_mill:
+            if _popcount(black_in_mill) == have:
+                black_count += 1
+
+    return white_count, black_count
+
+
 class Color(Enum):
     """Piece colors"""
     WHITE = "W"
@@ -38,25 +145,12 @@ class Color(Enum):
 
     def opposite(self):
         """Get opposite color"""
-        return Color.BLACK if self == Color.WHITE else Color.WHITE
-
+        return OPPOSITE[self]
 
-@dataclass(frozen=True)
-class Piece:
-    """Immutable piece representation"""
-    color: Color
-    position: int  # 0-23
 
-    def __hash__(self):
-        return hash((self.color, self.position))
-
-    def __eq__(self, other):
-        if not isinstance(other, Piece):
-            return False
-        return self.color == other.color and self.position == other.position
-
-    def __str__(self):
-        return str(self.color)
+# Opposite of each color, for hot paths that switch sides (a dict lookup
+# instead of a method call)
+OPPOSITE = {Color.WHITE: Color.BLACK, Color.BLACK: Color.WHITE}
 
 
 class MorrisBoard:
@@ -67,49 +161,58 @@ class MorrisBoard:
     Mills (3 in a row) allow removing opponent pieces.
     """
 
-    # Define adjacency graph (which positions connect to which)
-    ADJACENCIES = {
-        0: [1, 7], 1: [0, 2, 9], 2: [1, 3],
-        3: [2, 11], 4: [5, 11], 5: [4, 6, 13],
-        6: [5, 7], 7: [0, 6, 15], 8: [9, 15],
-        9: [1, 8, 10, 17], 10: [9, 11], 11: [3, 4, 10, 19],
-        12: [13, 19], 13: [5, 12, 14, 21], 14: [13, 15],
-        15: [7, 8, 14, 23], 16: [17, 23], 17: [9, 16, 18],
-        18: [17, 19], 19: [11, 12, 18], 20: [21, 19],
-        21: [13, 20, 22], 22: [21, 23], 23: [15, 16, 22]
-    }
-
-    # Define all possible mills (3 in a row)
-    MILLS = [
-        # Outer square
-        [0, 1, 2], [2, 3, 4], [4, 5, 6], [6, 7, 0],
-        # Middle square
-        [8, 9, 10], [10, 11, 12], [12, 13, 14], [14, 15, 8],
-        # Inner square
-        [16, 17, 18], [18, 19, 20], [20, 21, 22], [22, 23, 16],
-        # Connecting lines (vertical)
-        [1, 9, 17], [3, 11, 19], [5, 13, 21], [7, 15, 23]
-    ]
+    # Geometry tables (module-level, exposed on the class for convenience)
+    ADJACENCIES = ADJACENCIES
+    ADJACENCY_BB = ADJACENCY_BB
+    ALL_POSITIONS = ALL_POSITIONS
+    MILLS = MILLS
+    MILL_MASKS = MILL_MASKS
+    MILLS_AT = MILLS_AT
+    MILL_BITS_AT = MILL_BITS_AT
 
     def __init__(self):
         """Initialize empty board"""
-        self.positions = [None] * 24  # 24 positions, None = empty
-        self.pieces_white = []
-        self.pieces_black = []
+        # Board state: one 24-bit bitboard of occupied positions per color
+        self.white_bb = 0
+        self.black_bb = 0
+        # Bitmasks over MILLS of the complete mills per color, updated
+        # incrementally on every mutation
+        self.white_mills = 0
+        self.black_mills = 0
+        # Zobrist hash of the piece placement, updated incrementally
+        self.zobrist_key = 0
 
     def copy(self):
         """Create a deep copy of the board"""
-        new_board = MorrisBoard()
-        new_board.positions = self.positions.copy()
-        new_board.pieces_white = self.pieces_white.copy()
-        new_board.pieces_black = self.pieces_black.copy()
+        # The state is five ints: skip __init__ and copy them directly
+        new_board = MorrisBoard.__new__(MorrisBoard)
+        new_board.white_bb = self.white_bb
+        new_board.black_bb = self.black_bb
+        new_board.white_mills = self.white_mills
+        new_board.black_mills = self.black_mills
+        new_board.zobrist_key = self.zobrist_key
         return new_board
 
-    def get_piece(self, pos: int) -> Optional[Piece]:
-        """Get piece at position (0-23)"""
+    def save_state(self) -> Tuple[int, int, int, int, int]:
+        """Snapshot the board state (for make/unmake)"""
+        return (self.white_bb, self.black_bb, self.white_mills,
+                self.black_mills, self.zobrist_key)
+
+    def restore_state(self, state: Tuple[int, int, int, int, int]):
+        """Restore a snapshot taken by save_state"""
+        (self.white_bb, self.black_bb, self.white_mills,
+         self.black_mills, self.zobrist_key) = state
+
+    def get_color(self, pos: int) -> Optional[Color]:
+        """Get color of the piece at position (0-23), None if empty"""
         if not (0 <= pos < 24):
             return None
-        return self.positions[pos]
+        bit = 1 << pos
+        if self.white_bb & bit:
+            return Color.WHITE
+        if self.black_bb & bit:
+            return Color.BLACK
+        return None
 
     def place_piece(self, pos: int, color: Color) -> bool:
         """
@@ -118,17 +221,18 @@ class MorrisBoard:
         """
         if not (0 <= pos < 24):
             return False
-        if self.positions[pos] is not None:
+        bit = 1 << pos
+        if (self.white_bb | self.black_bb) & bit:
             return False
 
-        piece = Piece(color, pos)
-        self.positions[pos] = piece
-
         if color == Color.WHITE:
-            self.pieces_white.append(piece)
+            self.white_bb |= bit
+            self.zobrist_key ^= ZOBRIST[pos][0]
         else:
-            self.pieces_black.append(piece)
+            self.black_bb |= bit
+            self.zobrist_key ^= ZOBRIST[pos][1]
 
+        self._update_mills(pos, color)
         return True
 
     def move_piece(self, from_pos: int, to_pos: int) -> bool:
@@ -139,25 +243,24 @@ class MorrisBoard:
         if not (0 <= from_pos < 24 and 0 <= to_pos < 24):
             return False
 
-        piece = self.positions[from_pos]
-        if piece is None:
-            return False
-        if self.positions[to_pos] is not None:
+        from_bit = 1 << from_pos
+        to_bit = 1 << to_pos
+        if (self.white_bb | self.black_bb) & to_bit:
             return False
 
-        # Update board
-        self.positions[from_pos] = None
-        new_piece = Piece(piece.color, to_pos)
-        self.positions[to_pos] = new_piece
-
-        # Update piece lists
-        if piece.color == Color.WHITE:
-            self.pieces_white.remove(piece)
-            self.pieces_white.append(new_piece)
+        if self.white_bb & from_bit:
+            color = Color.WHITE
+            self.white_bb ^= from_bit | to_bit
+            self.zobrist_key ^= ZOBRIST[from_pos][0] ^ ZOBRIST[to_pos][0]
+        elif self.black_bb & from_bit:
+            color = Color.BLACK
+            self.black_bb ^= from_bit | to_bit
+            self.zobrist_key ^= ZOBRIST[from_pos][1] ^ ZOBRIST[to_pos][1]
         else:
-            self.pieces_black.remove(piece)
-            self.pieces_black.append(new_piece)
+            return False
 
+        self._update_mills(from_pos, color)
+        self._update_mills(to_pos, color)
         return True
 
     def remove_piece(self, pos: int) -> bool:
@@ -168,46 +271,67 @@ class MorrisBoard:
         if not (0 <= pos < 24):
             return False
 
-        piece = self.positions[pos]
-        if piece is None:
+        bit = 1 << pos
+        if self.white_bb & bit:
+            color = Color.WHITE
+            self.white_bb ^= bit
+            self.zobrist_key ^= ZOBRIST[pos][0]
+        elif self.black_bb & bit:
+            color = Color.BLACK
+            self.black_bb ^= bit
+            self.zobrist_key ^= ZOBRIST[pos][1]
+        else:
             return False
 
-        self.positions[pos] = None
+        self._update_mills(pos, color)
+        return True
 
-        if piece.color == Color.WHITE:
-            self.pieces_white.remove(piece)
+    def _update_mills(self, pos: int, color: Color):
+        """Refresh the cached mill bits for the mills through pos"""
+        if color == Color.WHITE:
+            bb, mills = self.white_bb, self.white_mills
         else:
-            self.pieces_black.remove(piece)
+            bb, mills = self.black_bb, self.black_mills
 
-        return True
+        for mill_bit, mask in _MILL_UPDATES_AT[pos]:
+            if bb & mask == mask:
+                mills |= mill_bit
+            else:
+                mills &= ~mill_bit
+
+        if color == Color.WHITE:
+            self.white_mills = mills
+        else:
+            self.black_mills = mills
 
-    def get_adjacent_positions(self, pos: int) -> List[int]:
-        """Get list of positions adjacent to pos"""
-        return self.ADJACENCIES.get(pos, [])
+    def get_adjacent_positions(self, pos: int) -> Tuple[int, ...]:
+        """Get positions adjacent to pos"""
+        return ADJACENCIES[pos] if 0 <= pos < 24 else ()
 
     def is_mill(self, pos: int, color: Color) -> bool:
         """
         Check if placing/moving to position completes a mill for color.
         A mill is 3 of the same color in a row.
         """
-        for mill in self.MILLS:
-            if pos in mill:
-                # Check if all 3 positions in mill have pieces of this color
-                if all(self.positions[p] is not None and
-                       self.positions[p].color == color
-                       for p in mill):
-                    return True
-        return False
+        if not (0 <= pos < 24):
+            return False
+        mills = self.white_mills if color == Color.WHITE else self.black_mills
+        return bool(mills & MILL_BITS_AT[pos])
+
+    def would_form_mill(self, to_pos: int, color: Color,
+                        from_pos: Optional[int] = None) -> bool:
+        """
+        Check if color placing at to_pos (or moving from_pos → to_pos) would
+        complete a mill, without changing the board.
+        """
+        bb = self.white_bb if color == Color.WHITE else self.black_bb
+        if from_pos is not None:
+            bb &= ~(1 << from_pos)
+        return completes_mill(bb | 1 << to_pos, to_pos)
 
     def count_mills(self, color: Color) -> int:
         """Count number of complete mills for a color"""
-        count = 0
-        for mill in self.MILLS:
-            if all(self.positions[p] is not None and
-                   self.positions[p].color == color
-                   for p in mill):
-                count += 1
-        return count
+        return _popcount(self.white_mills if color == Color.WHITE else self.black_mills)
 
     def count_potential_mills(self, color: Color, pieces_needed: int) -> int:
         """
@@ -217,63 +341,115 @@ class MorrisBoard:
         pieces_needed=1: Has 2 pieces, needs 1 more (strong threat)
         pieces_needed=2: Has 1 piece, needs 2 more (weak threat)
         """
-        count = 0
-        for mill in self.MILLS:
-            my_pieces = sum(1 for p in mill
-                          if self.positions[p] is not None and
-                          self.positions[p].color == color)
-            opp_pieces = sum(1 for p in mill
-                           if self.positions[p] is not None and
-                           self.positions[p].color == color.opposite())
+        my_bb = self.get_bitboard(color)
+        opp_bb = self.get_bitboard(OPPOSITE[color])
+        have = 3 - pieces_needed
 
-            # Potential mill if we have (3-pieces_needed) pieces and no opponent pieces
-            if my_pieces == (3 - pieces_needed) and opp_pieces == 0:
-                count += 1
+        # Potential mill if we have (3-pieces_needed) pieces and no opponent pieces
+        return sum(1 for mask in MILL_MASKS
+                   if not opp_bb & mask and _popcount(my_bb & mask) == have)
+
+    def count_potential_mills_by_color(self, pieces_needed: int) -> Tuple[int, int]:
+        """
+        Count potential mills (see count_potential_mills) for both colors in
+        a single sweep over the mills.
+
+        Returns (white_count, black_count).
+        """
+        return potential_mill_counts(self.white_bb, self.black_bb, pieces_needed)
 
-        return count
+    def count_potential_mills_both(self, color: Color) -> Tuple[int, int]:
+        """
+        Count potential mills (see count_potential_mills) needing 1 and
+        needing 2 more pieces for color, in a single sweep over the mills.
 
-    def get_pieces(self, color: Color) -> List[Piece]:
-        """Get all pieces of a color"""
-        return self.pieces_white if color == Color.WHITE else self.pieces_black
+        Returns (needs_one_count, needs_two_count).
+        """
+        if color == Color.WHITE:
+            my_bb, opp_bb = self.white_bb, self.black_bb
+        else:
+            my_bb, opp_bb = self.black_bb, self.white_bb
+        needs_one = needs_two = 0
+
+        for mask in MILL_MASKS:
+            mine = my_bb & mask
+            if mine and not opp_bb & mask:
+                # Mills holding 3 of ours are complete, not potential
+                have = _popcount(mine)
+                if have == 2:
+                    needs_one += 1
+                elif have == 1:
+                    needs_two += 1
+
+        return needs_one, needs_two
+
+    def get_bitboard(self, color: Color) -> int:
+        """Get bitboard of positions occupied by a color"""
+        return self.white_bb if color == Color.WHITE else self.black_bb
+
+    def get_pieces(self, color: Color) -> Iterator[int]:
+        """Yield the positions of a color's pieces, in position order"""
+        bb = self.white_bb if color == Color.WHITE else self.black_bb
+        while bb:
+            lsb = bb & -bb
+            yield lsb.bit_length() - 1
+            bb ^= lsb
 
     def get_empty_positions(self) -> List[int]:
         """Get all empty positions"""
-        return [i for i in range(24) if self.positions[i] is None]
+        return bitboard_positions(self.get_empty_bitboard())
+
+    def get_empty_bitboard(self) -> int:
+        """Get bitboard of empty positions"""
+        return ~(self.white_bb | self.black_bb) & ALL_POSITIONS
+
+    def has_adjacent_move(self, color: Color) -> bool:
+        """Check if any piece of color has an empty adjacent position"""
+        bb = self.white_bb if color == Color.WHITE else self.black_bb
+        empty = ALL_POSITIONS & ~(self.white_bb | self.black_bb)
+        while bb:
+            lsb = bb & -bb
+            if ADJACENCY_BB[lsb.bit_length() - 1] & empty:
+                return True
+            bb ^= lsb
+        return False
 
     def count_pieces(self, color: Color) -> int:
         """Count pieces of a color on board"""
-        return len(self.get_pieces(color))
+        return _popcount(self.get_bitboard(color))
 
     def get_removable_pieces(self, color: Color) -> List[int]:
         """
         Get opponent pieces that can be removed.
         Pieces in mills can only be removed if all opponent pieces are in mills.
         """
-        opponent_pieces = self.get_pieces(color.opposite())
-        opponent_positions = [p.position for p in opponent_pieces]
-
-        # Find pieces not in mills
-        not_in_mill = []
-        in_mill = []
-
-        for pos in opponent_positions:
-            if self.is_mill(pos, color.opposite()):
-                in_mill.append(pos)
-            else:
-                not_in_mill.append(pos)
+        opponent = OPPOSITE[color]
+        opp_bb = self.get_bitboard(opponent)
+        mill_squares = self.get_mill_squares(opponent)
 
         # If any pieces are not in mills, only those can be removed
+        not_in_mill = opp_bb & ~mill_squares
         if not_in_mill:
-            return not_in_mill
+            return bitboard_positions(not_in_mill)
         else:
             # All pieces are in mills, can remove any
-            return in_mill
+            return bitboard_positions(opp_bb)
+
+    def get_mill_squares(self, color: Color) -> int:
+        """Get bitboard of positions that are part of a complete mill for color"""
+        mills = self.white_mills if color == Color.WHITE else self.black_mills
+        squares = 0
+        while mills:
+            lsb = mills & -mills
+            squares |= MILL_MASKS[lsb.bit_length() - 1]
+            mills ^= lsb
+        return squares
 
     def to_string(self) -> str:
         """Convert board to string representation"""
         def piece_str(pos):
-            p = self.positions[pos]
-            return p.color.value if p else str(pos) if pos < 10 else chr(ord('A') + pos - 10)
+            color = self.get_color(pos)
+            return color.value if color else str(pos) if pos < 10 else chr(ord('A') + pos - 10)
 
         lines = []
         lines.append(f"{piece_str(0)} -------- {piece_str(1)} -------- {piece_str(2)}")
@@ -10,9 +10,9 @@ Mill Formation: Getting 3 in a row allows removing an opponent piece
 Win Conditions: Reduce opponent to 2 pieces OR block all their moves
 """
 
-from typing import Tuple, List, Optional, Union
+from typing import Iterator, Tuple, List, Optional
 from enum import Enum
-from .morris_board import MorrisBoard, Color, Piece
+from .morris_board import MorrisBoard, Color, OPPOSITE, ADJACENCY_BB, bitboard_positions
 
 
 class GamePhase(Enum):
@@ -22,49 +22,55 @@ class GamePhase(Enum):
     FLYING = "flying"
 
 
-class MorrisMove:
-    """
-    Represents a Morris move.
+# Moves are packed into a single int:
+#   bits 0-4:  target position (placement, removal, or movement destination)
+#   bits 5-9:  origin position (movement/flying only)
+#   bit 10:    placement flag
+#   bit 11:    removal flag (removing an opponent piece after a mill)
+MOVE_POS_MASK = 0x1F
+MOVE_FROM_SHIFT = 5
+MOVE_PLACEMENT = 1 << 10
+MOVE_REMOVAL = 1 << 11
 
-    Placement phase: (position,)
-    Movement phase: (from_pos, to_pos)
-    Remove piece: (remove_pos,) - happens after forming a mill
-    """
 
-    def __init__(self, *args):
-        if len(args) == 1:
-            # Placement or removal
-            self.is_placement = True
-            self.is_removal = False
-            self.position = args[0]
-            self.from_pos = None
-            self.to_pos = None
-        elif len(args) == 2:
-            # Movement
-            self.is_placement = False
-            self.is_removal = False
-            self.from_pos = args[0]
-            self.to_pos = args[1]
-            self.position = None
-        else:
-            raise ValueError("Invalid move format")
+def placement_move(pos: int) -> int:
+    """Encode placing a piece at pos"""
+    return MOVE_PLACEMENT | pos
 
-    def __repr__(self):
-        if self.is_placement:
-            return f"Place({self.position})"
-        else:
-            return f"Move({self.from_pos}→{self.to_pos})"
 
-    def __eq__(self, other):
-        if not isinstance(other, MorrisMove):
-            return False
-        return (self.is_placement == other.is_placement and
-                self.position == other.position and
-                self.from_pos == other.from_pos and
-                self.to_pos == other.to_pos)
+def movement_move(from_pos: int, to_pos: int) -> int:
+    """Encode moving (or flying) a piece from from_pos to to_pos"""
+    return (from_pos << MOVE_FROM_SHIFT) | to_pos
+
 
-    def __hash__(self):
-        return hash((self.is_placement, self.position, self.from_pos, self.to_pos))
+def removal_move(pos: int) -> int:
+    """Encode removing the opponent piece at pos"""
+    return MOVE_REMOVAL | pos
+
+
+def decode_move(move: int) -> Tuple[bool, bool, Optional[int], Optional[int], Optional[int]]:
+    """
+    Decode a packed move.
+
+    Returns (is_placement, is_removal, position, from_pos, to_pos), where
+    position is set for placements/removals and from_pos/to_pos for movement.
+    """
+    pos = move & MOVE_POS_MASK
+    if move & MOVE_PLACEMENT:
+        return True, False, pos, None, None
+    if move & MOVE_REMOVAL:
+        return False, True, pos, None, None
+    return False, False, None, (move >> MOVE_FROM_SHIFT) & MOVE_POS_MASK, pos
+
+
+def move_to_str(move: int) -> str:
+    """Human-readable form of a packed move"""
+    is_placement, is_removal, position, from_pos, to_pos = decode_move(move)
+    if is_placement:
+        return f"Place({position})"
+    if is_removal:
+        return f"Remove({position})"
+    return f"Move({from_pos}→{to_pos})"
 
 
 class MorrisGame:
@@ -82,21 +88,24 @@ class MorrisGame:
         self.white_pieces_placed = 0
         self.black_pieces_placed = 0
 
-        # Phase tracking
+        # Phase tracking: recomputed by make_move whenever the turn passes,
+        # with its string form cached for pattern keys
         self.phase = GamePhase.PLACEMENT
+        self.phase_str = self.phase.value
         self.pending_removal = False  # True if mill formed, need to remove piece
 
     def copy(self):
         """Create a copy of the game state"""
-        new_game = MorrisGame(
-            board=self.board.copy(),
-            current_player=self.current_player
-        )
+        # Every attribute is copied below, so skip __init__
+        new_game = MorrisGame.__new__(MorrisGame)
+        new_game.board = self.board.copy()
+        new_game.current_player = self.current_player
         new_game.winner = self.winner
         new_game.is_draw = self.is_draw
         new_game.white_pieces_placed = self.white_pieces_placed
         new_game.black_pieces_placed = self.black_pieces_placed
         new_game.phase = self.phase
+        new_game.phase_str = self.phase_str
         new_game.pending_removal = self.pending_removal
         return new_game
 
@@ -111,116 +120,145 @@ class MorrisGame:
 
         return GamePhase.MOVEMENT
 
-    def get_legal_moves(self) -> List[Union[MorrisMove, int]]:
+    def get_legal_moves(self) -> List[int]:
         """
         Generate all legal moves.
 
-        Returns list of MorrisMove objects or integers (for removal).
+        Returns list of packed int moves (see decode_move).
         """
+        return list(self.iter_legal_moves())
+
+    def iter_legal_moves(self) -> Iterator[int]:
+        """Yield legal packed int moves lazily (same order as get_legal_moves)"""
         if self.is_game_over():
-            return []
+            return
+
+        board = self.board
 
         # If mill was formed, must remove opponent piece
         if self.pending_removal:
-            removable = self.board.get_removable_pieces(self.current_player)
-            return removable  # Return positions that can be removed
+            for pos in board.get_removable_pieces(self.current_player):
+                yield MOVE_REMOVAL | pos
+            return
 
-        self.phase = self.get_game_phase()
+        empty = board.get_empty_bitboard()
 
         if self.phase == GamePhase.PLACEMENT:
-            return self._get_placement_moves()
-        elif self.phase == GamePhase.MOVEMENT:
-            return self._get_movement_moves()
-        else:  # FLYING
-            return self._get_flying_moves()
-
-    def _get_placement_moves(self) -> List[MorrisMove]:
-        """Get legal placement moves"""
-        empty = self.board.get_empty_positions()
-        return [MorrisMove(pos) for pos in empty]
-
-    def _get_movement_moves(self) -> List[MorrisMove]:
-        """Get legal movement moves (to adjacent positions)"""
-        moves = []
-        my_pieces = self.board.get_pieces(self.current_player)
-
-        for piece in my_pieces:
-            from_pos = piece.position
-            # Can move to adjacent empty positions
-            for to_pos in self.board.get_adjacent_positions(from_pos):
-                if self.board.get_piece(to_pos) is None:
-                    moves.append(MorrisMove(from_pos, to_pos))
-
-        return moves
-
-    def _get_flying_moves(self) -> List[MorrisMove]:
-        """Get legal flying moves (to any empty position)"""
-        moves = []
-        my_pieces = self.board.get_pieces(self.current_player)
-        empty = self.board.get_empty_positions()
-
-        for piece in my_pieces:
-            from_pos = piece.position
-            for to_pos in empty:
-                moves.append(MorrisMove(from_pos, to_pos))
-
-        return moves
-
-    def make_move(self, move: Union[MorrisMove, int]) -> 'MorrisGame':
+            for pos in bitboard_positions(empty):
+                yield MOVE_PLACEMENT | pos
+            return
+
+        flying = self.phase == GamePhase.FLYING
+        for from_pos in bitboard_positions(board.get_bitboard(self.current_player)):
+            # Flying pieces can go to any empty position, others only to
+            # adjacent empty positions
+            from_bits = from_pos << MOVE_FROM_SHIFT
+            targets = empty if flying else ADJACENCY_BB[from_pos] & empty
+            for to_pos in bitboard_positions(targets):
+                yield from_bits | to_pos
+
+    def forms_mill(self, move: int) -> bool:
+        """Check if a placement/movement move would form a mill for the player to move"""
+        if move & MOVE_REMOVAL:
+            return False
+        to_pos = move & MOVE_POS_MASK
+        if move & MOVE_PLACEMENT:
+            return self.board.would_form_mill(to_pos, self.current_player)
+        from_pos = (move >> MOVE_FROM_SHIFT) & MOVE_POS_MASK
+        return self.board.would_form_mill(to_pos, self.current_player, from_pos)
+
+    def make_move(self, move: int) -> 'MorrisGame':
         """
-        Execute a move and return new game state.
+        Execute a packed move and return new game state.
 
         Returns new MorrisGame (immutable-style).
         """
         new_game = self.copy()
+        new_game._apply_move(move)
+        return new_game
 
-        # Handle removal (if move is just an integer)
-        if isinstance(move, int):
-            if not new_game.pending_removal:
+    def apply_inplace(self, move: int) -> tuple:
+        """
+        Execute a packed move on this game state (make/unmake style).
+
+        Returns an undo token; pass it to undo() to restore the position.
+        Cheaper than make_move when the move is only being simulated.
+        """
+        token = (self.board.save_state(), self.current_player, self.winner,
+                 self.is_draw, self.white_pieces_placed, self.black_pieces_placed,
+                 self.phase, self.phase_str, self.pending_removal)
+        try:
+            self._apply_move(move)
+        except ValueError:
+            self.undo(token)
+            raise
+        return token
+
+    def undo(self, token: tuple):
+        """Restore the state saved by apply_inplace"""
+        (board_state, self.current_player, self.winner,
+         self.is_draw, self.white_pieces_placed, self.black_pieces_placed,
+         self.phase, self.phase_str, self.pending_removal) = token
+        self.board.restore_state(board_state)
+
+    def _apply_move(self, move: int):
+        """Execute a packed move on this game state"""
+        pos = move & MOVE_POS_MASK
+
+        # Handle removal
+        if move & MOVE_REMOVAL:
+            if not self.pending_removal:
                 raise ValueError("Not in removal state")
-            new_game.board.remove_piece(move)
-            new_game.pending_removal = False
+            self.board.remove_piece(pos)
+            self.pending_removal = False
             # Switch turns after removal
-            new_game.current_player = new_game.current_player.opposite()
-            new_game._check_game_over()
-            return new_game
+            self.current_player = OPPOSITE[self.current_player]
 
         # Handle placement
-        if move.is_placement:
-            success = new_game.board.place_piece(move.position, new_game.current_player)
+        elif move & MOVE_PLACEMENT:
+            success = self.board.place_piece(pos, self.current_player)
             if not success:
-                raise ValueError(f"Invalid placement: {move.position}")
+                raise ValueError(f"Invalid placement: {pos}")
 
             # Track placements
-            if new_game.current_player == Color.WHITE:
-                new_game.white_pieces_placed += 1
+            if self.current_player == Color.WHITE:
+                self.white_pieces_placed += 1
             else:
-                new_game.black_pieces_placed += 1
+                self.black_pieces_placed += 1
 
             # Check if mill formed
-            if new_game.board.is_mill(move.position, new_game.current_player):
-                new_game.pending_removal = True
+            if self.board.is_mill(pos, self.current_player):
+                self.pending_removal = True
                 # Don't switch turns yet - need to remove piece first
             else:
                 # Switch turns
-                new_game.current_player = new_game.current_player.opposite()
+                self.current_player = OPPOSITE[self.current_player]
 
         # Handle movement/flying
         else:
-            success = new_game.board.move_piece(move.from_pos, move.to_pos)
+            from_pos = (move >> MOVE_FROM_SHIFT) & MOVE_POS_MASK
+            success = self.board.move_piece(from_pos, pos)
             if not success:
-                raise ValueError(f"Invalid move: {move.from_pos} → {move.to_pos}")
+                raise ValueError(f"Invalid move: {from_pos} → {pos}")
 
             # Check if mill formed
-            if new_game.board.is_mill(move.to_pos, new_game.current_player):
-                new_game.pending_removal = True
+            if self.board.is_mill(pos, self.current_player):
+                self.pending_removal = True
                 # Don't switch turns yet
             else:
                 # Switch turns
-                new_game.current_player = new_game.current_player.opposite()
+                self.current_player = OPPOSITE[self.current_player]
 
-        new_game._check_game_over()
-        return new_game
+        # Turn passed to the other player: refresh the cached phase
+        if not self.pending_removal:
+            self._update_phase()
+
+        self._check_game_over()
+
+    def _update_phase(self):
+        """Recompute the cached phase for the current player"""
+        self.phase = self.get_game_phase()
+        self.phase_str = self.phase.value
 
     def _check_game_over(self):
         """Check if game is over"""
@@ -236,12 +274,12 @@ class MorrisGame:
             self.winner = Color.WHITE
             return
 
-        # Win by blocking all opponent moves (only in movement/flying phase)
-        if self.phase != GamePhase.PLACEMENT and not self.pending_removal:
-            legal_moves = self.get_legal_moves()
-            if not legal_moves:
+        # Win by blocking all opponent moves. Only possible in the movement
+        # phase: a flying player (3 pieces) always has an empty position to go to
+        if self.phase == GamePhase.MOVEMENT and not self.pending_removal:
+            if not self.board.has_adjacent_move(self.current_player):
                 # Current player has no moves → opponent wins
-                self.winner = self.current_player.opposite()
+                self.winner = OPPOSITE[self.current_player]
                 return
 
     def is_game_over(self) -> bool:
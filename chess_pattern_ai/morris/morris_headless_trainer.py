@@ -16,27 +16,75 @@ This observation-based learner discovers winning formations naturally.
 import sys
 import os
 import random
+import sqlite3
 import argparse
-from typing import List, Tuple, Optional, Union
+import multiprocessing
+from typing import List, Tuple, Optional
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from morris.morris_board import MorrisBoard, Color
-from morris.morris_game import MorrisGame, MorrisMove, GamePhase
-from morris.morris_scorer import MorrisScorer
-from learnable_move_prioritizer import LearnableMovePrioritizer
+from morris.morris_game import MorrisGame, GamePhase, MOVE_POS_MASK
+from morris.morris_scorer import MorrisScorer, RING_OF_POS, REMOVAL_DISTANCE_OF_POS
+
+
+# Move categories (see MorrisScorer.get_move_category) with the default
+# priority used for patterns that have not been learned yet
+DEFAULT_CATEGORY_PRIORITIES = (
+    ('form_mill', 95.0),
+    ('remove_piece', 90.0),
+    ('create_2mill', 75.0),
+    ('block_mill', 70.0),
+    ('flying', 60.0),
+    ('movement', 45.0),
+    ('placement', 40.0),
+    ('mobility', 30.0),
+    ('quiet', 30.0),
+)
+
+# Small int ids so a pattern key packs into a single int:
+#   (category_id << 10) | (distance << 6) | phase_id
+CATEGORIES = tuple(category for category, _ in DEFAULT_CATEGORY_PRIORITIES)
+CAT_ID = {category: i for i, category in enumerate(CATEGORIES)}
+PHASE_ID = {phase.value: i for i, phase in enumerate(GamePhase)}
+_DEFAULT = [priority for _, priority in DEFAULT_CATEGORY_PRIORITIES]
+FORM_MILL_ID = CAT_ID['form_mill']
+REMOVE_PIECE_ID = CAT_ID['remove_piece']
+
+
+def pattern_key(category: str, distance: int, phase: str) -> int:
+    """Pack a ('piece', category, distance, phase) pattern into an int key"""
+    return (CAT_ID[category] << 10) | (distance << 6) | PHASE_ID[phase]
 
 
 class MorrisHeadlessTrainer:
     """Trains Nine Men's Morris AI through self-play with pattern learning"""
 
+    # Max entries in the (position, player, move) -> pattern bits cache
+    CATEGORY_CACHE_SIZE = 200000
+
     def __init__(self, db_path: str = 'morris_training.db'):
         """Initialize trainer"""
         self.db_path = db_path
-        self.prioritizer = LearnableMovePrioritizer(db_path)
+        self.conn = sqlite3.connect(db_path)
         self.scorer = MorrisScorer()
 
+        # Pattern stats are written once per game; WAL + NORMAL sync keeps
+        # each per-game commit from forcing a full fsync
+        if db_path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._init_tables()
+
+        # Move features keyed by (zobrist_key, current_player, move); positions
+        # recur across games, so this skips simulating the move on a hit
+        self._category_cache = {}
+
+        # Learned priorities keyed by pattern_key(); see _load_priorities
+        self._priority_flat = {}
+        self._load_priorities()
+
         # Statistics
         self.games_played = 0
         self.white_wins = 0
@@ -44,8 +92,8 @@ class MorrisHeadlessTrainer:
         self.draws = 0
         self.total_score = 0
 
-    def select_move(self, game: MorrisGame, legal_moves: List[Union[MorrisMove, int]],
-                    exploration_rate: float = 0.15) -> Union[MorrisMove, int]:
+    def select_move(self, game: MorrisGame, legal_moves: List[int],
+                    exploration_rate: float = 0.15) -> int:
         """
         Select a move using learned patterns + exploration.
 
@@ -59,50 +107,127 @@ class MorrisHeadlessTrainer:
             return random.choice(legal_moves)
 
         # Exploitation: use learned patterns
-        move_scores = []
+        priority_flat = self._priority_flat
+        phase_id = PHASE_ID[game.phase_str]
+
+        # Removals are categorized by position alone, no simulation needed
+        if game.pending_removal:
+            removal_bits = (REMOVE_PIECE_ID << 10) | phase_id
+            default = _DEFAULT[REMOVE_PIECE_ID]
+            return max(legal_moves, key=lambda move: priority_flat.get(
+                removal_bits | REMOVAL_DISTANCE_OF_POS[move & MOVE_POS_MASK] << 6, default))
+
+        # A mill-forming move whose priority tops every other pattern's is
+        # the pick no matter what else is legal; find it without simulating
+        mill_bits = (FORM_MILL_ID << 10) | phase_id
+        for move in legal_moves:
+            if game.forms_mill(move):
+                priority = priority_flat.get(
+                    mill_bits | RING_OF_POS[move & MOVE_POS_MASK] << 6,
+                    _DEFAULT[FORM_MILL_ID])
+                if priority >= self._max_priority and priority > self._max_non_mill_priority:
+                    return move
+
+        # Highest-priority move; strict > keeps the first of equal moves
+        get_bits = self._get_move_bits
+        default = _DEFAULT
+        best_move = legal_moves[0]
+        best_priority = float('-inf')
 
         for move in legal_moves:
-            # Simulate move
-            new_game = game.make_move(move)
+            bits = get_bits(game, move)
+            priority = priority_flat.get(bits | phase_id, default[bits >> 10])
+            if priority > best_priority:
+                best_move, best_priority = move, priority
+
+        return best_move
 
-            # Get move category
-            category = self.scorer.get_move_category(game, new_game, move, game.current_player)
+    def _init_tables(self):
+        """
+        Create the Morris pattern table.
 
-            # Get distance metric
-            distance = self.scorer.get_distance_metric(move, game)
+        Morris patterns are keyed on game phase (placement, movement,
+        flying), which the chess-oriented learned_move_patterns table of
+        LearnableMovePrioritizer has no column for, so the trainer keeps its
+        own table.
+        """
+        with self.conn:
+            self.conn.execute('''
+                CREATE TABLE IF NOT EXISTS morris_move_patterns (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    piece_type TEXT NOT NULL,
+                    move_category TEXT NOT NULL,
+                    distance_from_start INTEGER,
+                    game_phase TEXT,
+                    times_seen INTEGER DEFAULT 0,
+                    games_won INTEGER DEFAULT 0,
+                    games_lost INTEGER DEFAULT 0,
+                    games_drawn INTEGER DEFAULT 0,
+                    win_rate REAL DEFAULT 0.0,
+                    total_score REAL DEFAULT 0.0,
+                    avg_score REAL DEFAULT 0.0,
+                    confidence REAL DEFAULT 0.0,
+                    priority_score REAL DEFAULT 0.0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(piece_type, move_category, distance_from_start, game_phase)
+                )
+            ''')
+
+    def _load_priorities(self):
+        """
+        Load learned (category, distance, phase) priorities into the
+        int-keyed dict select_move looks them up in.
+        """
+        rows = self.conn.execute('''
+            SELECT move_category, distance_from_start, game_phase, priority_score
+            FROM morris_move_patterns
+            WHERE confidence > 0.1
+        ''').fetchall()
+        self._set_priorities({
+            pattern_key(category, distance, phase): priority
+            for category, distance, phase, priority in rows
+            if category in CAT_ID and phase in PHASE_ID
+        })
+
+    def _set_priorities(self, priority_flat: dict):
+        """Install int-keyed learned priorities (see pattern_key)"""
+        self._priority_flat = priority_flat
+
+        # Bounds for select_move's mill-forming shortcut
+        priorities = list(enumerate(_DEFAULT))
+        priorities.extend((key >> 10, priority)
+                          for key, priority in priority_flat.items())
+        self._max_priority = max(priority for _, priority in priorities)
+        self._max_non_mill_priority = max(priority for cat_id, priority in priorities
+                                          if cat_id != FORM_MILL_ID)
+
+    def _get_move_features(self, game: MorrisGame, move: int) -> Tuple[str, int]:
+        """Get (category, distance) for a move (see _get_move_bits)"""
+        bits = self._get_move_bits(game, move)
+        return CATEGORIES[bits >> 10], (bits >> 6) & 0xF
+
+    def _get_move_bits(self, game: MorrisGame, move: int) -> int:
+        """
+        Get a move's category and distance packed as pattern_key() bits
+        (without the phase), simulating the move only on a cache miss.
 
-            # Determine game phase
-            phase_str = game.phase.value if game.phase else 'unknown'
+        Both depend only on the piece placement, the player to move and the
+        move itself, so they are cached by the board's Zobrist key.
+        """
+        cache = self._category_cache
+        cache_key = (game.board.zobrist_key, game.current_player, move)
+        bits = cache.get(cache_key)
 
-            # Get priority from learned patterns
-            key = ('piece', category, distance, phase_str)
+        if bits is None:
+            # Simulated with make/unmake on game itself (no copy)
+            category, distance = self.scorer.categorize_move(game, move, game.current_player)
+            bits = (CAT_ID[category] << 10) | (distance << 6)
+            if len(cache) >= self.CATEGORY_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del cache[next(iter(cache))]
+            cache[cache_key] = bits
 
-            if key in self.prioritizer.move_priorities:
-                priority = self.prioritizer.move_priorities[key]['priority']
-            else:
-                # Default priorities for unseen patterns
-                if category == 'form_mill':
-                    priority = 95.0
-                elif category == 'remove_piece':
-                    priority = 90.0
-                elif category == 'create_2mill':
-                    priority = 75.0
-                elif category == 'block_mill':
-                    priority = 70.0
-                elif category == 'flying':
-                    priority = 60.0
-                elif category == 'movement':
-                    priority = 45.0
-                elif category == 'placement':
-                    priority = 40.0
-                else:  # quiet
-                    priority = 30.0
-
-            move_scores.append((move, priority))
-
-        # Select move with highest priority
-        move_scores.sort(key=lambda x: x[1], reverse=True)
-        return move_scores[0][0]
+        return bits
 
     def play_game(self, verbose: bool = False) -> Tuple[str, float, int]:
         """
@@ -110,6 +235,19 @@ class MorrisHeadlessTrainer:
 
         Returns: (result, differential_score, rounds)
         """
+        result, score, rounds, game_moves = self._self_play(verbose)
+
+        # Record game for learning
+        self._record_game_patterns(game_moves, result, score)
+
+        return result, score, rounds
+
+    def _self_play(self, verbose: bool = False) -> Tuple[str, float, int, List[dict]]:
+        """
+        Play one game without touching the database.
+
+        Returns: (result, differential_score, rounds, white_move_patterns)
+        """
         game = MorrisGame()
         game_moves = []  # Track moves for learning
         rounds = 0
@@ -119,6 +257,9 @@ class MorrisHeadlessTrainer:
             print("Starting new Nine Men's Morris game")
             print("="*70)
 
+        select_move = self.select_move
+        record_move = game_moves.append
+
         while not game.is_game_over():
             legal_moves = game.get_legal_moves()
 
@@ -128,32 +269,27 @@ class MorrisHeadlessTrainer:
 
             # Select move (White uses learning, Black random for now)
             if game.current_player == Color.WHITE:
-                move = self.select_move(game, legal_moves, exploration_rate=0.15)
-            else:
-                # Black plays with some strategy (not purely random)
-                move = self.select_move(game, legal_moves, exploration_rate=0.5)
-
-            # Record move data for learning
-            game_before = game
-            new_game = game.make_move(move)
+                move = select_move(game, legal_moves, exploration_rate=0.15)
 
-            if game.current_player == Color.WHITE:
-                category = self.scorer.get_move_category(game_before, new_game, move, Color.WHITE)
-                distance = self.scorer.get_distance_metric(move, game_before)
-                phase_str = game_before.phase.value if game_before.phase else 'unknown'
-
-                game_moves.append({
+                # Record move data for learning (White only)
+                category, distance = self._get_move_features(game, move)
+                record_move({
                     'piece_type': 'piece',
                     'category': category,
                     'distance': distance,
-                    'phase': phase_str
+                    'phase': game.phase_str
                 })
+            else:
+                # Black plays with some strategy (not purely random)
+                move = select_move(game, legal_moves, exploration_rate=0.5)
 
-            game = new_game
+            # Nothing keeps the pre-move position, so play on this game in
+            # place instead of copying it every ply
+            game.apply_inplace(move)
             rounds += 1
 
             if verbose and rounds % 5 == 0:
-                print(f"\nRound {rounds} ({game.phase.value}):")
+                print(f"\nRound {rounds} ({game.phase_str}):")
                 print(game.board)
                 print(f"White: {game.board.count_pieces(Color.WHITE)} pieces, "
                       f"Black: {game.board.count_pieces(Color.BLACK)} pieces")
@@ -193,54 +329,101 @@ class MorrisHeadlessTrainer:
             print(f"Differential Score: {score:+.0f}")
             print(f"{'='*70}\n")
 
-        # Record game for learning
-        for move_data in game_moves:
-            self.prioritizer._update_move_statistics(
-                piece_type=move_data['piece_type'],
-                move_category=move_data['category'],
-                distance=move_data['distance'],
-                phase=move_data['phase'],
-                result=result,
-                final_score=score
-            )
-        self.prioritizer.conn.commit()
+        return result, score, rounds, game_moves
 
-        return result, score, rounds
+    def _record_game_patterns(self, game_moves: List[dict], result: str,
+                              final_score: float):
+        """
+        Fold one game's moves into the learned pattern statistics.
+
+        Result and score are the same for every move of a game, so moves are
+        aggregated per (piece_type, category, distance, phase) first and each
+        distinct pattern is upserted once, all in a single transaction.
+        """
+        counts = {}
+        for move_data in game_moves:
+            key = (move_data['piece_type'], move_data['category'],
+                   move_data['distance'], move_data['phase'])
+            counts[key] = counts.get(key, 0) + 1
+
+        if not counts:
+            return
+
+        rows = []
+        for (piece_type, category, distance, phase), count in counts.items():
+            won = count if result == 'win' else 0
+            lost = count if result == 'loss' else 0
+            drawn = count - won - lost
+            total_score = final_score * count
+            avg_score = final_score
+            confidence = min(1.0, count / 50.0)
+            priority_score = ((avg_score + 1500) / 31) * confidence
+            rows.append((piece_type, category, distance, phase,
+                         count, won, lost, drawn, won / count,
+                         total_score, avg_score, confidence, priority_score))
+
+        # Same win rate / confidence / priority formulas as
+        # LearnableMovePrioritizer._update_move_statistics, accumulated in SQL
+        # (SET expressions see the pre-update row values)
+        with self.conn:
+            self.conn.executemany('''
+                INSERT INTO morris_move_patterns
+                    (piece_type, move_category, distance_from_start, game_phase,
+                     times_seen, games_won, games_lost, games_drawn, win_rate,
+                     total_score, avg_score, confidence, priority_score, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+                ON CONFLICT(piece_type, move_category, distance_from_start, game_phase)
+                DO UPDATE SET
+                    times_seen = times_seen + excluded.times_seen,
+                    games_won = games_won + excluded.games_won,
+                    games_lost = games_lost + excluded.games_lost,
+                    games_drawn = games_drawn + excluded.games_drawn,
+                    win_rate = (games_won + excluded.games_won) * 1.0
+                               / (times_seen + excluded.times_seen),
+                    total_score = total_score + excluded.total_score,
+                    avg_score = (total_score + excluded.total_score)
+                                / (times_seen + excluded.times_seen),
+                    confidence = MIN(1.0, (times_seen + excluded.times_seen) / 50.0),
+                    priority_score = (((total_score + excluded.total_score)
+                                       / (times_seen + excluded.times_seen) + 1500) / 31)
+                                     * MIN(1.0, (times_seen + excluded.times_seen) / 50.0),
+                    updated_at = datetime('now')
+            ''', rows)
 
     def train(self, num_games: int, verbose: bool = False,
-              progress_interval: int = 10) -> dict:
+              progress_interval: int = 10, workers: int = 1) -> dict:
         """
         Train for a number of games.
 
+        With workers > 1, games are played in a process pool against a
+        snapshot of the learned priorities (they are not reloaded during a
+        run either way); this process records every game's patterns.
+
         Returns dictionary with training statistics.
         """
         print(f"\n{'='*70}")
         print(f"NINE MEN'S MORRIS TRAINING - {num_games} games")
         print(f"{'='*70}\n")
 
-        for i in range(num_games):
-            result, score, rounds = self.play_game(verbose=verbose)
-
-            # Update statistics
-            self.games_played += 1
-            self.total_score += score
-
-            if result == 'win':
-                self.white_wins += 1
-            elif result == 'loss':
-                self.black_wins += 1
-            else:
-                self.draws += 1
-
-            # Progress update
-            if (i + 1) % progress_interval == 0 or (i + 1) == num_games:
-                win_rate = (self.white_wins / self.games_played) * 100
-                avg_score = self.total_score / self.games_played
-
-                print(f"Game {i+1}/{num_games}: {result.upper()} "
-                      f"(Rounds: {rounds}, Score: {score:+.0f})")
-                print(f"  Overall: {self.white_wins}W-{self.black_wins}L-{self.draws}D "
-                      f"({win_rate:.1f}% win rate, avg score: {avg_score:+.0f})")
+        pool = None
+        if workers > 1:
+            pool = multiprocessing.Pool(workers, initializer=_init_worker,
+                                        initargs=(self._priority_flat,))
+            games = pool.imap(_play_worker_game, [verbose] * num_games,
+                              chunksize=max(1, min(32, num_games // (workers * 4))))
+        else:
+            games = (self._self_play(verbose) for _ in range(num_games))
+
+        try:
+            for i, (result, score, rounds, game_moves) in enumerate(games):
+                self._record_game_patterns(game_moves, result, score)
+                self._update_progress(i, num_games, progress_interval,
+                                      result, score, rounds)
+        finally:
+            # Every game has been consumed (or training failed): stop workers
+            if pool is not None:
+                pool.terminate()
+                pool.join()
 
         # Final statistics
         print(f"\n{'='*70}")
@@ -261,13 +444,44 @@ class MorrisHeadlessTrainer:
             'avg_score': self.total_score / self.games_played
         }
 
+    def _update_progress(self, i: int, num_games: int, progress_interval: int,
+                         result: str, score: float, rounds: int):
+        """Fold game i's result into the statistics and print progress"""
+        # Update statistics
+        self.games_played += 1
+        self.total_score += score
+
+        if result == 'win':
+            self.white_wins += 1
+        elif result == 'loss':
+            self.black_wins += 1
+        else:
+            self.draws += 1
+
+        # Progress update
+        if (i + 1) % progress_interval == 0 or (i + 1) == num_games:
+            win_rate = (self.white_wins / self.games_played) * 100
+            avg_score = self.total_score / self.games_played
+
+            print(f"Game {i+1}/{num_games}: {result.upper()} "
+                  f"(Rounds: {rounds}, Score: {score:+.0f})")
+            print(f"  Overall: {self.white_wins}W-{self.black_wins}L-{self.draws}D "
+                  f"({win_rate:.1f}% win rate, avg score: {avg_score:+.0f})")
+
     def show_learned_patterns(self, limit: int = 10):
         """Display top learned patterns"""
         print(f"\n{'='*70}")
         print(f"TOP {limit} LEARNED NINE MEN'S MORRIS PATTERNS")
         print(f"{'='*70}\n")
 
-        patterns = self.prioritizer.get_top_patterns(limit)
+        patterns = self.conn.execute('''
+            SELECT piece_type, move_category, distance_from_start, game_phase,
+                   times_seen, win_rate, confidence, priority_score
+            FROM morris_move_patterns
+            WHERE confidence > 0.2
+            ORDER BY priority_score DESC
+            LIMIT ?
+        ''', (limit,)).fetchall()
 
         print(f"{'Piece':<8} {'Category':<15} {'Ring':<6} {'Phase':<12} "
               f"{'Games':<8} {'Win%':<8} {'Priority':<10}")
@@ -283,6 +497,30 @@ class MorrisHeadlessTrainer:
         print(f"{'='*70}\n")
 
 
+# Process-pool workers for MorrisHeadlessTrainer.train(workers > 1): each
+# plays whole games against a read-only priority snapshot and hands the
+# patterns back to the parent, which is the only database writer
+_worker_trainer = None
+
+
+def _init_worker(priority_flat: dict):
+    """Set up this worker's database-free trainer"""
+    global _worker_trainer
+    trainer = MorrisHeadlessTrainer.__new__(MorrisHeadlessTrainer)
+    trainer.scorer = MorrisScorer()
+    trainer._category_cache = {}
+    trainer._set_priorities(priority_flat)
+    _worker_trainer = trainer
+
+    # Forked workers inherit the parent's RNG state; give each its own
+    random.seed()
+
+
+def _play_worker_game(verbose: bool) -> Tuple[str, float, int, List[dict]]:
+    """Play one game in a worker (see MorrisHeadlessTrainer._self_play)"""
+    return _worker_trainer._self_play(verbose)
+
+
 def main():
     """Main training entry point"""
     parser = argparse.ArgumentParser(description='Train Nine Men\'s Morris AI')
@@ -296,6 +534,8 @@ def main():
                         help='Database path (default: morris_training.db)')
     parser.add_argument('--show-patterns', nargs='?', const=10, type=int,
                         help='Show top N learned patterns and exit')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes playing games (default: 1)')
 
     args = parser.parse_args()
 
@@ -315,7 +555,8 @@ def main():
     trainer.train(
         num_games=args.num_games,
         verbose=args.verbose,
-        progress_interval=args.progress
+        progress_interval=args.progress,
+        workers=args.workers
     )
 
     # Show top patterns after training
@@ -14,9 +14,34 @@ Components:
 The AI learns which patterns lead to wins through observation.
 """
 
-from .morris_board import MorrisBoard, Color
-from .morris_game import MorrisGame, GamePhase
-from typing import Union
+from .morris_board import (MorrisBoard, Color, OPPOSITE, completes_mill,
+                           potential_mill_counts)
+from .morris_game import (MorrisGame, GamePhase, MOVE_POS_MASK, MOVE_FROM_SHIFT,
+                          MOVE_PLACEMENT, MOVE_REMOVAL)
+from typing import Tuple
+
+
+# Ring of each position: 0 = outer, 1 = middle, 2 = inner
+RING_OF_POS = bytes(pos // 8 for pos in range(24))
+
+# Distance metric of a removal: position within its ring (0-7)
+REMOVAL_DISTANCE_OF_POS = bytes(pos % 8 for pos in range(24))
+
+# Scoring weights
+# Material
+PIECE_VALUE = 100
+
+# Mills
+COMPLETE_MILL = 500
+TWO_PIECE_MILL = 80   # Has 2 pieces, needs 1 more
+ONE_PIECE_MILL = 20   # Has 1 piece, needs 2 more
+
+# Mobility
+MOBILITY_VALUE = 10
+
+# Phase bonuses
+PLACEMENT_BONUS = 5   # Bonus per piece in placement phase
+FLYING_BONUS = 50     # Bonus for having flying ability
 
 
 class MorrisScorer:
@@ -31,22 +56,15 @@ class MorrisScorer:
     - Mobility (legal moves available)
     """
 
-    def __init__(self):
-        """Initialize scorer with default weights"""
-        # Material
-        self.PIECE_VALUE = 100
-
-        # Mills
-        self.COMPLETE_MILL = 500
-        self.TWO_PIECE_MILL = 80   # Has 2 pieces, needs 1 more
-        self.ONE_PIECE_MILL = 20   # Has 1 piece, needs 2 more
-
-        # Mobility
-        self.MOBILITY_VALUE = 10
-
-        # Phase bonuses
-        self.PLACEMENT_BONUS = 5   # Bonus per piece in placement phase
-        self.FLYING_BONUS = 50     # Bonus for having flying ability
+    # Weights (module constants, aliased here for callers that read them
+    # off the scorer)
+    PIECE_VALUE = PIECE_VALUE
+    COMPLETE_MILL = COMPLETE_MILL
+    TWO_PIECE_MILL = TWO_PIECE_MILL
+    ONE_PIECE_MILL = ONE_PIECE_MILL
+    MOBILITY_VALUE = MOBILITY_VALUE
+    PLACEMENT_BONUS = PLACEMENT_BONUS
+    FLYING_BONUS = FLYING_BONUS
 
     def score(self, board: MorrisBoard, color: Color, phase: GamePhase,
               pieces_placed_white: int = 9, pieces_placed_black: int = 9) -> float:
@@ -56,7 +74,7 @@ class MorrisScorer:
         Returns: my_score - opponent_score
         """
         my_score = self._evaluate_color(board, color, phase, pieces_placed_white, pieces_placed_black)
-        opponent_score = self._evaluate_color(board, color.opposite(), phase,
+        opponent_score = self._evaluate_color(board, OPPOSITE[color], phase,
                                               pieces_placed_white, pieces_placed_black)
 
         return my_score - opponent_score
@@ -68,28 +86,26 @@ class MorrisScorer:
 
         # Material count
         piece_count = board.count_pieces(color)
-        score += piece_count * self.PIECE_VALUE
+        score += piece_count * PIECE_VALUE
 
         # Complete mills
         mills = board.count_mills(color)
-        score += mills * self.COMPLETE_MILL
+        score += mills * COMPLETE_MILL
 
-        # Potential mills (2 pieces, need 1 more)
-        potential_2 = board.count_potential_mills(color, pieces_needed=1)
-        score += potential_2 * self.TWO_PIECE_MILL
-
-        # Weak potential mills (1 piece, need 2 more)
-        potential_1 = board.count_potential_mills(color, pieces_needed=2)
-        score += potential_1 * self.ONE_PIECE_MILL
+        # Potential mills (2 pieces, need 1 more) and weak potential mills
+        # (1 piece, need 2 more), counted in one sweep
+        potential_2, potential_1 = board.count_potential_mills_both(color)
+        score += potential_2 * TWO_PIECE_MILL
+        score += potential_1 * ONE_PIECE_MILL
 
         # Placement phase bonus (more pieces placed = better)
         if phase == GamePhase.PLACEMENT:
             pieces_placed = pieces_placed_white if color == Color.WHITE else pieces_placed_black
-            score += pieces_placed * self.PLACEMENT_BONUS
+            score += pieces_placed * PLACEMENT_BONUS
 
         # Flying bonus (if player has exactly 3 pieces → can fly)
         if piece_count == 3:
-            score += self.FLYING_BONUS
+            score += FLYING_BONUS
 
         return score
 
@@ -100,7 +116,7 @@ class MorrisScorer:
 
     def get_move_category(self, game_before: MorrisGame,
                           game_after: MorrisGame,
-                          move,
+                          move: int,
                           color: Color) -> str:
         """
         Categorize a move for pattern learning.
@@ -116,28 +132,88 @@ class MorrisScorer:
         - 'flying' - Flying phase move
         - 'quiet' - Normal positional move
         """
+        return self.categorize_and_distance(game_before, game_after, move, color)[0]
+
+    def categorize_and_distance(self, game_before: MorrisGame,
+                                game_after: MorrisGame,
+                                move: int,
+                                color: Color) -> Tuple[str, int]:
+        """
+        Get both the move category (see get_move_category) and the distance
+        metric (see get_distance_metric) in one pass over the move.
+
+        Returns (category, distance).
+        """
+        # Placement position, movement destination, or removed piece position
+        pos = move & MOVE_POS_MASK
+
         # Check if move is a removal
-        if isinstance(move, int):
-            return 'remove_piece'
+        if move & MOVE_REMOVAL:
+            return 'remove_piece', REMOVAL_DISTANCE_OF_POS[pos]
 
-        # Check if mill was formed
-        if game_after.pending_removal:
-            return 'form_mill'
+        return self._categorize(
+            move, color, game_before.phase,
+            game_before.board.count_potential_mills_by_color(1),
+            game_after.pending_removal,
+            game_after.board.count_potential_mills_by_color(1)), RING_OF_POS[pos]
 
-        # Get position where piece ended up
-        if move.is_placement:
-            end_pos = move.position
-            is_placement = True
+    def categorize_move(self, game: MorrisGame, move: int,
+                        color: Color) -> Tuple[str, int]:
+        """
+        Same as categorize_and_distance, but works out the post-move position
+        on the bitboards directly instead of needing a separate post-move game.
+
+        Returns (category, distance); game is left unchanged.
+        """
+        pos = move & MOVE_POS_MASK
+
+        if move & MOVE_REMOVAL:
+            return 'remove_piece', REMOVAL_DISTANCE_OF_POS[pos]
+
+        board = game.board
+        white_bb = board.white_bb
+        black_bb = board.black_bb
+        counts_before = potential_mill_counts(white_bb, black_bb, 1)
+
+        # Placement adds a piece at pos; movement/flying also vacates from_pos
+        if move & MOVE_PLACEMENT:
+            vacated = 0
         else:
-            end_pos = move.to_pos
-            is_placement = False
+            vacated = 1 << ((move >> MOVE_FROM_SHIFT) & MOVE_POS_MASK)
+        if game.current_player == Color.WHITE:
+            white_bb = (white_bb & ~vacated) | (1 << pos)
+            mill_formed = completes_mill(white_bb, pos)
+        else:
+            black_bb = (black_bb & ~vacated) | (1 << pos)
+            mill_formed = completes_mill(black_bb, pos)
+
+        # Forming a mill leaves a removal pending, which is always form_mill
+        if mill_formed:
+            return 'form_mill', RING_OF_POS[pos]
+
+        return self._categorize(move, color, game.phase, counts_before, False,
+                                potential_mill_counts(white_bb, black_bb, 1)), RING_OF_POS[pos]
+
+    def _categorize(self, move: int, color: Color, phase_before: GamePhase,
+                    counts_before: Tuple[int, int], pending_after: bool,
+                    counts_after: Tuple[int, int]) -> str:
+        """
+        Category of a non-removal move, from the phase and (white, black)
+        2-piece potential mill counts before it, and the state after it.
+        """
+        # Check if mill was formed
+        if pending_after:
+            return 'form_mill'
 
-        # Count potential mills before and after
-        my_2mills_before = game_before.board.count_potential_mills(color, pieces_needed=1)
-        my_2mills_after = game_after.board.count_potential_mills(color, pieces_needed=1)
+        white_before, black_before = counts_before
+        white_after, black_after = counts_after
 
-        opp_2mills_before = game_before.board.count_potential_mills(color.opposite(), pieces_needed=1)
-        opp_2mills_after = game_after.board.count_potential_mills(color.opposite(), pieces_needed=1)
+        if color == Color.WHITE:
+            my_2mills_before, opp_2mills_before = white_before, black_before
+            my_2mills_after, opp_2mills_after = white_after, black_after
+        else:
+            my_2mills_before, opp_2mills_before = black_before, white_before
+            my_2mills_after, opp_2mills_after = black_after, white_after
 
         # Created a 2-piece potential mill
         if my_2mills_after > my_2mills_before:
@@ -148,40 +224,26 @@ class MorrisScorer:
             return 'block_mill'
 
         # Phase-specific categories
-        if is_placement:
+        if move & MOVE_PLACEMENT:
             return 'placement'
-        elif game_before.phase == GamePhase.FLYING:
+        elif phase_before == GamePhase.FLYING:
             return 'flying'
-        elif game_before.phase == GamePhase.MOVEMENT:
+        elif phase_before == GamePhase.MOVEMENT:
             return 'movement'
 
         # Default: quiet move
         return 'quiet'
 
-    def get_distance_metric(self, move, game: MorrisGame) -> int:
+    def get_distance_metric(self, move: int, game: MorrisGame) -> int:
         """
         Get distance metric for pattern learning.
 
         For Morris, use:
-        - Placement phase: position number (0-23)
-        - Movement/Flying: Manhattan distance to board center (pos 17)
+        - Placement/Movement/Flying: ring of the target position
+          (0 = outer, 1 = middle, 2 = inner)
+        - Removal: removed position modulo 8
         """
-        if isinstance(move, int):
-            # Removal move - use removed piece position
-            return move % 8  # Group by ring (0-7, 8-15, 16-23)
-
-        if move.is_placement:
-            pos = move.position
-        else:
-            pos = move.to_pos
-
-        # Distance to center of board (position 17 is center of inner ring)
-        # Map positions to rings
-        if pos < 8:
-            ring = 0  # Outer
-        elif pos < 16:
-            ring = 1  # Middle
-        else:
-            ring = 2  # Inner
-
-        return ring
+        # Placement position, movement destination, or removed piece position
+        if move & MOVE_REMOVAL:
+            return REMOVAL_DISTANCE_OF_POS[move & MOVE_POS_MASK]
+        return RING_OF_POS[move & MOVE_POS_MASK]
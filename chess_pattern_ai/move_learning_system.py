@@ -18,23 +18,198 @@ import sqlite3
 import chess
 import chess.pgn
 import io
-from collections import defaultdict
+import re
+import numpy as np
+from dataclasses import dataclass
+
+
+# Piece letters (lowercase FEN symbols) to small ids for packed move keys
+PIECE_IDS = {'p': 0, 'n': 1, 'b': 2, 'r': 3, 'q': 4, 'k': 5}
+PIECE_TYPES = 'pnbrqk'
+
+# PGN pieces that are not mainline moves: header tags, {brace} and ;line
+# comments, and innermost (variations) - stripped repeatedly for nesting
+PGN_HEADER = re.compile(r'^\s*\[.*?\]\s*$', re.MULTILINE)
+PGN_COMMENT = re.compile(r'\{[^}]*\}|;[^\n]*')
+PGN_VARIATION = re.compile(r'\([^()]*\)')
+
+# One movetext token: a game result, a null move, castling (with letter O
+# or zero) or another SAN move. Move numbers and NAGs never match.
+PGN_TOKEN = re.compile(
+    r'(?P<result>1-0|0-1|1/2-1/2|\*)'
+    r'|(?P<null>--|\bZ0\b)'
+    r'|\b(?P<castle>[O0]-[O0](?:-[O0])?)'
+    r'|\b(?P<san>[PNBRQK]?[a-h]?[1-8]?x?[a-h][1-8](?:=?[NBRQ])?[+#]?)')
+
+
+def mainline_sans(pgn_string):
+    """
+    SAN moves of the mainline of the first game in a PGN string, in order.
+
+    Reading stops at the game's result token (later games are ignored, as
+    with chess.pgn.read_game) and at a null move, which the mainline cannot
+    be followed past. Zero castling (0-0) comes back as O-O.
+    """
+    movetext = PGN_COMMENT.sub(' ', PGN_HEADER.sub('', pgn_string))
+    while True:
+        stripped = PGN_VARIATION.sub(' ', movetext)
+        if stripped == movetext:
+            break
+        movetext = stripped
+
+    sans = []
+    for token in PGN_TOKEN.finditer(movetext):
+        kind = token.lastgroup
+        if kind == 'result' or kind == 'null':
+            break
+        sans.append(token['castle'].replace('0', 'O') if kind == 'castle' else token['san'])
+    return sans
+
+
+# One predicted move (see MoveLearner.predict_legal_moves); 'piece' holds
+# the PIECE_IDS id of the moving piece
+MOVE_DTYPE = np.dtype([('from', 'i1'), ('to', 'i1'), ('piece', 'i1'),
+                       ('seen', 'i4'), ('confidence', 'f4')])
+
+
+def pack_move_key(piece_type, from_sq, to_sq, is_capture):
+    """Pack (piece_type, from, to, capture) into one int: piece<<13 | from<<7 | to<<1 | capture"""
+    return (PIECE_IDS[piece_type] << 13) | (from_sq << 7) | (to_sq << 1) | int(is_capture)
+
+
+def unpack_move_key(key):
+    """Inverse of pack_move_key: (piece_type, from_sq, to_sq, is_capture)"""
+    return PIECE_TYPES[key >> 13], (key >> 7) & 63, (key >> 1) & 63, bool(key & 1)
+
+
+def _move_geometry(from_sq, to_sq):
+    """
+    (distance, direction, is_orthogonal, is_diagonal) of a move, where
+    distance is the larger of the rank and file differences
+    """
+    from_rank, from_file = divmod(from_sq, 8)
+    to_rank, to_file = divmod(to_sq, 8)
+
+    rank_diff = abs(to_rank - from_rank)
+    file_diff = abs(to_file - from_file)
+    distance = max(rank_diff, file_diff)
+
+    # Detect movement type
+    if rank_diff == 0 or file_diff == 0:
+        direction = 'orthogonal'
+    elif rank_diff == file_diff:
+        direction = 'diagonal'
+    elif (rank_diff == 2 and file_diff == 1) or (rank_diff == 1 and file_diff == 2):
+        direction = 'knight'
+    else:
+        direction = 'other'
+
+    return (distance, direction, rank_diff == 0 or file_diff == 0,
+            rank_diff == file_diff)
+
+
+# MOVE_GEOMETRY[from_sq][to_sq]: see _move_geometry
+MOVE_GEOMETRY = tuple(tuple(_move_geometry(from_sq, to_sq) for to_sq in range(64))
+                      for from_sq in range(64))
+
+
+def _between_mask(from_sq, to_sq):
+    """
+    Bitboard of the squares a move from from_sq to to_sq passes over.
+
+    Rank/file/diagonal moves pass over the squares strictly between the two
+    ends; any other move (a knight's L) is taken to pass over the rest of
+    the rectangle spanned by its two ends.
+    """
+    from_rank, from_file = divmod(from_sq, 8)
+    to_rank, to_file = divmod(to_sq, 8)
+    rank_diff = abs(to_rank - from_rank)
+    file_diff = abs(to_file - from_file)
+    mask = 0
+
+    if rank_diff == 0 or file_diff == 0 or rank_diff == file_diff:
+        rank_dir = (to_rank > from_rank) - (to_rank < from_rank)
+        file_dir = (to_file > from_file) - (to_file < from_file)
+        for step in range(1, max(rank_diff, file_diff)):
+            mask |= 1 << ((from_rank + step * rank_dir) * 8 + from_file + step * file_dir)
+    else:
+        for rank in range(min(from_rank, to_rank), max(from_rank, to_rank) + 1):
+            for file in range(min(from_file, to_file), max(from_file, to_file) + 1):
+                mask |= 1 << (rank * 8 + file)
+        mask &= ~((1 << from_sq) | (1 << to_sq))
+
+    return mask
+
+
+# BETWEEN[from_sq][to_sq]: squares passed over by a move (see _between_mask)
+BETWEEN = tuple(tuple(_between_mask(from_sq, to_sq) for to_sq in range(64))
+                for from_sq in range(64))
+
+
+def _neighborhood_mask(square):
+    """Bitboard of the 5x5 block of squares centred on square (clipped to the board)"""
+    rank, file = divmod(square, 8)
+    mask = 0
+    for r in range(max(0, rank-2), min(8, rank+3)):
+        for f in range(max(0, file-2), min(8, file+3)):
+            mask |= 1 << (r * 8 + f)
+    return mask
+
+
+NEIGHBORHOOD = tuple(_neighborhood_mask(square) for square in range(64))
+
+# Nearby-pieces context bits: one per (piece type, color), white in bits
+# 0-5 and black in bits 6-11, in chess.PAWN..chess.KING order
+PIECE_BITS = tuple((piece_type, 1 << (piece_type - 1), 1 << (piece_type + 5))
+                   for piece_type in chess.PIECE_TYPES)
+
+
+@dataclass(frozen=True)
+class PiecePattern:
+    """Learned movement pattern of one piece type"""
+    __slots__ = ('max_distance', 'can_jump', 'direction_type')
+    max_distance: int
+    can_jump: bool
+    direction_type: str
 
 
 class MoveLearner:
     """Learn legal moves by observing games"""
 
-    def __init__(self, db_path='learned_moves.db'):
+    def __init__(self, db_path='learned_moves.db', verbose=False):
         self.db_path = db_path
+        self.verbose = verbose  # Report each observed game (slow on large archives)
         self.conn = sqlite3.connect(db_path)
         self.cursor = self.conn.cursor()
         self._init_database()
 
-        # In-memory cache for fast lookup
-        self.move_patterns = defaultdict(lambda: defaultdict(int))
+        # Observations staged during a game, written by _flush() in one
+        # executemany per table
+        self._discard_pending()
+
+        # PiecePattern per PIECE_IDS id (None if not yet observed), loaded
+        # lazily by _load_patterns and dropped whenever patterns are written
+        self._patterns = None
+
+        # In-memory cache for fast lookup, keyed by pack_move_key()
+        self.move_patterns = {}
 
     def _init_database(self):
         """Create tables for storing observed moves"""
+        # Observations are committed once per game (or batch of games); WAL
+        # with NORMAL sync keeps those commits from each forcing an fsync.
+        # predict_legal_moves is read-heavy, so the file is memory-mapped
+        # (256MB) with a 64MB cache. page_size must come first: it only
+        # takes effect on a new database, before any table exists.
+        # :memory: databases have no journal file, so they skip WAL.
+        self.cursor.execute('PRAGMA page_size=8192')
+        if self.db_path != ':memory:':
+            self.cursor.execute('PRAGMA journal_mode=WAL')
+        self.cursor.execute('PRAGMA synchronous=NORMAL')
+        self.cursor.execute('PRAGMA temp_store=MEMORY')
+        self.cursor.execute('PRAGMA mmap_size=268435456')
+        self.cursor.execute('PRAGMA cache_size=-65536')
+
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS observed_moves (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -46,9 +221,9 @@ class MoveLearner:
                 games_seen INTEGER DEFAULT 1,
                 confidence REAL DEFAULT 0.0,
 
-                -- Context
-                friendly_pieces TEXT,
-                enemy_pieces TEXT,
+                -- Context: bitmasks of nearby piece types (see _get_nearby_pieces)
+                friendly_pieces INTEGER,
+                enemy_pieces INTEGER,
                 game_phase TEXT,
 
                 UNIQUE(piece_type, from_square, to_square, is_capture)
@@ -78,37 +253,89 @@ class MoveLearner:
             )
         ''')
 
+        # Covering index for predict_legal_moves: rows for a (piece, square)
+        # come out already ordered by times_observed, without a table lookup
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_obs_piece_from
+            ON observed_moves(piece_type, from_square, times_observed DESC,
+                              to_square, is_capture, confidence)
+        ''')
+
         self.conn.commit()
 
+        # Refresh planner statistics when they are missing or stale
+        self.cursor.execute('PRAGMA optimize')
+
     def observe_game_pgn(self, pgn_string):
         """
         Watch a game and learn from it
 
         This is how the AI learns rules - by watching!
         """
-        game = chess.pgn.read_game(io.StringIO(pgn_string))
-        if not game:
+        # One transaction (and one commit) for the whole game
+        with self.conn:
+            self._observe_game_pgn(pgn_string)
+
+    def observe_games(self, pgn_strings):
+        """Watch several games, committing them all in a single transaction"""
+        with self.conn:
+            for pgn_string in pgn_strings:
+                self._observe_game_pgn(pgn_string)
+
+    def _observe_game_pgn(self, pgn_string):
+        """Observe one PGN game without committing"""
+        if not pgn_string.strip():
             return
 
-        board = game.board()
+        # Only the mainline is needed, so standard-start games skip building
+        # a chess.pgn.Game tree; games set up from a FEN still go through it
+        if '[FEN ' in pgn_string:
+            game = chess.pgn.read_game(io.StringIO(pgn_string))
+            if not game:
+                return
+            board = game.board()
+            moves = game.mainline_moves()
+        else:
+            board = chess.Board()
+            moves = None
+
         moves_observed = 0
+        self._discard_pending()
+
+        if moves is not None:
+            for move in moves:
+                # OBSERVE: This move was legal in this position
+                self._observe_move(board, move)
+                board.push(move)
+                moves_observed += 1
+        else:
+            for san in mainline_sans(pgn_string):
+                try:
+                    move = board.parse_san(san)
+                except ValueError:
+                    break  # Illegal or ambiguous: the mainline ends here
 
-        for move in game.mainline_moves():
-            # OBSERVE: This move was legal in this position
-            self._observe_move(board, move)
-            board.push(move)
-            moves_observed += 1
+                # OBSERVE: This move was legal in this position
+                self._observe_move(board, move)
+                board.push(move)
+                moves_observed += 1
+
+        self._flush()
 
         # OBSERVE: Game ended in this state
         self._observe_game_end(board)
 
-        print(f"Observed {moves_observed} moves from game")
+        if self.verbose:
+            print(f"Observed {moves_observed} moves from game")
 
     def observe_game_moves(self, board, moves):
         """Observe a sequence of moves"""
-        for move in moves:
-            self._observe_move(board, move)
-            board.push(move)
+        with self.conn:
+            self._discard_pending()
+            for move in moves:
+                self._observe_move(board, move)
+                board.push(move)
+            self._flush()
 
     def _observe_move(self, board, move):
         """
@@ -129,23 +356,13 @@ class MoveLearner:
         friendly = self._get_nearby_pieces(board, from_sq, piece.color)
         enemy = self._get_nearby_pieces(board, to_sq, not piece.color)
 
-        # Record this observation
-        self.cursor.execute('''
-            INSERT INTO observed_moves
-                (piece_type, from_square, to_square, is_capture,
-                 friendly_pieces, enemy_pieces, times_observed)
-            VALUES (?, ?, ?, ?, ?, ?, 1)
-            ON CONFLICT(piece_type, from_square, to_square, is_capture)
-            DO UPDATE SET
-                times_observed = times_observed + 1,
-                games_seen = games_seen + 1
-        ''', (piece_type, from_sq, to_sq, is_capture, friendly, enemy))
+        # Record this observation (staged until _flush)
+        self._pending_moves.append(
+            (piece_type, from_sq, to_sq, is_capture, friendly, enemy))
 
         # Learn movement pattern
         self._learn_piece_pattern(piece_type, from_sq, to_sq, board)
 
-        self.conn.commit()
-
     def _learn_piece_pattern(self, piece_type, from_sq, to_sq, board):
         """
         Discover how pieces move through observation
@@ -157,70 +374,85 @@ class MoveLearner:
 
         AI DISCOVERS these patterns, not told them!
         """
-        from_rank, from_file = divmod(from_sq, 8)
-        to_rank, to_file = divmod(to_sq, 8)
-
-        rank_diff = abs(to_rank - from_rank)
-        file_diff = abs(to_file - from_file)
-        distance = max(rank_diff, file_diff)
-
-        # Detect movement type
-        if rank_diff == 0 or file_diff == 0:
-            direction = 'orthogonal'
-        elif rank_diff == file_diff:
-            direction = 'diagonal'
-        elif (rank_diff == 2 and file_diff == 1) or (rank_diff == 1 and file_diff == 2):
-            direction = 'knight'
-        else:
-            direction = 'other'
+        # Distance and movement type (orthogonal/diagonal/knight/other)
+        distance, direction, _, _ = MOVE_GEOMETRY[from_sq][to_sq]
 
         # Check if piece jumped over something
         jumped = self._path_blocked(board, from_sq, to_sq)
 
-        # Update pattern knowledge
-        self.cursor.execute('''
-            INSERT INTO piece_movement_patterns
-                (piece_type, max_distance, can_jump, direction_type, observations)
-            VALUES (?, ?, ?, ?, 1)
-            ON CONFLICT(piece_type)
-            DO UPDATE SET
-                max_distance = MAX(max_distance, ?),
-                can_jump = can_jump OR ?,
-                observations = observations + 1
-        ''', (piece_type, distance, jumped, direction, distance, jumped))
+        # Update pattern knowledge (aggregated per piece type until _flush)
+        pending = self._pending_patterns.get(piece_type)
+        if pending is None:
+            # The direction only takes effect when the piece's row is first
+            # created, so keeping the first one seen is enough
+            self._pending_patterns[piece_type] = [distance, jumped, direction, 1]
+        else:
+            if distance > pending[0]:
+                pending[0] = distance
+            pending[1] = pending[1] or jumped
+            pending[3] += 1
+
+    def _discard_pending(self):
+        """Drop observations staged by an observation that failed part-way"""
+        self._pending_moves = []
+        # piece_type -> [max_distance, jumped, first_direction, observations]
+        self._pending_patterns = {}
+
+    def _flush(self):
+        """
+        Write staged move and pattern observations.
+
+        Runs inside the caller's transaction. Move rows are applied in order
+        and pattern rows are pre-aggregated per piece type (at most six), so
+        the ON CONFLICT updates accumulate exactly as per-move inserts did.
+        """
+        if self._pending_moves:
+            self.cursor.executemany('''
+                INSERT INTO observed_moves
+                    (piece_type, from_square, to_square, is_capture,
+                     friendly_pieces, enemy_pieces, times_observed)
+                VALUES (?, ?, ?, ?, ?, ?, 1)
+                ON CONFLICT(piece_type, from_square, to_square, is_capture)
+                DO UPDATE SET
+                    times_observed = times_observed + 1,
+                    games_seen = games_seen + 1
+            ''', self._pending_moves)
+            self._pending_moves = []
+
+        if self._pending_patterns:
+            self.cursor.executemany('''
+                INSERT INTO piece_movement_patterns
+                    (piece_type, max_distance, can_jump, direction_type, observations)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(piece_type)
+                DO UPDATE SET
+                    max_distance = MAX(max_distance, excluded.max_distance),
+                    can_jump = can_jump OR excluded.can_jump,
+                    observations = observations + excluded.observations
+            ''', [(piece_type, *pending)
+                  for piece_type, pending in self._pending_patterns.items()])
+            self._pending_patterns = {}
+            self._patterns = None
 
     def _get_nearby_pieces(self, board, square, color):
-        """Get pieces near a square (observable feature)"""
-        pieces = []
-        rank, file = divmod(square, 8)
+        """
+        Get pieces near a square (observable feature)
+
+        Returns a bitmask with one bit per piece type of color present within
+        two squares (see PIECE_BITS).
+        """
+        neighborhood = NEIGHBORHOOD[square]
+        mask = 0
 
-        for r in range(max(0, rank-2), min(8, rank+3)):
-            for f in range(max(0, file-2), min(8, file+3)):
-                sq = r * 8 + f
-                piece = board.piece_at(sq)
-                if piece and piece.color == color:
-                    pieces.append(piece.symbol().lower())
+        for piece_type, white_bit, black_bit in PIECE_BITS:
+            if board.pieces_mask(piece_type, color) & neighborhood:
+                mask |= white_bit if color == chess.WHITE else black_bit
 
-        return ','.join(pieces)
+        return mask
 
     def _path_blocked(self, board, from_sq, to_sq):
         """Check if path between squares is blocked"""
-        from_rank, from_file = divmod(from_sq, 8)
-        to_rank, to_file = divmod(to_sq, 8)
-
-        rank_dir = 0 if to_rank == from_rank else (1 if to_rank > from_rank else -1)
-        file_dir = 0 if to_file == from_file else (1 if to_file > from_file else -1)
-
-        current_rank, current_file = from_rank + rank_dir, from_file + file_dir
-
-        while (current_rank, current_file) != (to_rank, to_file):
-            sq = current_rank * 8 + current_file
-            if board.piece_at(sq):
-                return True  # Path blocked, piece jumped!
-            current_rank += rank_dir
-            current_file += file_dir
-
-        return False
+        return bool(board.occupied & BETWEEN[from_sq][to_sq])
 
     def _observe_game_end(self, board):
         """Learn what game end conditions look like"""
@@ -243,88 +475,119 @@ class MoveLearner:
             DO UPDATE SET times_seen = times_seen + 1
         ''', (end_type, features))
 
-        self.conn.commit()
-
     def _extract_position_features(self, board):
         """Extract observable features from position"""
+        # Piece counts straight from the occupancy bitboards
+        total = chess.popcount(board.occupied)
+        white = chess.popcount(board.occupied_co[chess.WHITE])
         features = {
-            'total_pieces': len(board.piece_map()),
-            'white_pieces': len([p for p in board.piece_map().values() if p.color]),
-            'black_pieces': len([p for p in board.piece_map().values() if not p.color]),
+            'total_pieces': total,
+            'white_pieces': white,
+            'black_pieces': total - white,
         }
         return str(features)
 
-    def predict_legal_moves(self, board, color):
+    def predict_legal_moves(self, board, color, pure_learning=True):
         """
         Predict legal moves based on learned patterns
 
         This REPLACES board.legal_moves() with learned knowledge!
+
+        With pure_learning=False (and color to move), learned candidates are
+        checked against python-chess's move generator instead of the learned
+        movement patterns - much faster, for callers such as search that
+        only need the learned move ranking.
+
+        Returns a MOVE_DTYPE structured array, one record per move.
         """
         predicted_moves = []
 
-        # Get all pieces of our color
-        for square, piece in board.piece_map().items():
-            if piece.color != color:
+        # Get all pieces of our color, numbered in piece_map() order
+        own = [(i, piece.symbol().lower(), square)
+               for i, (square, piece) in enumerate(board.piece_map().items())
+               if piece.color == color]
+        if not own:
+            return np.empty(0, dtype=MOVE_DTYPE)
+
+        # Query learned moves for all of them at once, grouped per piece
+        # (in piece order) and most observed first
+        values = ', '.join(['(?, ?, ?)'] * len(own))
+        self.cursor.execute(f'''
+            WITH own(ord, piece_type, from_square) AS (VALUES {values})
+            SELECT own.ord, own.piece_type, own.from_square,
+                   o.to_square, o.is_capture, o.times_observed, o.confidence
+            FROM own
+            JOIN observed_moves o
+              ON o.piece_type = own.piece_type AND o.from_square = own.from_square
+            ORDER BY own.ord, o.times_observed DESC
+        ''', [param for row in own for param in row])
+
+        rules_moves = None
+        if not pure_learning and color == board.turn:
+            rules_moves = {(move.from_square, move.to_square, board.is_capture(move))
+                           for move in board.generate_legal_moves()}
+
+        # Consider at most the 50 most observed moves per piece
+        current_ord = None
+        for ord_, piece_type, square, to_sq, is_capture, times, conf in self.cursor.fetchall():
+            if ord_ != current_ord:
+                current_ord, taken = ord_, 0
+            if taken == 50:
                 continue
+            taken += 1
 
-            piece_type = piece.symbol().lower()
-
-            # Query learned moves for this piece type
-            self.cursor.execute('''
-                SELECT to_square, is_capture, times_observed, confidence
-                FROM observed_moves
-                WHERE piece_type = ? AND from_square = ?
-                ORDER BY times_observed DESC
-                LIMIT 50
-            ''', (piece_type, square))
-
-            for to_sq, is_capture, times, conf in self.cursor.fetchall():
-                # Check if this move pattern matches current position
-                if self._move_pattern_matches(board, square, to_sq, piece_type, is_capture):
-                    predicted_moves.append({
-                        'from': square,
-                        'to': to_sq,
-                        'piece': piece_type,
-                        'confidence': conf,
-                        'seen': times
-                    })
-
-        return predicted_moves
+            # Check if this move pattern matches current position
+            if rules_moves is not None:
+                matches = (square, to_sq, bool(is_capture)) in rules_moves
+            else:
+                matches = self._move_pattern_matches(board, square, to_sq, piece_type, is_capture)
 
-    def _move_pattern_matches(self, board, from_sq, to_sq, piece_type, is_capture):
-        """Check if learned move pattern applies to current position"""
-        # Get learned pattern for this piece
+            if matches:
+                predicted_moves.append(
+                    (square, to_sq, PIECE_IDS[piece_type], times, conf))
+
+        return np.array(predicted_moves, dtype=MOVE_DTYPE)
+
+    def _load_patterns(self):
+        """
+        Load the learned PiecePattern of every piece type, indexed by
+        PIECE_IDS id (None for piece types not observed yet).
+        """
+        self._patterns = [None] * len(PIECE_TYPES)
         self.cursor.execute('''
-            SELECT max_distance, can_jump, direction_type
+            SELECT piece_type, max_distance, can_jump, direction_type
             FROM piece_movement_patterns
-            WHERE piece_type = ?
-        ''', (piece_type,))
-
-        pattern = self.cursor.fetchone()
-        if not pattern:
-            return False  # Haven't learned this piece yet
+        ''')
+        for piece_type, max_dist, can_jump, direction in self.cursor.fetchall():
+            self._patterns[PIECE_IDS[piece_type]] = PiecePattern(max_dist, bool(can_jump), direction)
 
-        max_dist, can_jump, direction = pattern
+        return self._patterns
 
-        from_rank, from_file = divmod(from_sq, 8)
-        to_rank, to_file = divmod(to_sq, 8)
+    def _move_pattern_matches(self, board, from_sq, to_sq, piece_type, is_capture):
+        """Check if learned move pattern applies to current position"""
+        # Get learned pattern for this piece
+        patterns = self._patterns
+        if patterns is None:
+            patterns = self._load_patterns()
+        pattern = patterns[PIECE_IDS[piece_type]]
+        if pattern is None:
+            return False  # Haven't learned this piece yet
 
-        rank_diff = abs(to_rank - from_rank)
-        file_diff = abs(to_file - from_file)
-        distance = max(rank_diff, file_diff)
+        distance, _, is_orthogonal, is_diagonal = MOVE_GEOMETRY[from_sq][to_sq]
 
         # Check distance
-        if distance > max_dist:
+        if distance > pattern.max_distance:
             return False
 
         # Check direction
-        if direction == 'orthogonal' and rank_diff != 0 and file_diff != 0:
+        direction = pattern.direction_type
+        if direction == 'orthogonal' and not is_orthogonal:
             return False
-        if direction == 'diagonal' and rank_diff != file_diff:
+        if direction == 'diagonal' and not is_diagonal:
             return False
 
         # Check if path is clear (unless piece can jump)
-        if not can_jump and self._path_blocked(board, from_sq, to_sq):
+        if not pattern.can_jump and self._path_blocked(board, from_sq, to_sq):
             return False
 
         # Check destination
@@ -393,7 +656,7 @@ def demonstrate_learning():
     print("DEMONSTRATING RULE LEARNING FROM OBSERVATION")
     print("=" * 70)
 
-    learner = MoveLearner(':memory:')
+    learner = MoveLearner(':memory:', verbose=True)
 
     # Sample PGN games for the AI to watch
     sample_games = [
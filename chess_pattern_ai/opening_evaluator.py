@@ -7,11 +7,24 @@ No hardcoded opening theory - patterns learned from game analysis.
 
 import sqlite3
 import logging
-from typing import Dict, List
+import functools
+import numpy as np
+from typing import Dict, List, Tuple
+
+from sqlite_pool import read_connection, is_pooled
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# FEN piece letters per side
+WHITE_PIECES = frozenset("PNBRQK")
+BLACK_PIECES = frozenset("pnbrqk")
+
+# bytes.translate delete tables: every byte except one side's piece letters,
+# so the length of what survives is that side's piece count
+_NOT_WHITE_PIECE = bytes(b for b in range(256) if chr(b) not in WHITE_PIECES)
+_NOT_BLACK_PIECE = bytes(b for b in range(256) if chr(b) not in BLACK_PIECES)
+
 
 class OpeningEvaluator:
     """Evaluates opening positions using discovered patterns"""
@@ -19,31 +32,46 @@ class OpeningEvaluator:
     def __init__(self, db_path: str = "rule_discovery.db"):
         self.db_path = db_path
         self.conn = None
-        self.cursor = None
         self.opening_weights = {}
 
+        # Weights read while scoring, set by _load_opening_weights (None
+        # until weights have been loaded)
+        self._dev_w = None
+        self._center_w = None
+
+        # Scores of positions already evaluated under the loaded weights,
+        # keyed by FEN board part; cleared whenever weights are (re)loaded
+        self._score_board = functools.lru_cache(maxsize=65536)(self._score_board_part)
+
         self._init_connection()
 
     def _init_connection(self):
-        """Initialize database connection"""
-        self.conn = sqlite3.connect(self.db_path)
-        self.cursor = self.conn.cursor()
+        """Initialize database connection (shared with other readers on this thread)"""
+        self.conn = read_connection(self.db_path)
+
+        # Read-only lookups: WAL lets them proceed while trainers write, and
+        # the file is memory-mapped (256MB) with a 64MB cache. :memory:
+        # databases have no journal file, so they skip WAL.
+        if self.db_path != ':memory:':
+            self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA mmap_size=268435456')
+        self.conn.execute('PRAGMA cache_size=-65536')
 
     def _load_opening_weights(self):
         """
         Load discovered opening weights from database
         These weights were learned from analyzing successful openings
         """
+        self._score_board.cache_clear()
+
         try:
             # Load opening weights discovered from game analysis
-            self.cursor.execute('''
+            result = self.conn.execute('''
                 SELECT development_weight, center_control_weight, repetition_penalty, observation_count
                 FROM discovered_opening_weights
                 ORDER BY id DESC
                 LIMIT 1
-            ''')
-
-            result = self.cursor.fetchone()
+            ''').fetchone()
             if result:
                 dev_w, center_w, rep_pen, obs_count = result
                 self.opening_weights = {
@@ -61,6 +89,13 @@ class OpeningEvaluator:
             logger.warning(f"Could not load opening patterns: {e}")
             self.opening_weights = {}
 
+        # With nothing discovered every opening scores 0
+        if self.opening_weights:
+            self._dev_w = self.opening_weights.get('development', 1.0)
+            self._center_w = self.opening_weights.get('center_control', 1.0)
+        else:
+            self._dev_w = self._center_w = 0.0
+
     def evaluate_opening(self, fen: str) -> float:
         """
         Evaluate opening position using discovered patterns
@@ -71,81 +106,121 @@ class OpeningEvaluator:
         Returns:
             Opening score from white's perspective (positive = white better opening)
         """
-        if not self.opening_weights:
+        # Only evaluate in opening phase (first ~15 moves): read the fullmove
+        # number off the end of the FEN before splitting out anything else
+        move_num = int(fen.rsplit(None, 1)[1])
+        if move_num > 15:
+            return 0.0  # Not in opening anymore
+
+        return self._evaluate_position(fen.split(None, 1)[0], move_num)
+
+    def evaluate_opening_from_board(self, board) -> float:
+        """
+        Same as evaluate_opening, but reads the position straight off a
+        chess.Board instead of round-tripping it through a FEN string
+
+        Args:
+            board: chess.Board of the position
+
+        Returns:
+            Opening score from white's perspective (positive = white better opening)
+        """
+        return self._evaluate_position(board.board_fen(), board.fullmove_number)
+
+    def evaluate_openings(self, fens: List[str]) -> np.ndarray:
+        """
+        Evaluate many opening positions at once (e.g. the positions after
+        each legal move), vectorized over the batch with NumPy
+
+        Args:
+            fens: FEN strings of the positions
+
+        Returns:
+            Array of opening scores, one per FEN, same as evaluate_opening
+        """
+        if self._dev_w is None:
             self._load_opening_weights()
 
-        # Parse FEN
-        board_part, turn, castling, ep, halfmove, fullmove = fen.split()
+        scores = np.zeros(len(fens))
+        if not fens:
+            return scores
+
+        # Only evaluate in opening phase (first ~15 moves)
+        in_opening = np.array([int(fen.rsplit(None, 1)[1]) <= 15 for fen in fens])
+
+        # One row of board-part bytes per position, space padded
+        board_parts = [fen.split(None, 1)[0] for fen in fens]
+        width = max(map(len, board_parts))
+        chars = np.frombuffer(
+            ''.join(part.ljust(width) for part in board_parts).encode('ascii'),
+            dtype=np.uint8).reshape(len(fens), width)
+
+        # Rank of each byte counted from the top: 0 = rank 8 .. 7 = rank 1
+        rank = np.cumsum(chars == ord('/'), axis=1)
+
+        # Count pieces that have moved, as in _count_activity: white pieces
+        # (uppercase) not on rank 1 or 2, black pieces (lowercase) not on
+        # rank 7 or 8
+        white = (chars >= ord('A')) & (chars <= ord('Z')) & (rank < 6)
+        black = (chars >= ord('a')) & (chars <= ord('z')) & (rank >= 2)
+        activity = white.sum(axis=1) - black.sum(axis=1)
+
+        # Apply development weight to activity difference
+        scores[in_opening] += self._dev_w * activity[in_opening]
+
+        return scores
+
+    def _evaluate_position(self, board_part: str, move_num: int) -> float:
+        """Opening score of a FEN board part at a given fullmove number"""
+        if self._dev_w is None:
+            self._load_opening_weights()
 
         # Only evaluate in opening phase (first ~15 moves)
-        move_num = int(fullmove)
         if move_num > 15:
             return 0.0  # Not in opening anymore
 
-        score = 0.0
-
-        # Apply discovered opening weights
-        if not self.opening_weights:
-            return 0.0
+        # The score depends only on the piece placement, so transpositions
+        # reached through different move orders share one evaluation
+        return self._score_board(board_part)
 
-        dev_w = self.opening_weights.get('development', 1.0)
-        center_w = self.opening_weights.get('center_control', 1.0)
+    def _score_board_part(self, board_part: str) -> float:
+        """Score a FEN board part with the loaded opening weights"""
+        score = 0.0
 
         # Apply discovered weights to observable features
         # Count piece activity (how many pieces have moved)
-        white_activity = self._count_piece_activity(board_part, 'white')
-        black_activity = self._count_piece_activity(board_part, 'black')
+        white_activity, black_activity = self._count_activity(board_part)
 
         # Apply development weight to activity difference
-        score += dev_w * (white_activity - black_activity)
+        score += self._dev_w * (white_activity - black_activity)
 
         return score
 
     def _count_piece_activity(self, board_part: str, color: str) -> int:
         """Count pieces away from starting positions (observable feature)"""
-        # Parse board
-        board = self._parse_board(board_part)
-
-        # Count pieces that have moved (observable, no assumptions about "good" squares)
-        piece_activity = 0
-
-        # Count total pieces for this color to measure development
-        for sq in range(64):
-            piece = board[sq]
-            if piece:
-                if color == 'white' and piece.isupper():
-                    # Any white piece not on rank 0 or 1 has moved forward
-                    rank = sq // 8
-                    if rank > 1:
-                        piece_activity += 1
-                elif color == 'black' and piece.islower():
-                    # Any black piece not on rank 6 or 7 has moved forward
-                    rank = sq // 8
-                    if rank < 6:
-                        piece_activity += 1
-
-        return piece_activity
-
-    def _parse_board(self, board_part: str) -> List:
-        """Parse FEN board part into 64-square array"""
-        board = [None] * 64
-        square = 56  # Start at a8
-
-        for rank in board_part.split('/'):
-            file = 0
-            for char in rank:
-                if char.isdigit():
-                    file += int(char)
-                else:
-                    board[square + file] = char
-                    file += 1
-            square -= 8
-
-        return board
+        white_activity, black_activity = self._count_activity(board_part)
+        return white_activity if color == 'white' else black_activity
+
+    def _count_activity(self, board_part: str) -> Tuple[int, int]:
+        """Piece activity (see _count_piece_activity) of (white, black) at once"""
+        board = board_part.encode('ascii')
+
+        # Count pieces that have moved (observable, no assumptions about "good" squares):
+        # any white piece not on rank 1 or 2, any black piece not on rank 7 or 8.
+        # FEN lists rank 8 first, so those home ranks are the last two / first
+        # two segments: cut them off without splitting the rest ('/' bytes are
+        # dropped by the delete tables anyway)
+        white_zone = board.rsplit(b'/', 2)[0]
+        black_zone = board.split(b'/', 2)[2]
+
+        white_activity = len(white_zone.translate(None, _NOT_WHITE_PIECE))
+        black_activity = len(black_zone.translate(None, _NOT_BLACK_PIECE))
+
+        return white_activity, black_activity
 
     def close(self):
-        """Close database connection"""
-        if self.conn:
+        """Close database connection (pooled connections stay open until exit)"""
+        if self.conn and not is_pooled(self.conn):
             self.conn.close()
 
 
@@ -12,13 +12,118 @@ make it smarter - it keeps trying the same losing moves because they
 evaluate well but perform poorly.
 """
 
-import sqlite3
+import functools
+import time
+from collections import defaultdict
 import chess
 from typing import Tuple, List
 import logging
 
+from sqlite_pool import read_connection, write_connection, write_lock, is_pooled
+
 logger = logging.getLogger(__name__)
 
+# Statements run on every recorded game or scored move, kept as constants so
+# the connection's statement cache always sees identical SQL
+_UPSERT_RESULT_SQL = '''
+INSERT INTO opening_performance (fen, move_uci, times_played, wins, draws, losses, sum_game_result, last_played)
+VALUES (?, ?, 1, ?, ?, ?, ?, ?)
+ON CONFLICT(fen, move_uci) DO UPDATE SET
+    times_played = times_played + 1,
+    wins = wins + excluded.wins,
+    draws = draws + excluded.draws,
+    losses = losses + excluded.losses,
+    sum_game_result = sum_game_result + excluded.sum_game_result,
+    last_played = excluded.last_played
+'''
+
+_SELECT_ADJUSTMENT_SQL = '''
+SELECT times_played, sum_game_result
+FROM opening_performance
+WHERE fen = ? AND move_uci = ?
+LIMIT 1
+'''
+
+_SELECT_STATS_SQL = '''
+SELECT move_uci, times_played, wins, draws, losses, sum_game_result
+FROM opening_performance
+WHERE fen = ?
+ORDER BY times_played DESC
+LIMIT ?
+'''
+
+
+_MERGE_LEGACY_SQL = '''
+INSERT INTO opening_performance (fen, move_uci, times_played, wins, draws, losses, sum_game_result, last_played)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(fen, move_uci) DO UPDATE SET
+    times_played = times_played + excluded.times_played,
+    wins = wins + excluded.wins,
+    draws = draws + excluded.draws,
+    losses = losses + excluded.losses,
+    sum_game_result = sum_game_result + excluded.sum_game_result,
+    last_played = MAX(last_played, excluded.last_played)
+'''
+
+
+# db_path -> number of times games were recorded to it by any tracker in
+# the process. Trackers on one database share its data but each has its
+# own adjustment cache, which is dropped when this moves on
+_db_generations = defaultdict(int)
+
+# PRAGMA user_version once the legacy-row migrations (_migrate_*) have run;
+# they rewrite the whole table, so they only run while it is lower
+_MIGRATED_USER_VERSION = 1
+
+# Game result -> (wins, draws, losses, game_score) to add to each recorded move
+_RESULT_INCREMENTS = {
+    'win': (1, 0, 0, 1.0),
+    'draw': (0, 1, 0, 0.5),
+    'loss': (0, 0, 1, 0.0),
+}
+
+
+def _canonicalize_fen(fen: str) -> str:
+    """
+    Position key for a FEN: placement, side to move, castling rights and
+    en passant square. The halfmove/fullmove clocks are dropped - they do
+    not change the position, and leaving them out keeps keys short.
+    """
+    return ' '.join(fen.split(None, 4)[:4])
+
+
+def _compute_adjustment(times_played: int, avg_result: float) -> float:
+    """
+    Score adjustment (see get_opening_adjustment) for a move from its
+    times_played and average game result
+    """
+    if times_played == 0:
+        # Never tried this move - no adjustment
+        return 0.0
+
+    # Calculate adjustment based on performance
+    # avg_result is 0.0 (all losses) to 1.0 (all wins)
+    # Map to -100 (terrible) to +100 (excellent)
+
+    # Center around 0.5 (expected with random play)
+    performance_delta = avg_result - 0.5  # Range: -0.5 to +0.5
+
+    # Scale by confidence (more games = more confident)
+    confidence = min(1.0, times_played / 10.0)  # Full confidence after 10 games
+
+    # Base adjustment: -50 to +50 points
+    base_adjustment = performance_delta * 100
+
+    # Scale by confidence
+    adjustment = base_adjustment * confidence
+
+    # Add exploration bonus for rarely-tried moves
+    if times_played < 3:
+        exploration_bonus = (3 - times_played) * 5  # +10 for never tried, +5 for tried once
+        adjustment += exploration_bonus
+
+    return adjustment
+
 
 class OpeningPerformanceTracker:
     """
@@ -29,14 +134,40 @@ class OpeningPerformanceTracker:
 
     def __init__(self, db_path: str = "rule_discovery.db"):
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.cursor = self.conn.cursor()
-
-        self._init_tables()
+        # Shared by every tracker on this database in the process, on every
+        # thread: each transaction on it holds _write_lock. Reads go through
+        # this thread's reader connection instead (see _reader)
+        self.conn = write_connection(db_path)
+        self._write_lock = write_lock(db_path)
+
+        # Adjustments already looked up, keyed by (fen, move_uci); search
+        # asks for the same pairs over and over, and results only change
+        # when a game is recorded, by this or any other tracker on the
+        # database (which moves _db_generations on, clearing it)
+        self._adjustment_cache = functools.lru_cache(maxsize=4096)(self._lookup_adjustment)
+        self._cache_generation = _db_generations[db_path]
+
+        with self._write_lock:
+            # Results are committed once per game (or batch of games); WAL
+            # with NORMAL sync keeps those commits from each forcing an fsync
+            if db_path != ':memory:':
+                self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+
+            self._init_tables()
+
+    def _reader(self):
+        """
+        Connection for reads on this thread (the writer itself for :memory:,
+        where any other connection would be a separate database)
+        """
+        if self.db_path == ':memory:':
+            return self.conn
+        return read_connection(self.db_path)
 
     def _init_tables(self):
         """Create table for tracking opening performance"""
-        self.cursor.execute('''
+        self.conn.execute('''
             CREATE TABLE IF NOT EXISTS opening_performance (
                 fen TEXT,
                 move_uci TEXT,
@@ -44,19 +175,84 @@ class OpeningPerformanceTracker:
                 wins INTEGER DEFAULT 0,
                 draws INTEGER DEFAULT 0,
                 losses INTEGER DEFAULT 0,
-                avg_game_result REAL DEFAULT 0.0,
-                last_played TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                sum_game_result REAL DEFAULT 0.0,  -- average = sum / times_played
+                last_played INTEGER,  -- unix time
                 PRIMARY KEY (fen, move_uci)
             )
         ''')
 
-        self.cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_opening_perf_fen
-            ON opening_performance(fen)
+        # Legacy rows (running averages, timestamp text, full-FEN keys) are
+        # migrated once per database
+        migrated = (self.conn.execute('PRAGMA user_version').fetchone()[0]
+                    >= _MIGRATED_USER_VERSION)
+        if not migrated:
+            self._migrate_avg_to_sum()
+
+        # Covering index for get_opening_stats: a position's moves come out
+        # already ordered by times_played with every selected column, so the
+        # query needs neither a sort nor table lookups. It also serves plain
+        # fen lookups, replacing the older indexes.
+        self.conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_opening_perf_stats
+            ON opening_performance(fen, times_played DESC, move_uci,
+                                   wins, draws, losses, sum_game_result)
         ''')
+        self.conn.execute('DROP INDEX IF EXISTS idx_opening_perf_fen')
+        self.conn.execute('DROP INDEX IF EXISTS idx_opening_perf_cover')
 
         self.conn.commit()
 
+        if not migrated:
+            self._migrate_timestamps()
+            self._migrate_fen_keys()
+            self.conn.execute(f'PRAGMA user_version = {_MIGRATED_USER_VERSION}')
+
+        # Refresh planner statistics when they are missing or stale
+        self.conn.execute('PRAGMA optimize')
+
+    def _migrate_avg_to_sum(self):
+        """
+        Add sum_game_result to tables that only stored a running
+        avg_game_result, backfilled as avg * times_played. The old column
+        is left in place but no longer written.
+        """
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(opening_performance)')}
+        if 'sum_game_result' in columns:
+            return
+
+        self.conn.execute('ALTER TABLE opening_performance ADD COLUMN sum_game_result REAL DEFAULT 0.0')
+        self.conn.execute('UPDATE opening_performance SET sum_game_result = avg_game_result * times_played')
+        logger.info("Migrated opening_performance to summed game results")
+
+    def _migrate_timestamps(self):
+        """Convert last_played values stored as timestamp text to unix time"""
+        with self.conn:
+            self.conn.execute('''
+                UPDATE opening_performance
+                SET last_played = CAST(strftime('%s', last_played) AS INTEGER)
+                WHERE typeof(last_played) = 'text'
+            ''')
+
+    def _migrate_fen_keys(self):
+        """
+        Rekey rows stored under full FENs (with move clocks) to
+        _canonicalize_fen keys, merging rows that land on the same key
+        """
+        rows = self.conn.execute('''
+            SELECT fen, move_uci, times_played, wins, draws, losses, sum_game_result, last_played
+            FROM opening_performance
+            WHERE fen LIKE '% % % % %'
+        ''').fetchall()
+        if not rows:
+            return
+
+        with self.conn:
+            self.conn.execute("DELETE FROM opening_performance WHERE fen LIKE '% % % % %'")
+            self.conn.executemany(_MERGE_LEGACY_SQL, [
+                (_canonicalize_fen(fen), *rest) for fen, *rest in rows])
+
+        logger.info(f"Rekeyed {len(rows)} opening records to canonical FENs")
+
     def record_opening_result(self, move_history: List[Tuple], result: str, ai_color: chess.Color):
         """
         Record the outcome of a game for opening moves
@@ -66,48 +262,56 @@ class OpeningPerformanceTracker:
             result: 'win', 'loss', or 'draw'
             ai_color: Color the AI was playing
         """
-        # Convert result to numerical score
-        if result == 'win':
-            game_score = 1.0
-        elif result == 'draw':
-            game_score = 0.5
-        else:  # loss
-            game_score = 0.0
+        # One transaction (and one commit) for the game
+        with self._write_lock:
+            with self.conn:
+                self._record_opening_result(move_history, result, ai_color)
+            self._results_changed()
+
+    def record_opening_results_bulk(self, games: List[Tuple]):
+        """
+        Record the outcomes of several games, committing them all in a
+        single transaction
+
+        Args:
+            games: List of (move_history, result, ai_color) tuples, as taken
+                by record_opening_result
+        """
+        with self._write_lock:
+            with self.conn:
+                for move_history, result, ai_color in games:
+                    self._record_opening_result(move_history, result, ai_color)
+            self._results_changed()
+
+    def _results_changed(self):
+        """
+        Invalidate the adjustment caches of every tracker on this database.
+        Called once recorded results are committed, so no tracker can cache
+        a value read before the commit under the new generation.
+        """
+        _db_generations[self.db_path] += 1
+
+    def _record_opening_result(self, move_history: List[Tuple], result: str, ai_color: chess.Color):
+        """Record one game's opening moves without committing"""
+        # Convert result to W/D/L increments and numerical score
+        wins, draws, losses, game_score = _RESULT_INCREMENTS.get(result, (0, 0, 0, 0.0))
+        now = int(time.time())
 
         # Record first 5 moves (opening)
         moves_to_record = min(5, len(move_history))
 
+        params = []
         for i, (fen, move_uci, move_san) in enumerate(move_history[:moves_to_record]):
-            board = chess.Board(fen)
-
-            # Only record our moves
-            if board.turn != ai_color:
+            # Only record our moves (side to move is the FEN's second field,
+            # no need to build a board for it)
+            white_to_move = fen.split(None, 2)[1] == 'w'
+            if white_to_move != (ai_color == chess.WHITE):
                 continue
 
-            # Upsert the performance record
-            self.cursor.execute('''
-                INSERT INTO opening_performance (fen, move_uci, times_played, wins, draws, losses, avg_game_result)
-                VALUES (?, ?, 1, ?, ?, ?, ?)
-                ON CONFLICT(fen, move_uci) DO UPDATE SET
-                    times_played = times_played + 1,
-                    wins = wins + ?,
-                    draws = draws + ?,
-                    losses = losses + ?,
-                    avg_game_result = (avg_game_result * times_played + ?) / (times_played + 1),
-                    last_played = CURRENT_TIMESTAMP
-            ''', (
-                fen, move_uci,
-                1 if result == 'win' else 0,
-                1 if result == 'draw' else 0,
-                1 if result == 'loss' else 0,
-                game_score,
-                1 if result == 'win' else 0,
-                1 if result == 'draw' else 0,
-                1 if result == 'loss' else 0,
-                game_score
-            ))
+            params.append((_canonicalize_fen(fen), move_uci, wins, draws, losses, game_score, now))
 
-        self.conn.commit()
+        # Upsert the performance records
+        self.conn.executemany(_UPSERT_RESULT_SQL, params)
 
     def get_opening_adjustment(self, fen: str, move_uci: str) -> float:
         """
@@ -119,42 +323,23 @@ class OpeningPerformanceTracker:
             - Negative for moves that have lost repeatedly
             - 0 for unexplored moves
         """
-        self.cursor.execute('''
-            SELECT times_played, wins, draws, losses, avg_game_result
-            FROM opening_performance
-            WHERE fen = ? AND move_uci = ?
-        ''', (fen, move_uci))
+        generation = _db_generations[self.db_path]
+        if generation != self._cache_generation:
+            self._adjustment_cache.cache_clear()
+            self._cache_generation = generation
+        return self._adjustment_cache(_canonicalize_fen(fen), move_uci)
 
-        row = self.cursor.fetchone()
+    def _lookup_adjustment(self, fen: str, move_uci: str) -> float:
+        """Uncached get_opening_adjustment (fen already canonical)"""
+        row = self._reader().execute(_SELECT_ADJUSTMENT_SQL, (fen, move_uci)).fetchone()
 
-        if not row or row[0] == 0:
+        if not row:
             # Never tried this move - no adjustment
             return 0.0
 
-        times_played, wins, draws, losses, avg_result = row
-
-        # Calculate adjustment based on performance
-        # avg_result is 0.0 (all losses) to 1.0 (all wins)
-        # Map to -100 (terrible) to +100 (excellent)
-
-        # Center around 0.5 (expected with random play)
-        performance_delta = avg_result - 0.5  # Range: -0.5 to +0.5
-
-        # Scale by confidence (more games = more confident)
-        confidence = min(1.0, times_played / 10.0)  # Full confidence after 10 games
-
-        # Base adjustment: -50 to +50 points
-        base_adjustment = performance_delta * 100
-
-        # Scale by confidence
-        adjustment = base_adjustment * confidence
-
-        # Add exploration bonus for rarely-tried moves
-        if times_played < 3:
-            exploration_bonus = (3 - times_played) * 5  # +10 for never tried, +5 for tried once
-            adjustment += exploration_bonus
-
-        return adjustment
+        times_played, sum_result = row
+        avg_result = sum_result / times_played if times_played else 0.0
+        return _compute_adjustment(times_played, avg_result)
 
     def get_opening_stats(self, fen: str) -> List[Tuple]:
         """
@@ -163,23 +348,32 @@ class OpeningPerformanceTracker:
         Returns:
             List of (move_uci, times_played, win_rate, avg_result, adjustment)
         """
-        self.cursor.execute('''
-            SELECT move_uci, times_played, wins, draws, losses, avg_game_result
-            FROM opening_performance
-            WHERE fen = ?
-            ORDER BY times_played DESC
-        ''', (fen,))
+        # A negative LIMIT means no limit
+        return self._stats_from_rows(self._fetch_stats_rows(fen, -1))
 
-        results = []
-        for row in self.cursor.fetchall():
-            move_uci, times_played, wins, draws, losses, avg_result = row
+    def get_opening_stats_top(self, fen: str, k: int) -> List[Tuple]:
+        """
+        Same as get_opening_stats, but only for the k most played moves
+        (the limit is applied by SQLite, so other rows are never fetched)
+        """
+        return self._stats_from_rows(self._fetch_stats_rows(fen, k))
+
+    def _fetch_stats_rows(self, fen: str, limit: int) -> List[Tuple]:
+        """Raw opening_performance rows for a position, most played first"""
+        return self._reader().execute(_SELECT_STATS_SQL, (_canonicalize_fen(fen), limit)).fetchall()
 
+    def _stats_from_rows(self, rows: List[Tuple]) -> List[Tuple]:
+        """get_opening_stats tuples from _fetch_stats_rows rows"""
+        results = []
+        for move_uci, times_played, wins, draws, losses, sum_result in rows:
             if times_played > 0:
                 win_rate = wins / times_played * 100
+                avg_result = sum_result / times_played
             else:
                 win_rate = 0.0
+                avg_result = 0.0
 
-            adjustment = self.get_opening_adjustment(fen, move_uci)
+            adjustment = _compute_adjustment(times_played, avg_result)
 
             results.append((move_uci, times_played, win_rate, avg_result, adjustment))
 
@@ -196,7 +390,10 @@ class OpeningPerformanceTracker:
         print("=" * 70)
         print(f"\nPosition: {fen}\n")
 
-        stats = self.get_opening_stats(fen)
+        # The 20 most played moves, with their W-D-L records, in one query
+        rows = self._fetch_stats_rows(fen, 20)
+        stats = self._stats_from_rows(rows)
+        records = {row[0]: f"{row[2]}-{row[3]}-{row[4]}" for row in rows}
 
         if not stats:
             print("No games played from this position yet.")
@@ -206,15 +403,7 @@ class OpeningPerformanceTracker:
         print("-" * 70)
 
         for move_uci, times_played, win_rate, avg_result, adjustment in stats:
-            # Get W-D-L record
-            self.cursor.execute('''
-                SELECT wins, draws, losses
-                FROM opening_performance
-                WHERE fen = ? AND move_uci = ?
-            ''', (fen, move_uci))
-
-            wins, draws, losses = self.cursor.fetchone()
-            record = f"{wins}-{draws}-{losses}"
+            record = records[move_uci]
 
             adj_str = f"{adjustment:+.1f}" if adjustment != 0 else "—"
 
@@ -222,6 +411,11 @@ class OpeningPerformanceTracker:
 
         print("=" * 70)
 
+    def close(self):
+        """Close database connection (pooled connections stay open until exit)"""
+        if self.conn and not is_pooled(self.conn):
+            self.conn.close()
+
 
 def test_opening_tracker():
     """Test the opening performance tracker"""
@@ -13,11 +13,97 @@ NO hardcoded square preferences - learns what works from outcomes
 """
 
 import chess
-from typing import List, Tuple
+import heapq
+import random
+from collections import defaultdict
+from operator import itemgetter
+from typing import List, Optional, Tuple
 import time
 from learnable_move_prioritizer import LearnableMovePrioritizer
 
 
+def _zobrist_table() -> Tuple[int, ...]:
+    """781 random 64-bit keys, fixed seed for stable hashes"""
+    rng = random.Random(0x43484553)
+    return tuple(rng.getrandbits(64) for _ in range(781))
+
+
+# ZOBRIST layout: [0, 768) one key per (piece, square), indexed by
+# ((piece_type - 1) * 2 + color) * 64 + square; then side to move, the
+# four castling rights and the eight en passant files
+ZOBRIST = _zobrist_table()
+ZOBRIST_WHITE_TO_MOVE = 768
+ZOBRIST_CASTLING = 769
+ZOBRIST_EP_FILE = 773
+
+# Transposition table entry flags: the stored value is exact, or only a
+# lower / upper bound because the search of that node was cut off
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+
+# Entries kept before the table is cleared
+TT_MAX_ENTRIES = 1 << 20
+
+# Plies covered by the killer move table
+MAX_PLY = 64
+
+PIECE_VALUES = {chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330,
+                chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0}
+
+# Static exchange evaluation values: a king can only recapture last, so it
+# is worth more than anything it could win
+SEE_VALUES = dict(PIECE_VALUES)
+SEE_VALUES[chess.KING] = 20000
+
+# Move flags computed once by _filter_sensible_moves and reused for ordering
+MOVE_CAPTURE = 2
+MOVE_CHECK = 1
+
+# Depth reduction of the null-move search (R)
+NULL_MOVE_REDUCTION = 2
+
+# Half-width of the aspiration window around the previous iteration's score
+ASPIRATION_WINDOW = 50
+
+# Tactics / mistakes seen in a batch of similar positions ({} = one '?'
+# placeholder per position), one row per position
+ROOT_CLUSTER_TACTICS_SQL = '''
+    SELECT fen_before, AVG(success_rate), AVG(material_gained), COUNT(*)
+    FROM learned_tactics
+    WHERE fen_before IN ({}) AND success_rate > 0.5
+    GROUP BY fen_before
+'''
+ROOT_CLUSTER_MISTAKES_SQL = '''
+    SELECT fen_before, AVG(material_lost), COUNT(*)
+    FROM learned_mistakes
+    WHERE fen_before IN ({})
+    GROUP BY fen_before
+'''
+
+
+def zobrist_key(board: chess.Board) -> int:
+    """Zobrist hash of a position (pieces, side to move, castling, en passant)"""
+    key = 0
+    for square, piece in board.piece_map().items():
+        key ^= ZOBRIST[((piece.piece_type - 1) * 2 + piece.color) * 64 + square]
+
+    if board.turn == chess.WHITE:
+        key ^= ZOBRIST[ZOBRIST_WHITE_TO_MOVE]
+
+    for i, rook_square in enumerate((chess.H1, chess.A1, chess.H8, chess.A8)):
+        if board.castling_rights & chess.BB_SQUARES[rook_square]:
+            key ^= ZOBRIST[ZOBRIST_CASTLING + i]
+
+    if board.ep_square is not None and board.has_legal_en_passant():
+        key ^= ZOBRIST[ZOBRIST_EP_FILE + chess.square_file(board.ep_square)]
+
+    return key
+
+
+def _move_int(move: chess.Move) -> int:
+    """Move packed into an int (from | to << 6 | promotion << 12), for fast set lookups"""
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
 class OptimizedSearchMixin:
     """
     Mixin to add intelligent move pruning to the AI
@@ -32,55 +118,165 @@ class OptimizedSearchMixin:
         if not hasattr(self, 'move_prioritizer'):
             self.move_prioritizer = LearnableMovePrioritizer()
 
+        # Transposition table: zobrist key -> (depth, flag, value, best_move),
+        # values from the perspective of the current root search
+        self.tt = {}
+        self._search_timed_out = False
+
+        # Move ordering learned during the search: two killer moves (quiet
+        # moves that caused a cutoff) per remaining depth, and a history
+        # score per (piece_type, to_square) for quiet cutoff moves
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = defaultdict(int)
+
+    def _order_moves(self, board: chess.Board, moves: List[Tuple[chess.Move, int]], depth: int,
+                     tt_move: Optional[chess.Move]) -> List[Tuple[chess.Move, int]]:
+        """
+        Order (move, flags) pairs for alpha-beta: transposition table move,
+        then captures by most valuable victim / least valuable attacker,
+        then killer moves, then checks, then quiet moves by history score
+        """
+        killers = self.killers[depth]
+        history = self.history
+
+        def order_key(entry):
+            move, flags = entry
+            if move == tt_move:
+                return (5, 0)
+            if flags & MOVE_CAPTURE:
+                # En passant captures have no piece on the destination
+                victim = board.piece_type_at(move.to_square) or chess.PAWN
+                attacker = board.piece_type_at(move.from_square)
+                return (4, victim * 8 - attacker)
+            if move == killers[0]:
+                return (3, 1)
+            if move == killers[1]:
+                return (3, 0)
+            if flags & MOVE_CHECK:
+                return (2, 0)
+            return (1, history[(board.piece_type_at(move.from_square), move.to_square)])
+
+        return sorted(moves, key=order_key, reverse=True)
+
+    def _see(self, board: chess.Board, move: chess.Move,
+             piece_types: Optional[List[Optional[int]]] = None,
+             attacks: Optional[dict] = None) -> int:
+        """
+        Static exchange evaluation: material the side to move wins (negative
+        = loses) on move.to_square if both sides then keep recapturing there
+        with their least valuable attacker
+
+        Read off the board before the move is made, with no push/pop;
+        attackers hidden behind other attackers (x-rays) are not counted.
+
+        piece_types (piece type per square) and attacks (to_square ->
+        (black, white) attacker masks, filled in here) let callers share
+        that work across every move from one position.
+        """
+        to_square = move.to_square
+        mover = board.turn
+        piece_type_at = piece_types.__getitem__ if piece_types is not None else board.piece_type_at
+        moving = piece_type_at(move.from_square)
+
+        if to_square == board.ep_square and moving == chess.PAWN:
+            captured = chess.PAWN  # en passant
+        else:
+            captured = piece_type_at(to_square)
+
+        masks = attacks.get(to_square) if attacks is not None else None
+        if masks is None:
+            masks = (board.attackers_mask(chess.BLACK, to_square),
+                     board.attackers_mask(chess.WHITE, to_square))
+            if attacks is not None:
+                attacks[to_square] = masks
+        attackers = {
+            mover: masks[mover] & ~chess.BB_SQUARES[move.from_square],
+            not mover: masks[not mover],
+        }
+
+        # gains[i]: material balance for the side making capture i, if the
+        # exchange stopped right after it
+        gains = [SEE_VALUES[captured] if captured else 0]
+        on_square = SEE_VALUES[move.promotion or moving]
+        side = not mover
+
+        while attackers[side]:
+            # Recapture with the least valuable attacker
+            for piece_type in (chess.PAWN, chess.KNIGHT, chess.BISHOP,
+                               chess.ROOK, chess.QUEEN, chess.KING):
+                candidates = attackers[side] & board.pieces_mask(piece_type, side)
+                if candidates:
+                    break
+            attackers[side] ^= candidates & -candidates
+
+            gains.append(on_square - gains[-1])
+            on_square = SEE_VALUES[piece_type]
+            side = not side
+
+        # Either side may stop recapturing when continuing would lose more
+        while len(gains) > 1:
+            last = gains.pop()
+            gains[-1] = -max(-gains[-1], last)
+
+        return gains[0]
+
+    def _record_cutoff(self, board: chess.Board, move: chess.Move, flags: int, depth: int):
+        """Remember a quiet move that caused a beta cutoff (killer + history)"""
+        if flags & MOVE_CAPTURE:
+            return
+
+        killers = self.killers[depth]
+        if move != killers[0]:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[(board.piece_type_at(move.from_square), move.to_square)] += depth * depth
+
     def _filter_sensible_moves(self, board: chess.Board, perspective: chess.Color,
-                               depth: int) -> List[chess.Move]:
+                               depth: int) -> List[Tuple[chess.Move, int]]:
         """
         Filter moves to only those worth considering
 
         Returns:
-            List of sensible moves (much smaller than all legal moves)
+            List of (move, flags) for sensible moves (much smaller than all
+            legal moves), flags being MOVE_CAPTURE / MOVE_CHECK bits so
+            move ordering doesn't have to test them again
         """
         legal_moves = list(board.legal_moves)
 
         # At depth 0 or few moves, return all
         if depth <= 0 or len(legal_moves) <= 5:
-            return legal_moves
+            return [(move, self._move_flags(board, move)) for move in legal_moves]
 
         sensible_moves = []
-        piece_values = {chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330,
-                       chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0}
+
+        # Per-position tables, built once instead of per move: the opponent's
+        # pieces (capture test), the piece type on each square, and the
+        # attackers of each destination square (filled in by _see)
+        them = board.occupied_co[not board.turn]
+        ep_square = board.ep_square
+        piece_types = [None] * 64
+        for square, piece in board.piece_map().items():
+            piece_types[square] = piece.piece_type
+        attacks = {}
 
         for move in legal_moves:
-            # Always include forcing moves
-            if board.is_capture(move) or board.gives_check(move):
-                sensible_moves.append(move)
+            # Always include forcing moves (checks are only looked for
+            # among non-captures, which is all that ordering needs)
+            to_square = move.to_square
+            if ((them >> to_square) & 1 or
+                    (to_square == ep_square and piece_types[move.from_square] == chess.PAWN)):
+                sensible_moves.append((move, MOVE_CAPTURE))
+                continue
+            if board.gives_check(move):
+                sensible_moves.append((move, MOVE_CHECK))
                 continue
 
-            # Check if move hangs a piece badly (observable - prune obvious blunders)
-            piece = board.piece_at(move.from_square)
-            if piece:
-                board.push(move)
-
-                # Is the moved piece now hanging?
-                attackers = len(list(board.attackers(not perspective, move.to_square)))
-                defenders = len(list(board.attackers(perspective, move.to_square)))
-
-                piece_value = piece_values.get(piece.piece_type, 0)
-
-                # If piece is hanging and valuable, skip this move
-                if attackers > defenders and piece_value > 100:
-                    # Unless it's a sacrifice for checkmate
-                    if not board.is_checkmate():
-                        board.pop()
-                        continue  # Skip this bad move!
-
-                # Don't move king into check (observable - illegal position)
-                if piece.piece_type == chess.KING:
-                    if board.is_check():
-                        board.pop()
-                        continue  # King walked into check - bad!
-
-                board.pop()
+            # Check if move hangs a piece badly (observable - prune obvious blunders):
+            # losing more than a pawn in the exchange on the destination square.
+            # (Checks were taken above, so this can't be a mating sacrifice, and
+            # legal moves never walk the king into check.)
+            if self._see(board, move, piece_types, attacks) < -PIECE_VALUES[chess.PAWN]:
+                continue  # Skip this bad move!
 
             # For quiet moves, use LEARNED priorities
             # Check if this move type has historically led to wins
@@ -89,21 +285,29 @@ class OptimizedSearchMixin:
             # Include moves with learned priority above threshold
             # (Threshold adapts: forcing moves ~70+, quiet moves 20-40)
             if move_priority >= 30.0:  # Learned cutoff
-                sensible_moves.append(move)
+                sensible_moves.append((move, 0))
             # Always include some moves to explore new patterns
             elif len(sensible_moves) < 10:
-                sensible_moves.append(move)
+                sensible_moves.append((move, 0))
 
         # If we filtered too aggressively, add back some moves
+        # (forcing moves were all taken, so these are quiet)
         if len(sensible_moves) < 3 and len(legal_moves) > 3:
             # Add a few more moves
+            included = {_move_int(m) for m, _ in sensible_moves}
             for move in legal_moves:
-                if move not in sensible_moves:
-                    sensible_moves.append(move)
+                if _move_int(move) not in included:
+                    sensible_moves.append((move, 0))
                     if len(sensible_moves) >= 8:
                         break
 
-        return sensible_moves if sensible_moves else legal_moves
+        return sensible_moves if sensible_moves else [(move, 0) for move in legal_moves]
+
+    def _move_flags(self, board: chess.Board, move: chess.Move) -> int:
+        """MOVE_CAPTURE / MOVE_CHECK bits for a move"""
+        if board.is_capture(move):
+            return MOVE_CAPTURE
+        return MOVE_CHECK if board.gives_check(move) else 0
 
     def minimax_optimized(self, board: chess.Board, depth: int, alpha: float, beta: float,
                          maximizing: bool, perspective: chess.Color, start_time: float) -> float:
@@ -113,47 +317,116 @@ class OptimizedSearchMixin:
         """
         # Time check
         if time.time() - start_time > self.time_limit:
+            self._search_timed_out = True
             return self.evaluate_position(board, perspective)
 
+        if depth == 0:
+            return self.evaluate_position(board, perspective)
+
+        # Transposition table: reuse the result of an earlier search of this
+        # position (reached through another move order) at least as deep
+        alpha_orig, beta_orig = alpha, beta
+        key = zobrist_key(board)
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            tt_depth, tt_flag, tt_value, tt_move = entry
+            if tt_depth >= depth:
+                if tt_flag == TT_EXACT:
+                    return tt_value
+                if tt_flag == TT_LOWER:
+                    alpha = max(alpha, tt_value)
+                else:
+                    beta = min(beta, tt_value)
+                if beta <= alpha:
+                    return tt_value
+
         # Terminal conditions
-        if depth == 0 or board.is_game_over():
+        if board.is_game_over():
             return self.evaluate_position(board, perspective)
 
+        # Null-move pruning: let the side to move pass. If a shallower search
+        # still fails high (maximizing) / low (minimizing), a real move would
+        # too, so the node is cut off. Not when in check (passing would be
+        # illegal), straight after another null move, or with only pawns
+        # left (zugzwang, where passing would be an advantage)
+        after_null = bool(board.move_stack) and not board.move_stack[-1]
+        if (depth >= 3 and not after_null and not board.is_check() and
+                board.occupied_co[board.turn] & ~(board.pawns | board.kings)):
+            null_depth = depth - 1 - NULL_MOVE_REDUCTION
+            board.push(chess.Move.null())
+            if maximizing:
+                null_eval = self.minimax_optimized(board, null_depth, beta - 1, beta,
+                                                   False, perspective, start_time)
+            else:
+                null_eval = self.minimax_optimized(board, null_depth, alpha, alpha + 1,
+                                                   True, perspective, start_time)
+            board.pop()
+
+            if null_eval >= beta if maximizing else null_eval <= alpha:
+                return null_eval
+
         # Get FILTERED moves (only sensible ones!)
         legal_moves = self._filter_sensible_moves(board, perspective, depth)
 
-        # Move ordering: sort by LEARNED priority for better alpha-beta pruning
-        # Higher priority moves searched first = more cutoffs = faster search
-        legal_moves = self.move_prioritizer.sort_moves_by_priority(board, legal_moves)
+        # Move ordering: likely best moves first = more cutoffs = faster search
+        # (learned priorities already decided which moves survive the filter)
+        legal_moves = self._order_moves(board, legal_moves, depth, tt_move)
 
-        if maximizing:
-            max_eval = -99999
-            for move in legal_moves:
-                board.push(move)
-                eval = self.minimax_optimized(board, depth - 1, alpha, beta, False, perspective, start_time)
-                board.pop()
+        # Bound methods looked up once for the loops below (every node runs
+        # them once per move)
+        push, pop = board.push, board.pop
+        search = self.minimax_optimized
+        child_depth = depth - 1
 
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
+        best_move = None
+        if maximizing:
+            best_eval = -99999
+            for move, flags in legal_moves:
+                push(move)
+                eval = search(board, child_depth, alpha, beta, False, perspective, start_time)
+                pop()
+
+                if eval > best_eval:
+                    best_eval = eval
+                    best_move = move
+                    if eval > alpha:
+                        alpha = eval
 
                 if beta <= alpha:
+                    self._record_cutoff(board, move, flags, depth)
                     break  # Beta cutoff
-
-            return max_eval
         else:
-            min_eval = 99999
-            for move in legal_moves:
-                board.push(move)
-                eval = self.minimax_optimized(board, depth - 1, alpha, beta, True, perspective, start_time)
-                board.pop()
-
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
+            best_eval = 99999
+            for move, flags in legal_moves:
+                push(move)
+                eval = search(board, child_depth, alpha, beta, True, perspective, start_time)
+                pop()
+
+                if eval < best_eval:
+                    best_eval = eval
+                    best_move = move
+                    if eval < beta:
+                        beta = eval
 
                 if beta <= alpha:
+                    self._record_cutoff(board, move, flags, depth)
                     break  # Alpha cutoff
 
-            return min_eval
+        # Store the result, unless the clock ran out somewhere below (those
+        # values come from cut-short searches)
+        if not self._search_timed_out:
+            if best_eval <= alpha_orig:
+                flag = TT_UPPER
+            elif best_eval >= beta_orig:
+                flag = TT_LOWER
+            else:
+                flag = TT_EXACT
+            if len(self.tt) >= TT_MAX_ENTRIES:
+                self.tt.clear()
+            self.tt[key] = (depth, flag, best_eval, best_move)
+
+        return best_eval
 
     def find_best_move_optimized(self, fen: str, use_optimized: bool = True) -> Tuple[str, float]:
         """
@@ -167,6 +440,9 @@ class OptimizedSearchMixin:
         STAGE 2: Deep minimax search with fast evaluation
                  - Uses only exact pattern matching
                  - Always fast, no expensive queries
+                 - Iterative deepening: each depth reuses the move order,
+                   transposition table and an aspiration window from the
+                   previous one, and stops cleanly on the time limit
         """
         start_time = time.time()
         board = chess.Board(fen)
@@ -177,60 +453,123 @@ class OptimizedSearchMixin:
         legal_moves = list(board.legal_moves)
         perspective = board.turn
 
+        # Table values are relative to the root's perspective and the
+        # current learned evaluation, so each search starts fresh
+        self.tt.clear()
+        self._search_timed_out = False
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history.clear()
+
         best_move = legal_moves[0]
         best_score = -99999
 
         # ===================================================================
         # STAGE 1: ROOT MOVE ORDERING (Comprehensive, uses adaptive cache)
         # ===================================================================
+        # Every root move starts from the same position: one FEN for all
+        fen_before = board.fen()
+
         move_scores = []
         for move in legal_moves:
             board.push(move)
 
             # Use FULL evaluation including clustering at root
-            quick_score = self._evaluate_root_move(board, move, perspective)
+            quick_score = self._evaluate_root_move(board, move, perspective, fen_before)
 
             board.pop()
             move_scores.append((move, quick_score))
 
-        # Sort by comprehensive evaluation
-        move_scores.sort(key=lambda x: x[1], reverse=True)
-
-        # Search only top N moves (intelligent pruning)
+        # Search only top N moves (intelligent pruning), best comprehensive
+        # evaluation first: select them without sorting the rest
         top_n = min(15, len(move_scores))
+        move_scores = heapq.nlargest(top_n, move_scores, key=itemgetter(1))
 
         # ===================================================================
         # STAGE 2: DEEP SEARCH (Fast, exact matching only)
         # ===================================================================
-        for i, (move, quick_score) in enumerate(move_scores[:top_n]):
+        root_moves = [move for move, _ in move_scores]
+        score = None
+
+        for depth in range(1, self.search_depth + 1):
+            # Narrow window around the last score; full window if it misses
+            if score is None:
+                alpha, beta = -99999, 99999
+            else:
+                alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+
+            move, result, root_scores, complete = self._search_depth(
+                board, depth, alpha, beta, root_moves, perspective, start_time, use_optimized)
+            if complete and (result <= alpha or result >= beta) and (alpha, beta) != (-99999, 99999):
+                move, result, root_scores, complete = self._search_depth(
+                    board, depth, -99999, 99999, root_moves, perspective, start_time, use_optimized)
+
+            # A depth cut short by the clock only counts if there is nothing better
+            if complete or score is None:
+                best_move, best_score = move, result
+                score = result
+            if not complete:
+                break
+
+            # Next depth tries this depth's best moves first
+            scored = dict(root_scores)
+            root_moves.sort(key=lambda m: scored.get(m, -99999), reverse=True)
+
+            # Not enough time left for a deeper iteration
+            if time.time() - start_time > self.time_limit * 0.5:
+                break
+
+        return best_move.uci(), best_score
+
+    def _search_depth(self, board: chess.Board, depth: int, alpha: float, beta: float,
+                      moves: List[chess.Move], perspective: chess.Color, start_time: float,
+                      use_optimized: bool = True) -> Tuple[chess.Move, float, List[Tuple[chess.Move, float]], bool]:
+        """
+        Search the root moves to a fixed depth within (alpha, beta)
+
+        Returns:
+            (best_move, best_score, [(move, score) searched], complete), where
+            complete is False if the time limit cut the search short.
+            Scores of moves that did not beat the best are upper bounds.
+        """
+        best_move = moves[0]
+        best_score = -99999
+        root_scores = []
+        self._search_timed_out = False
+
+        for move in moves:
             board.push(move)
 
             # Use optimized minimax WITHOUT expensive clustering queries
             if use_optimized:
                 eval_score = self.minimax_optimized(
-                    board, self.search_depth - 1, -99999, 99999,
+                    board, depth - 1, max(alpha, best_score), beta,
                     False, perspective, start_time
                 )
             else:
                 eval_score = self.minimax(
-                    board, self.search_depth - 1, -99999, 99999,
+                    board, depth - 1, max(alpha, best_score), beta,
                     False, perspective, start_time
                 )
 
             board.pop()
+            root_scores.append((move, eval_score))
 
             if eval_score > best_score:
                 best_score = eval_score
                 best_move = move
 
+            # Fail high: the window has to be widened anyway
+            if best_score >= beta:
+                break
+
             # Time check
             if time.time() - start_time > self.time_limit * 0.9:
-                break
+                return best_move, best_score, root_scores, False
 
-        return best_move.uci(), best_score
+        return best_move, best_score, root_scores, not self._search_timed_out
 
     def _evaluate_root_move(self, board: chess.Board, move: chess.Move,
-                           perspective: chess.Color) -> float:
+                           perspective: chess.Color, fen_before: Optional[str] = None) -> float:
         """
         Comprehensive evaluation for root moves
 
@@ -242,8 +581,15 @@ class OptimizedSearchMixin:
 
         Called ~30 times per move (once per legal move)
         Gets faster over time as adaptive cache fills
+
+        board is the position after move; fen_before is the FEN of the
+        position the move was played from (read off board.move_stack if
+        not given)
         """
-        fen_before = board.fen()
+        if fen_before is None:
+            board.pop()
+            fen_before = board.fen()
+            board.push(move)
 
         # Basic position evaluation (fast)
         base_score = self.evaluate_position(board, perspective)
@@ -323,31 +669,29 @@ class OptimizedSearchMixin:
                 if not similar:
                     return 0.0
 
-                # Query patterns from similar positions
+                # Query patterns from all similar positions at once:
+                # one query per table, grouped by position
+                sim_fens = list({sim_fen for sim_fen, _, _ in similar})
+                placeholders = ','.join('?' * len(sim_fens))
+
+                # Tactics from similar positions
+                self.cursor.execute(ROOT_CLUSTER_TACTICS_SQL.format(placeholders), sim_fens)
+                tactics = {row[0]: row[1:] for row in self.cursor.fetchall()}
+
+                # Mistakes from similar positions
+                self.cursor.execute(ROOT_CLUSTER_MISTAKES_SQL.format(placeholders), sim_fens)
+                mistakes = {row[0]: row[1:] for row in self.cursor.fetchall()}
+
                 for sim_fen, distance, cluster_id in similar:
                     weight = 1.0 / (1.0 + distance)  # Closer = more relevant
 
-                    # Check tactics from similar position
-                    self.cursor.execute('''
-                        SELECT AVG(success_rate), AVG(material_gained), COUNT(*)
-                        FROM learned_tactics
-                        WHERE fen_before = ? AND success_rate > 0.5
-                    ''', (sim_fen,))
-
-                    row = self.cursor.fetchone()
+                    row = tactics.get(sim_fen)
                     if row and row[0]:
                         avg_success, avg_gain, count = row
                         confidence = min(1.0, count / 5.0)
                         bonus += (avg_success * 50 + (avg_gain or 0) * 10) * weight * confidence
 
-                    # Check mistakes from similar position
-                    self.cursor.execute('''
-                        SELECT AVG(material_lost), COUNT(*)
-                        FROM learned_mistakes
-                        WHERE fen_before = ?
-                    ''', (sim_fen,))
-
-                    row = self.cursor.fetchone()
+                    row = mistakes.get(sim_fen)
                     if row and row[0]:
                         avg_loss, count = row
                         confidence = min(1.0, count / 3.0)
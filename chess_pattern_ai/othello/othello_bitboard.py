@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Othello Bitboard Kernels - Flip Detection on Two 64-bit Boards
+
+Each color is a 64-bit bitboard, bit (row * 8 + col) set where that color
+has a disc. Flips are found with a shift-and-mask fill: in each of the 8
+directions, grow a run of opponent discs out from the move (at most 6
+long); the run flips if the square past its end holds an own disc.
+Legal moves use the same fill, grown from every own disc at once: an
+empty square just past a run is a legal move.
+
+The kernels only touch integers, so they are compiled with Numba when
+available (uint64 arithmetic, no Python objects); otherwise the same
+algorithms run on plain Python ints. Both give identical results.
+"""
+
+try:
+    import numpy as np
+    from numba import njit, types
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+FULL_BOARD = 0xFFFFFFFFFFFFFFFF
+NOT_A_FILE = 0xFEFEFEFEFEFEFEFE  # every square except column 0
+NOT_H_FILE = 0x7F7F7F7F7F7F7F7F  # every square except column 7
+
+# (shift, mask) per direction: shift the bitboard left by shift (right by
+# -shift), then mask off the squares that wrapped around a board edge
+DIRECTION_SHIFTS = (
+    (-8, FULL_BOARD),   # up
+    (8, FULL_BOARD),    # down
+    (-1, NOT_H_FILE),   # left
+    (1, NOT_A_FILE),    # right
+    (-9, NOT_H_FILE),   # up-left
+    (-7, NOT_A_FILE),   # up-right
+    (7, NOT_H_FILE),    # down-left
+    (9, NOT_A_FILE),    # down-right
+)
+
+# Side arguments of the kernels
+BLACK = 0
+WHITE = 1
+
+
+def _flips_py(black: int, white: int, square: int, side: int) -> int:
+    """Bitboard of discs flipped when side plays on square (0 if none)"""
+    if side == BLACK:
+        own, opp = black, white
+    else:
+        own, opp = white, black
+
+    move_bit = 1 << square
+    flips = 0
+    for shift, mask in DIRECTION_SHIFTS:
+        if shift > 0:
+            run = (move_bit << shift) & mask & opp
+            for _ in range(5):
+                run |= (run << shift) & mask & opp
+            if (run << shift) & mask & own:
+                flips |= run
+        else:
+            shift = -shift
+            run = (move_bit >> shift) & mask & opp
+            for _ in range(5):
+                run |= (run >> shift) & mask & opp
+            if (run >> shift) & mask & own:
+                flips |= run
+    return flips
+
+
+def _legal_py(black: int, white: int, side: int) -> int:
+    """Bitboard of the squares side can legally play on"""
+    if side == BLACK:
+        own, opp = black, white
+    else:
+        own, opp = white, black
+
+    empty = ~(black | white) & FULL_BOARD
+    legal = 0
+    for shift, mask in DIRECTION_SHIFTS:
+        if shift > 0:
+            run = (own << shift) & mask & opp
+            for _ in range(5):
+                run |= (run << shift) & mask & opp
+            legal |= (run << shift) & mask & empty
+        else:
+            shift = -shift
+            run = (own >> shift) & mask & opp
+            for _ in range(5):
+                run |= (run >> shift) & mask & opp
+            legal |= (run >> shift) & mask & empty
+    return legal
+
+
+if NUMBA_AVAILABLE:
+    # DIRECTION_SHIFTS as uint64 arrays (Numba freezes global arrays into
+    # the compiled code); uint64 left shifts drop overflow by themselves
+    _SHIFT_LEFT = np.array([shift > 0 for shift, _ in DIRECTION_SHIFTS], dtype=np.bool_)
+    _SHIFT_BITS = np.array([abs(shift) for shift, _ in DIRECTION_SHIFTS], dtype=np.uint64)
+    _SHIFT_MASKS = np.array([mask for _, mask in DIRECTION_SHIFTS], dtype=np.uint64)
+
+    @njit(types.uint64(types.uint64, types.uint64, types.int64, types.int64), cache=True)
+    def _flips_njit(black, white, square, side):
+        if side == 0:
+            own = black
+            opp = white
+        else:
+            own = white
+            opp = black
+
+        move_bit = np.uint64(1) << np.uint64(square)
+        flips = np.uint64(0)
+        for d in range(8):
+            bits = _SHIFT_BITS[d]
+            mask = _SHIFT_MASKS[d]
+            if _SHIFT_LEFT[d]:
+                run = (move_bit << bits) & mask & opp
+                for _ in range(5):
+                    run |= (run << bits) & mask & opp
+                if (run << bits) & mask & own:
+                    flips |= run
+            else:
+                run = (move_bit >> bits) & mask & opp
+                for _ in range(5):
+                    run |= (run >> bits) & mask & opp
+                if (run >> bits) & mask & own:
+                    flips |= run
+        return flips
+
+    @njit(types.uint64(types.uint64, types.uint64, types.int64), cache=True)
+    def _legal_njit(black, white, side):
+        if side == 0:
+            own = black
+            opp = white
+        else:
+            own = white
+            opp = black
+
+        empty = ~(black | white)
+        legal = np.uint64(0)
+        for d in range(8):
+            bits = _SHIFT_BITS[d]
+            mask = _SHIFT_MASKS[d]
+            if _SHIFT_LEFT[d]:
+                run = (own << bits) & mask & opp
+                for _ in range(5):
+                    run |= (run << bits) & mask & opp
+                legal |= (run << bits) & mask & empty
+            else:
+                run = (own >> bits) & mask & opp
+                for _ in range(5):
+                    run |= (run >> bits) & mask & opp
+                legal |= (run >> bits) & mask & empty
+        return legal
+
+    def flip_mask(black: int, white: int, square: int, side: int) -> int:
+        """Bitboard of discs flipped when side plays on square (0 if none)"""
+        return int(_flips_njit(black, white, square, side))
+
+    def legal_moves_bb(black: int, white: int, side: int) -> int:
+        """Bitboard of the squares side can legally play on"""
+        return int(_legal_njit(black, white, side))
+else:
+    flip_mask = _flips_py
+    legal_moves_bb = _legal_py
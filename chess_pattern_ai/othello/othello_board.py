@@ -9,10 +9,15 @@ Philosophy: Minimal hardcoded rules
 - Valid move detection based on flips
 """
 
-from typing import List, Tuple, Optional, Set
+import itertools
+import re
+from typing import Iterator, List, Tuple, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
 
+from . import othello_bitboard
+from .othello_bitboard import FULL_BOARD, flip_mask, legal_moves_bb
+
 
 class Color(Enum):
     BLACK = "black"
@@ -61,12 +66,43 @@ class Move:
         return f"{col_char}{8 - row}"
 
 
+def _row_fen_table() -> dict:
+    """
+    FEN text of every possible row, keyed by (black_byte << 8) | white_byte
+    (bit col of each byte set where that color has a disc in the row)
+    """
+    table = {}
+    for cells in itertools.product('.BW', repeat=8):
+        black_byte = sum(1 << col for col, cell in enumerate(cells) if cell == 'B')
+        white_byte = sum(1 << col for col, cell in enumerate(cells) if cell == 'W')
+        # Runs of empty squares become their length
+        table[(black_byte << 8) | white_byte] = re.sub(
+            r'\.+', lambda run: str(len(run.group())), ''.join(cells))
+    return table
+
+
+# 3^8 = 6561 rows, looked up one board row (byte) at a time by to_fen
+ROW_FEN = _row_fen_table()
+
+
+def _iter_discs(bitboard: int, color: Color) -> Iterator[Disc]:
+    """Disc objects for the set bits of a bitboard, built as they are consumed"""
+    while bitboard:
+        lsb = bitboard & -bitboard
+        yield Disc(color, divmod(lsb.bit_length() - 1, 8))
+        bitboard ^= lsb
+
+
 class OthelloBoard:
     """
     Othello/Reversi board - 8x8 with Black/White discs
 
     Coordinates: (row, col) where row 0 is top, row 7 is bottom
     All squares are valid play areas
+
+    Discs are stored as two bitboards (black, white; see othello_bitboard);
+    Disc objects are only built when asked for (get_disc_at, get_discs,
+    board, discs).
     """
 
     # 8 directions: up, down, left, right, and 4 diagonals
@@ -82,8 +118,8 @@ class OthelloBoard:
     ]
 
     def __init__(self):
-        self.board = [[None for _ in range(8)] for _ in range(8)]
-        self.discs: Set[Disc] = set()
+        self.black = 0
+        self.white = 0
         self.turn = Color.BLACK  # Black moves first
         self.move_history: List[Move] = []
         self.passes = 0  # Consecutive passes to detect game over
@@ -94,22 +130,48 @@ class OthelloBoard:
         # Center 2x2 with alternating colors
         # Row 3: White Black
         # Row 4: Black White
-        self._place_disc(Disc(Color.WHITE, (3, 3)))
-        self._place_disc(Disc(Color.BLACK, (3, 4)))
-        self._place_disc(Disc(Color.BLACK, (4, 3)))
-        self._place_disc(Disc(Color.WHITE, (4, 4)))
+        self.white = (1 << 27) | (1 << 36)  # (3, 3), (4, 4)
+        self.black = (1 << 28) | (1 << 35)  # (3, 4), (4, 3)
+
+    @property
+    def board(self) -> List[List[Optional[Disc]]]:
+        """8x8 grid of discs (a snapshot; changing it does not change the board)"""
+        grid = [[None] * 8 for _ in range(8)]
+        for disc in self._all_discs():
+            row, col = disc.position
+            grid[row][col] = disc
+        return grid
+
+    @property
+    def discs(self) -> Set[Disc]:
+        """All discs on the board (a snapshot; changing it does not change the board)"""
+        return set(self._all_discs())
+
+    def _all_discs(self) -> Iterator[Disc]:
+        """Disc objects for every disc on the board"""
+        yield from _iter_discs(self.black, Color.BLACK)
+        yield from _iter_discs(self.white, Color.WHITE)
 
     def _place_disc(self, disc: Disc):
         """Place a disc on the board"""
         row, col = disc.position
-        self.board[row][col] = disc
-        self.discs.add(disc)
+        bit = 1 << (row * 8 + col)
+        if disc.color == Color.BLACK:
+            self.black |= bit
+            self.white &= ~bit
+        else:
+            self.white |= bit
+            self.black &= ~bit
 
     def get_disc_at(self, pos: Tuple[int, int]) -> Optional[Disc]:
         """Get disc at position"""
         row, col = pos
         if 0 <= row < 8 and 0 <= col < 8:
-            return self.board[row][col]
+            bit = 1 << (row * 8 + col)
+            if self.black & bit:
+                return Disc(Color.BLACK, (row, col))
+            if self.white & bit:
+                return Disc(Color.WHITE, (row, col))
         return None
 
     def is_valid_position(self, pos: Tuple[int, int]) -> bool:
@@ -117,13 +179,22 @@ class OthelloBoard:
         row, col = pos
         return 0 <= row < 8 and 0 <= col < 8
 
-    def get_discs(self, color: Color) -> List[Disc]:
-        """Get all discs of a color"""
-        return [d for d in self.discs if d.color == color]
+    def get_discs(self, color: Color) -> Iterator[Disc]:
+        """Get all discs of a color (lazily; wrap in list() to keep them)"""
+        return _iter_discs(self.black if color == Color.BLACK else self.white, color)
 
     def count_discs(self, color: Color) -> int:
         """Count discs of a color"""
-        return len(self.get_discs(color))
+        return bin(self.black if color == Color.BLACK else self.white).count('1')
+
+    @staticmethod
+    def _side(color: Color) -> int:
+        """Kernel side argument (othello_bitboard.BLACK / WHITE) for a color"""
+        return othello_bitboard.BLACK if color == Color.BLACK else othello_bitboard.WHITE
+
+    def legal_moves_bb(self, color: Color) -> int:
+        """Bitboard of every square color can legally play on (bit = row * 8 + col)"""
+        return legal_moves_bb(self.black, self.white, self._side(color))
 
     def get_flipped_discs(self, color: Color, pos: Tuple[int, int]) -> Set[Disc]:
         """
@@ -132,40 +203,15 @@ class OthelloBoard:
         Returns empty set if move would be invalid (no discs flipped)
         """
         row, col = pos
+        move_bit = 1 << (row * 8 + col)
 
         # Position must be empty
-        if self.get_disc_at(pos) is not None:
+        if (self.black | self.white) & move_bit:
             return set()
 
-        flipped = set()
-
-        # Check all 8 directions
-        for d_row, d_col in self.DIRECTIONS:
-            # Scan in this direction
-            scan_row = row + d_row
-            scan_col = col + d_col
-            temp_flipped = []
-
-            # Must find at least one opponent disc
-            while self.is_valid_position((scan_row, scan_col)):
-                target = self.get_disc_at((scan_row, scan_col))
-
-                if target is None:
-                    # Empty square - no flips in this direction
-                    break
-
-                if target.color == color:
-                    # Own disc - flips are valid in this direction
-                    flipped.update(temp_flipped)
-                    break
-
-                # Opponent disc - might be flipped
-                temp_flipped.append(target)
-
-                scan_row += d_row
-                scan_col += d_col
-
-        return flipped
+        flips = flip_mask(self.black, self.white, row * 8 + col, self._side(color))
+        opponent_color = Color.WHITE if color == Color.BLACK else Color.BLACK
+        return set(_iter_discs(flips, opponent_color))
 
     def make_move(self, move: Move) -> bool:
         """
@@ -186,35 +232,54 @@ class OthelloBoard:
             return False
 
         # Check if position is empty
-        if self.get_disc_at((row, col)) is not None:
+        move_bit = 1 << (row * 8 + col)
+        if (self.black | self.white) & move_bit:
             return False
 
         # Get flipped discs
-        flipped = self.get_flipped_discs(move.color, (row, col))
+        flips = flip_mask(self.black, self.white, row * 8 + col, self._side(move.color))
 
         # Must flip at least one disc
-        if not flipped:
+        if not flips:
             return False
 
-        # Place new disc
-        new_disc = Disc(move.color, (row, col))
-        self._place_disc(new_disc)
-
-        # Flip opponent discs
-        opponent_color = Color.BLACK if move.color == Color.WHITE else Color.WHITE
-        for disc in flipped:
-            self.discs.discard(disc)
-            flipped_disc = Disc(move.color, disc.position)
-            self._place_disc(flipped_disc)
-            # Update board
-            row_flip, col_flip = disc.position
-            self.board[row_flip][col_flip] = flipped_disc
+        # Place new disc and flip opponent discs
+        if move.color == Color.BLACK:
+            self.black ^= flips | move_bit
+            self.white ^= flips
+        else:
+            self.white ^= flips | move_bit
+            self.black ^= flips
 
         self.move_history.append(move)
         self.turn = Color.BLACK if self.turn == Color.WHITE else Color.WHITE
         self.passes = 0  # Reset pass counter on valid move
         return True
 
+    def save_state(self) -> Tuple[int, int, Color, int, int]:
+        """Snapshot the board state (for make/unmake)"""
+        return (self.black, self.white, self.turn, self.passes, len(self.move_history))
+
+    def restore_state(self, state: Tuple[int, int, Color, int, int]):
+        """Restore a snapshot taken by save_state (later moves leave move_history)"""
+        self.black, self.white, self.turn, self.passes, history_length = state
+        del self.move_history[history_length:]
+
+    def apply_inplace(self, move: Move) -> Optional[tuple]:
+        """
+        Execute a move (make/unmake style)
+
+        Returns an undo token; pass it to undo() to restore the position.
+        Returns None (board unchanged) if the move was invalid. Cheaper
+        than copy() + make_move when the move is only being simulated.
+        """
+        token = self.save_state()
+        return token if self.make_move(move) else None
+
+    def undo(self, token: tuple):
+        """Restore the state saved by apply_inplace"""
+        self.restore_state(token)
+
     def is_game_over(self) -> bool:
         """Check if game is over"""
         # Game ends when board is full or both players pass
@@ -222,11 +287,7 @@ class OthelloBoard:
             return True
 
         # Check if board is full
-        empty_count = sum(1 for row in self.board for cell in row if cell is None)
-        if empty_count == 0:
-            return True
-
-        return False
+        return (self.black | self.white) == FULL_BOARD
 
     def get_winner(self) -> Optional[Color]:
         """Get winner if game is over"""
@@ -243,42 +304,29 @@ class OthelloBoard:
         return None  # Draw
 
     def copy(self) -> 'OthelloBoard':
-        """Create a copy of the board"""
-        new_board = OthelloBoard()
-        new_board.board = [[None for _ in range(8)] for _ in range(8)]
-        new_board.discs = set()
+        """Create a copy of the board (skips __init__: only ints and the history to copy)"""
+        new_board = OthelloBoard.__new__(OthelloBoard)
+        new_board.black = self.black
+        new_board.white = self.white
         new_board.turn = self.turn
         new_board.move_history = self.move_history.copy()
         new_board.passes = self.passes
-
-        # Copy discs
-        for disc in self.discs:
-            new_disc = Disc(disc.color, disc.position)
-            row, col = disc.position
-            new_board.board[row][col] = new_disc
-            new_board.discs.add(new_disc)
-
         return new_board
 
+    def _symbol_at(self, square: int) -> str:
+        """'B', 'W' or '.' for the disc on a square (row * 8 + col)"""
+        bit = 1 << square
+        if self.black & bit:
+            return 'B'
+        if self.white & bit:
+            return 'W'
+        return '.'
+
     def to_fen(self) -> str:
         """Convert to FEN-like notation for storage"""
-        fen_parts = []
-        for row in range(8):
-            rank = []
-            empty_count = 0
-            for col in range(8):
-                disc = self.board[row][col]
-                if disc is None:
-                    empty_count += 1
-                else:
-                    if empty_count > 0:
-                        rank.append(str(empty_count))
-                        empty_count = 0
-                    symbol = 'B' if disc.color == Color.BLACK else 'W'
-                    rank.append(symbol)
-            if empty_count > 0:
-                rank.append(str(empty_count))
-            fen_parts.append(''.join(rank))
+        black, white = self.black, self.white
+        fen_parts = [ROW_FEN[(((black >> shift) & 0xFF) << 8) | ((white >> shift) & 0xFF)]
+                     for shift in range(0, 64, 8)]
 
         turn = 'B' if self.turn == Color.BLACK else 'W'
         return '/'.join(fen_parts) + f" {turn}"
@@ -290,11 +338,7 @@ class OthelloBoard:
         for row in range(8):
             line = f"{8-row} "
             for col in range(8):
-                disc = self.board[row][col]
-                if disc is None:
-                    line += ". "
-                else:
-                    line += f"{disc} "
+                line += f"{self._symbol_at(row * 8 + col)} "
             lines.append(line)
         lines.append(f"\nTurn: {self.turn.value}")
         lines.append(f"Black: {self.count_discs(Color.BLACK)}, White: {self.count_discs(Color.WHITE)}")
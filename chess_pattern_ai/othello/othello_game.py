@@ -31,21 +31,18 @@ class OthelloGame:
         2. Must flip at least one opponent disc
         3. Can flip in all 8 directions
 
-        Returns: List of legal Move objects
+        Returns: List of legal Move objects (flipped_discs is left empty;
+        make_move computes the flips for the move actually played)
         """
         moves = []
 
-        # Check all empty squares
-        for row in range(8):
-            for col in range(8):
-                if self.board.get_disc_at((row, col)) is None:
-                    # Try to play at this position
-                    flipped = self.board.get_flipped_discs(color, (row, col))
-
-                    if flipped:  # Valid move (flips at least one disc)
-                        move = Move(color, (row, col))
-                        move.flipped_discs = flipped
-                        moves.append(move)
+        # Every legal square at once (bitboard, bit = row * 8 + col), then
+        # one Move per set bit, in square order
+        legal = self.board.legal_moves_bb(color)
+        while legal:
+            lsb = legal & -legal
+            moves.append(Move(color, divmod(lsb.bit_length() - 1, 8)))
+            legal ^= lsb
 
         # If no legal moves, add pass move
         if not moves:
@@ -104,7 +101,8 @@ def test_othello_game():
     print("\nBlack's legal moves:")
     for i, move in enumerate(legal_moves):
         if not move.is_pass:
-            print(f"  {i+1}. {move.notation()} (flips {len(move.flipped_discs)} disc(s))")
+            flipped = game.board.get_flipped_discs(move.color, move.position)
+            print(f"  {i+1}. {move.notation()} (flips {len(flipped)} disc(s))")
         else:
             print(f"  {i+1}. {move.notation()}")
 
@@ -122,7 +120,8 @@ def test_othello_game():
         if white_moves:
             for i, move in enumerate(white_moves[:3]):
                 if not move.is_pass:
-                    print(f"  {i+1}. {move.notation()} (flips {len(move.flipped_discs)} disc(s))")
+                    flipped = game.board.get_flipped_discs(move.color, move.position)
+                    print(f"  {i+1}. {move.notation()} (flips {len(flipped)} disc(s))")
 
     print("\n" + "=" * 70)
     print("✓ Game engine working!")
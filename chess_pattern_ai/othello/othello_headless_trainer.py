@@ -47,40 +47,16 @@ class OthelloHeadlessTrainer:
         # Learning stats
         self.patterns_by_category = defaultdict(int)
 
-    def is_corner(self, pos: Tuple[int, int]) -> bool:
-        """Check if position is a corner"""
-        row, col = pos
-        return (row, col) in [(0, 0), (0, 7), (7, 0), (7, 7)]
-
-    def is_edge(self, pos: Tuple[int, int]) -> bool:
-        """Check if position is on edge (but not corner)"""
-        row, col = pos
-        is_boundary = row in [0, 7] or col in [0, 7]
-        return is_boundary and not self.is_corner(pos)
-
-    def is_center(self, pos: Tuple[int, int]) -> bool:
-        """Check if position is in center 4x4 area"""
-        row, col = pos
-        return 2 <= row <= 5 and 2 <= col <= 5
-
     def categorize_move(self, move: Move) -> str:
         """
         Categorize a move for pattern learning
 
-        Categories: corner, edge, center, capture
+        Categories: capture, quiet (pass)
         """
-        # Capture is special - takes priority
-        if move.flipped_discs:
-            return 'capture'
-
-        # Otherwise, categorize by position
+        # Every legal placement flips at least one disc, so anything but a
+        # pass is a capture - no need to compute the flips to know
         if not move.is_pass:
-            if self.is_corner(move.position):
-                return 'corner'
-            elif self.is_edge(move.position):
-                return 'edge'
-            elif self.is_center(move.position):
-                return 'center'
+            return 'capture'
 
         return 'quiet'
 
@@ -115,10 +115,8 @@ def test_othello_scorer():
     # Manually set up: add 2 black discs
     disc1 = Disc(Color.BLACK, (0, 0))
     disc2 = Disc(Color.BLACK, (7, 7))
-    board2.discs.add(disc1)
-    board2.discs.add(disc2)
-    board2.board[0][0] = disc1
-    board2.board[7][7] = disc2
+    board2._place_disc(disc1)
+    board2._place_disc(disc2)
 
     black_mat2 = scorer.calculate_material(board2, Color.BLACK)
     white_mat2 = scorer.calculate_material(board2, Color.WHITE)
@@ -144,11 +142,7 @@ def test_othello_scorer():
     print("\nTest 4: Black loses in 40 rounds, behind by 5 discs")
     board4 = OthelloBoard()
     # Remove some black discs to simulate loss
-    black_discs = board4.get_discs(Color.BLACK)
-    for disc in list(black_discs):
-        board4.discs.discard(disc)
-        row, col = disc.position
-        board4.board[row][col] = None
+    board4.black = 0
 
     score4, result4 = scorer.calculate_final_score(board4, Color.BLACK, rounds_played=40)
     # Assuming material advantage is now -5 (behind)
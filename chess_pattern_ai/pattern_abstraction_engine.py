@@ -133,8 +133,8 @@ class PatternAbstractionEngine:
         board.push(move)
 
         # Is the piece now hanging?
-        attackers = len(list(board.attackers(not board.turn, move.to_square)))
-        defenders = len(list(board.attackers(board.turn, move.to_square)))
+        attackers = chess.popcount(board.attackers_mask(not board.turn, move.to_square))
+        defenders = chess.popcount(board.attackers_mask(board.turn, move.to_square))
 
         board.pop()
 
@@ -262,15 +262,13 @@ class PatternAbstractionEngine:
 
     def _check_center_control(self, board: chess.Board, move: chess.Move) -> Optional[Dict]:
         """Check for center control principles"""
-        # Did move give up center control?
-        center_squares = [chess.D4, chess.D5, chess.E4, chess.E5]
-
+        # Did move give up center control? (center = d4, d5, e4, e5)
         piece = board.piece_at(move.from_square)
         if not piece:
             return None
 
         # Moving a piece away from center?
-        if move.from_square in center_squares and move.to_square not in center_squares:
+        if (chess.BB_CENTER >> move.from_square) & 1 and not (chess.BB_CENTER >> move.to_square) & 1:
             move_number = len(board.move_stack) + 1
 
             if move_number <= 15:  # In opening
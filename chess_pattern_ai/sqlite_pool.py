@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Pool - One Connection Per Database Per Process
+
+Evaluators and trackers are often constructed many times over (per search,
+per game, per worker thread). Opening a fresh connection each time pays for
+the open() itself, WAL/shm file setup and a cold page cache. Instead:
+
+- Readers get one connection per database per thread, closed when the
+  thread ends
+- Writers share one connection per database (check_same_thread=False), so
+  all writes from the process go through a single SQLite writer. Each
+  transaction on it must hold write_lock(db_path): otherwise another
+  thread's statements would join (and be committed or rolled back with)
+  the open transaction
+- Whatever is still open is closed once, at interpreter exit
+
+':memory:' databases are never pooled: every connection to one is a
+separate database, so sharing would change behaviour.
+"""
+
+import atexit
+import sqlite3
+import threading
+import weakref
+from typing import Dict, List
+
+# Statement cache size for pooled connections: long-lived connections see
+# the same handful of statements over and over
+CACHED_STATEMENTS = 256
+
+# Reentrant: a thread's readers may be finalized by garbage collection
+# that happens to run while that same thread holds the lock
+_lock = threading.RLock()
+_readers = threading.local()                     # .conns: _ThreadReaders
+_writers: Dict[str, sqlite3.Connection] = {}     # db_path -> connection
+_write_locks: Dict[str, threading.RLock] = {}    # db_path -> lock
+_all_connections: List[sqlite3.Connection] = []  # closed at exit
+
+
+class _ThreadReaders(dict):
+    """
+    db_path -> reader connection for one thread. A dict subclass so the
+    thread-local can be weakly referenced: when the thread ends it is
+    collected, and its connections (kept in .opened) are closed.
+    """
+
+
+def _close_connections(conns: List[sqlite3.Connection]):
+    """Close connections and drop them from the pool"""
+    with _lock:
+        _all_connections[:] = [pooled for pooled in _all_connections
+                               if not any(pooled is conn for conn in conns)]
+    for conn in conns:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
+def read_connection(db_path: str) -> sqlite3.Connection:
+    """Connection for reading db_path, shared by everything on this thread"""
+    if db_path == ':memory:':
+        return sqlite3.connect(db_path)
+
+    conns = getattr(_readers, 'conns', None)
+    if conns is None:
+        conns = _readers.conns = _ThreadReaders()
+        conns.opened = []
+        weakref.finalize(conns, _close_connections, conns.opened)
+
+    conn = conns.get(db_path)
+    if conn is None:
+        # Only ever used by this thread, but closed by whichever thread
+        # finalizes it (or at exit), so not tied to this one
+        conn = conns[db_path] = sqlite3.connect(
+            db_path, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+        conns.opened.append(conn)
+        with _lock:
+            _all_connections.append(conn)
+    return conn
+
+
+def write_connection(db_path: str) -> sqlite3.Connection:
+    """Connection for writing db_path, shared by the whole process"""
+    if db_path == ':memory:':
+        return sqlite3.connect(db_path, check_same_thread=False,
+                               cached_statements=CACHED_STATEMENTS)
+
+    with _lock:
+        conn = _writers.get(db_path)
+        if conn is None:
+            conn = _writers[db_path] = sqlite3.connect(
+                db_path, check_same_thread=False, cached_statements=CACHED_STATEMENTS)
+            _all_connections.append(conn)
+    return conn
+
+
+def write_lock(db_path: str) -> threading.RLock:
+    """Lock to hold around every transaction on db_path's writer connection"""
+    if db_path == ':memory:':
+        return threading.RLock()
+
+    with _lock:
+        lock = _write_locks.get(db_path)
+        if lock is None:
+            lock = _write_locks[db_path] = threading.RLock()
+    return lock
+
+
+def is_pooled(conn: sqlite3.Connection) -> bool:
+    """True if conn belongs to the pool (and must not be closed by its user)"""
+    with _lock:
+        return any(conn is pooled for pooled in _all_connections)
+
+
+@atexit.register
+def close_all():
+    """Close every pooled connection"""
+    with _lock:
+        for conn in _all_connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _all_connections.clear()
+        _writers.clear()
+    _readers.__dict__.clear()
@@ -7,6 +7,7 @@ Hex, Dots and Boxes, and Breakthrough.
 """
 
 import unittest
+import random
 import tempfile
 import os
 import sqlite3
@@ -27,7 +28,10 @@ from go.go_game import GoGame
 from go.go_scorer import GoScorer
 
 # Import Othello
-from othello.othello_board import OthelloBoard, Color as OthelloColor
+from othello.othello_board import OthelloBoard, Move as OthelloMove, Color as OthelloColor
+from othello import othello_bitboard
+from othello.othello_bitboard import (FULL_BOARD, BLACK as BB_BLACK, WHITE as BB_WHITE,
+                                      flip_mask, legal_moves_bb)
 from othello.othello_game import OthelloGame
 from othello.othello_scorer import OthelloScorer
 
@@ -51,6 +55,9 @@ from dots_boxes.dots_boxes_board import DotsBoxesBoard, Color as DBColor
 from dots_boxes.dots_boxes_game import DotsBoxesGame
 from dots_boxes.dots_boxes_scorer import DotsBoxesScorer
 
+# Import Nine Men's Morris
+from morris.morris_headless_trainer import MorrisHeadlessTrainer
+
 # Import Breakthrough
 from breakthrough.breakthrough_board import BreakthroughBoard, Piece as BreakthroughPiece, Color as BreakthroughColor
 from breakthrough.breakthrough_game import BreakthroughGame
@@ -254,13 +261,62 @@ class TestGoGame(unittest.TestCase):
 class TestOthelloGame(unittest.TestCase):
     """Test Othello game implementation"""
 
+    @staticmethod
+    def _bitboard(*positions):
+        """Bitboard with the given (row, col) squares set"""
+        return sum(1 << (row * 8 + col) for row, col in positions)
+
+    @staticmethod
+    def _naive_flips(own, opp, square):
+        """Discs flipped by playing on square, walking each direction square by square"""
+        row, col = divmod(square, 8)
+        flips = 0
+        for dr, dc in OthelloBoard.DIRECTIONS:
+            r, c, run = row + dr, col + dc, 0
+            while 0 <= r < 8 and 0 <= c < 8 and opp >> (r * 8 + c) & 1:
+                run |= 1 << (r * 8 + c)
+                r, c = r + dr, c + dc
+            if 0 <= r < 8 and 0 <= c < 8 and own >> (r * 8 + c) & 1:
+                flips |= run
+        return flips
+
+    @staticmethod
+    def _random_boards(count, seed=0):
+        """(black, white) bitboards of random positions, sparse to nearly full"""
+        rng = random.Random(seed)
+        for _ in range(count):
+            density = rng.random()
+            black = white = 0
+            for square in range(64):
+                if rng.random() < density:
+                    if rng.random() < 0.5:
+                        black |= 1 << square
+                    else:
+                        white |= 1 << square
+            yield black, white
+
+    def _check_kernels(self, black, white):
+        """flip_mask and legal_moves_bb agree with the naive scan for both sides"""
+        empty = ~(black | white) & FULL_BOARD
+        for side, own, opp in ((BB_BLACK, black, white), (BB_WHITE, white, black)):
+            legal = 0
+            for square in range(64):
+                if empty >> square & 1:
+                    flips = self._naive_flips(own, opp, square)
+                    self.assertEqual(flip_mask(black, white, square, side), flips,
+                                     (hex(black), hex(white), square, side))
+                    if flips:
+                        legal |= 1 << square
+            self.assertEqual(legal_moves_bb(black, white, side), legal,
+                             (hex(black), hex(white), side))
+
     def test_initial_board(self):
         """Test Othello starting position"""
         board = OthelloBoard()
 
         # Should have 4 pieces in center
-        pieces = [board.get_disc((3, 3)), board.get_disc((3, 4)),
-                  board.get_disc((4, 3)), board.get_disc((4, 4))]
+        pieces = [board.get_disc_at((3, 3)), board.get_disc_at((3, 4)),
+                  board.get_disc_at((4, 3)), board.get_disc_at((4, 4))]
 
         non_none = [p for p in pieces if p is not None]
         self.assertEqual(len(non_none), 4)
@@ -270,26 +326,129 @@ class TestOthelloGame(unittest.TestCase):
         board = OthelloBoard()
         game = OthelloGame(board=board)
 
-        legal_moves = game.get_legal_moves()
-        self.assertGreater(len(legal_moves), 0)
-
-        # Make a move and verify discs are flipped
-        if legal_moves:
-            new_board = game.make_move(legal_moves[0])
+        legal_moves = game.get_legal_moves(OthelloColor.BLACK)
+        self.assertEqual(len(legal_moves), 4)
 
-            # Board should have more pieces after a move
-            self.assertGreater(len(new_board.discs), len(board.discs))
+        # Make a move and verify one disc is placed and one flipped
+        self.assertTrue(game.make_move(legal_moves[0]))
+        self.assertEqual(board.count_discs(OthelloColor.BLACK), 4)
+        self.assertEqual(board.count_discs(OthelloColor.WHITE), 1)
 
     def test_differential_scoring(self):
         """Test Othello differential scoring"""
         board = OthelloBoard()
         scorer = OthelloScorer()
 
-        score = scorer.score(board, OthelloColor.BLACK)
+        score = (scorer.calculate_material(board, OthelloColor.BLACK)
+                 - scorer.calculate_material(board, OthelloColor.WHITE))
 
         # At start, should be equal
         self.assertEqual(score, 0)
 
+    def test_bitboard_kernels_random_boards(self):
+        """Test flip_mask / legal_moves_bb against a naive scan on random boards"""
+        for black, white in self._random_boards(300):
+            self._check_kernels(black, white)
+
+    def test_bitboard_kernels_edge_wrap(self):
+        """Test that runs do not wrap between column 0 and column 7"""
+        bb = self._bitboard
+        wrap_cases = [
+            # Left from (3, 0) would wrap to (2, 7)
+            ((3, 0), bb((2, 6)), bb((2, 7))),
+            # Right from (2, 7) would wrap to (3, 0)
+            ((2, 7), bb((3, 1)), bb((3, 0))),
+            # Up-right from (3, 7) would wrap to (3, 0)
+            ((3, 7), bb((2, 1)), bb((3, 0))),
+            # Down-left from (3, 0) would wrap to (3, 7)
+            ((3, 0), bb((4, 6)), bb((3, 7))),
+            # Up-left from (4, 0) would wrap to (2, 6) via (3, 7)
+            ((4, 0), bb((2, 6)), bb((3, 7))),
+            # Down-right from (4, 7) would wrap to (6, 1) via (5, 0)
+            ((4, 7), bb((6, 1)), bb((5, 0))),
+        ]
+        for (row, col), own, opp in wrap_cases:
+            square = row * 8 + col
+            self.assertEqual(flip_mask(own, opp, square, BB_BLACK), 0, (row, col))
+            self.assertFalse(legal_moves_bb(own, opp, BB_BLACK) >> square & 1, (row, col))
+            self._check_kernels(own, opp)
+
+        # The same runs along a real line do flip
+        self.assertEqual(flip_mask(bb((3, 2)), bb((3, 1)), 24, BB_BLACK), bb((3, 1)))
+        self.assertEqual(flip_mask(bb((3, 5)), bb((3, 6)), 31, BB_BLACK), bb((3, 6)))
+
+        # Runs of opponent discs along every edge, own discs in the corners
+        corners = bb((0, 0), (0, 7), (7, 0), (7, 7))
+        edges = bb(*[(0, c) for c in range(1, 7)], *[(7, c) for c in range(1, 7)],
+                   *[(r, 0) for r in range(1, 7)], *[(r, 7) for r in range(1, 7)])
+        self._check_kernels(corners, edges)
+        self._check_kernels(edges, corners)
+
+    @unittest.skipUnless(othello_bitboard.NUMBA_AVAILABLE, "numba not installed")
+    def test_numba_kernels_match_python(self):
+        """Test that the Numba kernels give the same results as the Python ones"""
+        for black, white in self._random_boards(500, seed=3):
+            for side in (BB_BLACK, BB_WHITE):
+                self.assertEqual(int(othello_bitboard._legal_njit(black, white, side)),
+                                 othello_bitboard._legal_py(black, white, side))
+                for square in range(64):
+                    self.assertEqual(
+                        int(othello_bitboard._flips_njit(black, white, square, side)),
+                        othello_bitboard._flips_py(black, white, square, side),
+                        (hex(black), hex(white), square, side))
+
+    def test_to_fen_round_trip(self):
+        """Test that to_fen describes exactly the discs and side to move"""
+        def parse_fen(fen):
+            rows, turn = fen.split()
+            black = white = 0
+            for row, text in enumerate(rows.split('/')):
+                col = 0
+                for ch in text:
+                    if ch.isdigit():
+                        col += int(ch)
+                        continue
+                    if ch == 'B':
+                        black |= 1 << (row * 8 + col)
+                    else:
+                        white |= 1 << (row * 8 + col)
+                    col += 1
+                self.assertEqual(col, 8)
+            return black, white, turn
+
+        board = OthelloBoard()
+        for black, white in self._random_boards(200, seed=1):
+            board.black, board.white = black, white
+            for turn, letter in ((OthelloColor.BLACK, 'B'), (OthelloColor.WHITE, 'W')):
+                board.turn = turn
+                self.assertEqual(parse_fen(board.to_fen()), (black, white, letter))
+
+    def test_apply_inplace_undo(self):
+        """Test that undo restores everything apply_inplace changed"""
+        rng = random.Random(2)
+        game = OthelloGame()
+        board = game.board
+
+        while not game.is_game_over():
+            moves = game.get_legal_moves(board.turn)
+            before = (board.black, board.white, board.turn, board.passes,
+                      list(board.move_history))
+
+            # Every candidate applied and undone leaves the board untouched
+            for move in moves:
+                token = board.apply_inplace(move)
+                self.assertIsNotNone(token)
+                board.undo(token)
+                self.assertEqual((board.black, board.white, board.turn, board.passes,
+                                  list(board.move_history)), before)
+
+            self.assertTrue(game.make_move(rng.choice(moves)))
+
+        # An illegal move is rejected without changing anything
+        board = OthelloBoard()
+        self.assertIsNone(board.apply_inplace(OthelloMove(OthelloColor.BLACK, (0, 0))))
+        self.assertEqual(board.to_fen(), OthelloBoard().to_fen())
+
 
 class TestConnect4Game(unittest.TestCase):
     """Test Connect Four game implementation"""
@@ -549,6 +708,27 @@ class TestGameTraining(unittest.TestCase):
             if os.path.exists(db_path):
                 os.unlink(db_path)
 
+    def test_morris_training(self):
+        """Test running a few Nine Men's Morris training games"""
+        trainer = MorrisHeadlessTrainer(db_path=':memory:')
+
+        # Train for 2 games
+        stats = trainer.train(num_games=2, verbose=False)
+        self.assertEqual(stats['games_played'], 2)
+
+        # Every pattern seen was written with consistent statistics
+        rows = trainer.conn.execute('''
+            SELECT times_seen, games_won + games_lost + games_drawn,
+                   total_score, avg_score
+            FROM morris_move_patterns
+        ''').fetchall()
+        self.assertGreater(len(rows), 0)
+        for times_seen, games, total_score, avg_score in rows:
+            self.assertEqual(times_seen, games)
+            self.assertAlmostEqual(avg_score, total_score / times_seen)
+
+        trainer.conn.close()
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests across the system"""
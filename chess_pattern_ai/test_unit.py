@@ -8,11 +8,22 @@ import tempfile
 import os
 import sys
 import sqlite3
+import threading
+import time
+
+import chess
+import chess.pgn
+import io
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(__file__))
 
 from learnable_move_prioritizer import LearnableMovePrioritizer
+from sqlite_pool import read_connection, write_connection, write_lock, is_pooled
+from opening_evaluator import OpeningEvaluator
+from opening_performance_tracker import OpeningPerformanceTracker
+from move_learning_system import MoveLearner, mainline_sans
+from optimized_search import OptimizedSearchMixin, PIECE_VALUES, zobrist_key
 
 # Import checkers components
 from checkers.checkers_board import CheckersBoard, Piece, Color, PieceType
@@ -338,6 +349,507 @@ class TestCheckersDifferentialScoring(unittest.TestCase):
         self.assertEqual(score_white, -score_black, "Scores should be negatives of each other")
 
 
+class TestSQLitePool(unittest.TestCase):
+    """Test the shared SQLite connection pool"""
+
+    def setUp(self):
+        """Fresh database files, so no pooled connection exists for them yet"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'pool.db')
+        self.other_db_path = os.path.join(self.temp_dir.name, 'other.db')
+
+    def tearDown(self):
+        """Clean up temporary databases (pooled connections close at exit)"""
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def _in_thread(func, *args):
+        """Result of func(*args) called on a new thread"""
+        result = []
+        thread = threading.Thread(target=lambda: result.append(func(*args)))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_read_connection_per_thread_per_path(self):
+        """Test one reader connection per database per thread"""
+        conn = read_connection(self.db_path)
+        self.assertIs(read_connection(self.db_path), conn)
+        self.assertIsNot(read_connection(self.other_db_path), conn)
+        self.assertIsNot(self._in_thread(read_connection, self.db_path), conn)
+
+    def test_write_connection_per_process_per_path(self):
+        """Test one writer connection per database for every thread"""
+        conn = write_connection(self.db_path)
+        self.assertIs(write_connection(self.db_path), conn)
+        self.assertIs(self._in_thread(write_connection, self.db_path), conn)
+        self.assertIsNot(write_connection(self.other_db_path), conn)
+        self.assertIsNot(read_connection(self.db_path), conn)
+
+    def test_reader_closed_when_thread_ends(self):
+        """Test that a thread's reader connections close when the thread ends"""
+        conn = self._in_thread(read_connection, self.db_path)
+        self.assertFalse(is_pooled(conn))
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute('SELECT 1')
+
+    def test_write_lock_per_process_per_path(self):
+        """Test one writer lock per database for every thread"""
+        lock = write_lock(self.db_path)
+        self.assertIs(write_lock(self.db_path), lock)
+        self.assertIs(self._in_thread(write_lock, self.db_path), lock)
+        self.assertIsNot(write_lock(self.other_db_path), lock)
+
+    def test_tracker_threads_record_concurrently(self):
+        """Test that trackers on several threads never share a transaction"""
+        fen = chess.STARTING_FEN
+        game = ([(fen, 'e2e4', 'e4')], 'win', chess.WHITE)
+        # The bad game (a FEN without a side to move) rolls its batch back
+        bad_game = ([('8/8/8/8/8/8/8/8', 'e2e4', 'e4')], 'win', chess.WHITE)
+        recorded_games = 200
+        errors = []
+
+        def record_games():
+            try:
+                tracker = OpeningPerformanceTracker(self.db_path)
+                for _ in range(recorded_games):
+                    tracker.record_opening_result(*game)
+                # Reads go through this thread's own reader connection
+                self.assertIsNot(tracker._reader(), tracker.conn)
+                tracker.get_opening_adjustment(fen, 'e2e4')
+            except Exception as e:
+                errors.append(e)
+
+        def fail_batches():
+            tracker = OpeningPerformanceTracker(self.db_path)
+            for _ in range(20):
+                with self.assertRaises(IndexError):
+                    tracker.record_opening_results_bulk([game] * 500 + [bad_game])
+
+        workers = [threading.Thread(target=record_games), threading.Thread(target=fail_batches)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+
+        # Every committed game is there, and none of the rolled-back ones
+        tracker = OpeningPerformanceTracker(self.db_path)
+        (move_uci, times_played, *_), = tracker.get_opening_stats(fen)
+        self.assertEqual(times_played, recorded_games)
+
+    def test_memory_databases_not_pooled(self):
+        """Test that every :memory: connection is a separate database"""
+        for connect in (read_connection, write_connection):
+            first, second = connect(':memory:'), connect(':memory:')
+            self.assertIsNot(first, second)
+            self.assertFalse(is_pooled(first))
+
+            first.execute('CREATE TABLE t (x)')
+            self.assertEqual(second.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE name = 't'").fetchone()[0], 0)
+            first.close()
+            second.close()
+
+    def test_is_pooled(self):
+        """Test is_pooled tells pooled connections from private ones"""
+        self.assertTrue(is_pooled(read_connection(self.db_path)))
+        self.assertTrue(is_pooled(write_connection(self.db_path)))
+
+        private = sqlite3.connect(self.db_path)
+        self.assertFalse(is_pooled(private))
+        private.close()
+
+    def test_close_leaves_pooled_connections_open(self):
+        """Test that closing an evaluator or tracker keeps the shared connection usable"""
+        evaluator = OpeningEvaluator(self.db_path)
+        evaluator.close()
+        self.assertIs(read_connection(self.db_path), evaluator.conn)
+        self.assertEqual(evaluator.conn.execute('SELECT 1').fetchone(), (1,))
+
+        tracker = OpeningPerformanceTracker(self.db_path)
+        tracker.close()
+        self.assertIs(write_connection(self.db_path), tracker.conn)
+        self.assertEqual(tracker.conn.execute(
+            'SELECT COUNT(*) FROM opening_performance').fetchone(), (0,))
+
+        # A private :memory: connection is closed
+        evaluator = OpeningEvaluator(':memory:')
+        evaluator.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            evaluator.conn.execute('SELECT 1')
+
+
+class TestOpeningEvaluator(unittest.TestCase):
+    """Test that batched opening scores match the per-position ones"""
+
+    FENS = [
+        chess.STARTING_FEN,
+        "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1",
+        "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 15",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 16",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 40",
+        "4k3/8/8/8/8/8/8/4K3 w - - 0 3",
+    ]
+
+    def test_batch_matches_single_positions(self):
+        """Test evaluate_openings against evaluate_opening with a development weight"""
+        evaluator = OpeningEvaluator(':memory:')
+        evaluator.conn.execute('''
+            CREATE TABLE discovered_opening_weights (
+                id INTEGER PRIMARY KEY,
+                development_weight REAL,
+                center_control_weight REAL,
+                repetition_penalty REAL,
+                observation_count INTEGER
+            )
+        ''')
+        evaluator.conn.execute(
+            'INSERT INTO discovered_opening_weights VALUES (1, 2.5, 1.0, 0.0, 10)')
+
+        scores = evaluator.evaluate_openings(self.FENS)
+        self.assertEqual(evaluator._dev_w, 2.5)
+        self.assertEqual(scores.tolist(), [evaluator.evaluate_opening(fen) for fen in self.FENS])
+
+        # Past move 15 scores nothing; developed positions do score
+        self.assertEqual(scores[4], 0.0)
+        self.assertEqual(scores[6], 0.0)
+        self.assertNotEqual(scores[3], 0.0)
+        self.assertEqual(len(evaluator.evaluate_openings([])), 0)
+        evaluator.close()
+
+
+class TestOpeningPerformanceTracker(unittest.TestCase):
+    """Test opening result tracking on a database file"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'openings.db')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_legacy_table_migrated_once(self):
+        """Test that legacy rows are rekeyed, merged and converted on first open"""
+        placement = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq -"
+        legacy = sqlite3.connect(self.db_path)
+        legacy.execute('''
+            CREATE TABLE opening_performance (
+                fen TEXT,
+                move_uci TEXT,
+                times_played INTEGER DEFAULT 0,
+                wins INTEGER DEFAULT 0,
+                draws INTEGER DEFAULT 0,
+                losses INTEGER DEFAULT 0,
+                avg_game_result REAL DEFAULT 0.0,
+                last_played TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (fen, move_uci)
+            )
+        ''')
+        # The same position under two move clocks, and a second move
+        legacy.executemany('''
+            INSERT INTO opening_performance
+                (fen, move_uci, times_played, wins, draws, losses, avg_game_result, last_played)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (f"{placement} 0 1", 'e7e5', 1, 1, 0, 0, 1.0, '2024-01-02 03:04:05'),
+            (f"{placement} 4 3", 'e7e5', 1, 0, 0, 1, 0.0, '2024-01-01 00:00:00'),
+            (f"{placement} 0 1", 'c7c5', 4, 1, 2, 1, 0.5, '2023-06-01 12:00:00'),
+        ])
+        legacy.commit()
+        legacy.close()
+
+        tracker = OpeningPerformanceTracker(self.db_path)
+        rows = tracker.conn.execute('''
+            SELECT fen, move_uci, times_played, wins, draws, losses, sum_game_result,
+                   last_played, typeof(last_played)
+            FROM opening_performance ORDER BY move_uci
+        ''').fetchall()
+        self.assertEqual(rows, [
+            (placement, 'c7c5', 4, 1, 2, 1, 2.0, 1685620800, 'integer'),
+            (placement, 'e7e5', 2, 1, 0, 1, 1.0, 1704164645, 'integer'),
+        ])
+        self.assertEqual(tracker.conn.execute('PRAGMA user_version').fetchone()[0], 1)
+
+        # Already migrated: later opens leave the table alone
+        tracker.conn.execute(
+            "INSERT INTO opening_performance (fen, move_uci, times_played, last_played) "
+            "VALUES (?, 'd7d5', 1, '2024-01-01 00:00:00')", (f"{placement} 0 1",))
+        tracker.conn.commit()
+        OpeningPerformanceTracker(self.db_path)
+        self.assertEqual(tracker.conn.execute(
+            "SELECT fen, typeof(last_played) FROM opening_performance WHERE move_uci = 'd7d5'"
+        ).fetchone(), (f"{placement} 0 1", 'text'))
+
+    def test_recording_invalidates_other_trackers(self):
+        """Test that a game recorded by one tracker reaches another's cached adjustments"""
+        first = OpeningPerformanceTracker(self.db_path)
+        second = OpeningPerformanceTracker(self.db_path)
+        self.assertIs(first.conn, second.conn)
+
+        fen = chess.STARTING_FEN
+        self.assertEqual(first.get_opening_adjustment(fen, 'e2e4'), 0.0)
+        self.assertEqual(second.get_opening_adjustment(fen, 'e2e4'), 0.0)
+
+        first.record_opening_results_bulk([([(fen, 'e2e4', 'e4')], 'loss', chess.WHITE)] * 5)
+
+        self.assertEqual(first.get_opening_adjustment(fen, 'e2e4'), -25.0)
+        self.assertEqual(second.get_opening_adjustment(fen, 'e2e4'), -25.0)
+
+        # And the other way round, one game at a time
+        second.record_opening_result([(fen, 'e2e4', 'e4')], 'win', chess.WHITE)
+        adjustment = first.get_opening_adjustment(fen, 'e2e4')
+        self.assertNotEqual(adjustment, -25.0)
+        self.assertEqual(second.get_opening_adjustment(fen, 'e2e4'), adjustment)
+
+
+class _MaterialSearch(OptimizedSearchMixin):
+    """Smallest host for OptimizedSearchMixin: plain material evaluation"""
+
+    time_limit = 600
+    search_depth = 3
+
+    def __init__(self):
+        self.move_prioritizer = LearnableMovePrioritizer(':memory:')
+        super().__init__()
+
+    def _query_learned_patterns(self, board, move):
+        return 0.0
+
+    def evaluate_position(self, board, perspective):
+        return sum(PIECE_VALUES[piece.piece_type] * (1 if piece.color == perspective else -1)
+                   for piece in board.piece_map().values())
+
+
+class _NoStoreTable(dict):
+    """Transposition table that never keeps an entry (search without a TT)"""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+class TestOptimizedSearch(unittest.TestCase):
+    """Test the transposition table behind minimax_optimized"""
+
+    SEARCH_FENS = [
+        "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        "r1bqkbnr/pppp1ppp/2n5/4p3/2B1P3/5N2/PPPP1PPP/RNBQK2R b KQkq - 3 3",
+        "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4",
+        "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    ]
+
+    @staticmethod
+    def _board_after(*sans, fen=chess.STARTING_FEN):
+        """Board after playing the given SAN moves from fen"""
+        board = chess.Board(fen)
+        for san in sans:
+            board.push_san(san)
+        return board
+
+    def test_zobrist_transpositions_share_key(self):
+        """Test that different move orders to one position give one key"""
+        first = self._board_after('Nf3', 'Nf6', 'Nc3', 'Nc6')
+        second = self._board_after('Nc3', 'Nc6', 'Nf3', 'Nf6')
+        self.assertEqual(first.fen().split()[:4], second.fen().split()[:4])
+        self.assertEqual(zobrist_key(first), zobrist_key(second))
+
+        # Move counters are not part of the position
+        self.assertEqual(zobrist_key(self._board_after('Nf3', 'Nf6', 'Ng1', 'Ng8')),
+                         zobrist_key(chess.Board()))
+
+    def test_zobrist_state_changes_key(self):
+        """Test that side to move, castling rights and en passant change the key"""
+        placement = "rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR"
+        keys = {
+            zobrist_key(chess.Board(f"{placement} w KQkq - 0 2")),
+            zobrist_key(chess.Board(f"{placement} b KQkq - 0 2")),
+            zobrist_key(chess.Board(f"{placement} w Kkq - 0 2")),
+            zobrist_key(chess.Board(f"{placement} w KQ - 0 2")),
+            zobrist_key(chess.Board(f"{placement} w - - 0 2")),
+        }
+        self.assertEqual(len(keys), 5)
+
+        # Castling rights lost by moving the king out and back
+        walked = self._board_after('e4', 'e5', 'Ke2', 'Ke7', 'Ke1', 'Ke8')
+        self.assertNotEqual(zobrist_key(walked), zobrist_key(self._board_after('e4', 'e5')))
+
+        # A capturable en passant square counts, one nobody can take does not
+        ep_fen = "rnbqkbnr/ppppp1pp/8/4Pp2/8/8/PPPP1PPP/RNBQKBNR w KQkq {} 0 3"
+        self.assertNotEqual(zobrist_key(chess.Board(ep_fen.format('f6'))),
+                            zobrist_key(chess.Board(ep_fen.format('-'))))
+        self.assertEqual(zobrist_key(self._board_after('e4')),
+                         zobrist_key(chess.Board(
+                             "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1")))
+
+    def test_search_same_score_with_and_without_tt(self):
+        """Test that the transposition table does not change the searched score"""
+        for fen in self.SEARCH_FENS:
+            scores = []
+            for table in (dict, _NoStoreTable):
+                search = _MaterialSearch()
+                search.tt = table()
+                board = chess.Board(fen)
+                scores.append(search.minimax_optimized(board, 3, -99999, 99999, True,
+                                                       board.turn, time.time()))
+                self.assertEqual(board.fen(), fen)
+                self.assertEqual(len(search.tt) > 0, table is dict)
+            self.assertEqual(scores[0], scores[1], fen)
+
+    def _assert_see(self, fen, uci, expected):
+        board = chess.Board(fen)
+        move = chess.Move.from_uci(uci)
+        self.assertIn(move, board.legal_moves)
+        self.assertEqual(_MaterialSearch()._see(board, move), expected, f"{fen} {uci}")
+        self.assertEqual(board.fen(), fen)
+
+    def test_see_quiet_move_to_attacked_square(self):
+        """Test a knight moving where a pawn takes it"""
+        # Pawn takes, own pawn retakes: 0 - 320 + 100
+        self._assert_see("4k3/8/8/8/3p4/8/1P6/1N2K3 w - - 0 1", "b1c3", -220)
+        self._assert_see("4k3/8/8/8/3p4/8/8/1N2K3 w - - 0 1", "b1c3", -320)
+
+    def test_see_defended_and_undefended_capture(self):
+        """Test a rook taking a knight with and without a pawn defender"""
+        self._assert_see("4k3/8/8/3n4/8/8/8/3RK3 w - - 0 1", "d1d5", 320)
+        self._assert_see("4k3/8/2p5/3n4/8/8/8/3RK3 w - - 0 1", "d1d5", -180)
+
+    def test_see_en_passant(self):
+        """Test that en passant captures the pawn beside the target square"""
+        self._assert_see("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2", "e5d6", 100)
+        self._assert_see("4k3/2p5/8/3pP3/8/8/8/4K3 w - d6 0 2", "e5d6", 0)
+
+    def test_see_promotion_loses_promoted_piece(self):
+        """Test that the recapture on the promotion square takes a queen"""
+        self._assert_see("7r/P3k3/8/8/8/8/8/4K3 w - - 0 1", "a7a8q", -900)
+
+    def test_see_king_cannot_recapture_into_attack(self):
+        """Test that the king only recaptures on an undefended square"""
+        self._assert_see("4k3/5p2/8/7Q/2B5/8/8/4K3 w - - 0 1", "h5f7", 100)
+        self._assert_see("4k3/5p2/8/7Q/8/8/8/4K3 w - - 0 1", "h5f7", -800)
+
+    def test_best_move_wins_material(self):
+        """Test that the root search finds a knight fork winning the queen"""
+        fen = "4k3/1q6/8/8/2N5/8/8/6K1 w - - 0 1"
+        move, score = _MaterialSearch().find_best_move_optimized(fen)
+        self.assertEqual(move, 'c4d6')
+        self.assertEqual(score, PIECE_VALUES[chess.KNIGHT])
+
+    def test_best_move_legal_without_time(self):
+        """Test that a search out of time still returns a legal move"""
+        for fen in self.SEARCH_FENS:
+            search = _MaterialSearch()
+            search.time_limit = 0.001
+            move, _ = search.find_best_move_optimized(fen)
+            self.assertIn(chess.Move.from_uci(move), chess.Board(fen).legal_moves, fen)
+
+
+class TestMoveLearnerPGN(unittest.TestCase):
+    """Test that the regex PGN reader sees the same mainline as chess.pgn"""
+
+    PGN = """[Event "Test"]
+[Site "?"]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 { King's pawn; a brace comment mentioning Nf3 } d5 2. exd5 $1
+(2. e5 (2. Nc3 d4 3. Nce2) c5 { inside a variation }) c6
+3. dxc6 Nf6 ; a line comment with Qh5 in it
+4. cxb7 Bd7 $2 5. bxa8=Q Qc7 6. Nf3! e6 7. Bb5 (7. Bd3 Be7) Be7 8. O-O O-O
+9. Qxb8 Bc8 10. Qxc7 1-0
+"""
+
+    # Castling written with zeros, and a second game after the first
+    ZERO_CASTLING_PGN = """[Event "Zeros"]
+[Result "1/2-1/2"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bc4 Bc5 4. 0-0 Nf6 5. d3 0-0 6. Nc3 d6 1/2-1/2
+
+[Event "Second"]
+[Result "0-1"]
+
+1. d4 d5 2. c4 0-1
+"""
+
+    TABLES = {
+        'observed_moves': 'piece_type, from_square, to_square, is_capture, times_observed, '
+                          'games_seen, friendly_pieces, enemy_pieces',
+        'piece_movement_patterns': 'piece_type, max_distance, can_jump, direction_type, '
+                                   'observations',
+        'game_end_patterns': 'end_type, position_features, times_seen',
+    }
+
+    @staticmethod
+    def _with_fen_header(pgn):
+        """The same PGN with a [FEN] header, which sends MoveLearner through
+        chess.pgn.read_game instead of mainline_sans"""
+        return pgn.replace('[Result ', f'[SetUp "1"]\n[FEN "{chess.STARTING_FEN}"]\n[Result ', 1)
+
+    @staticmethod
+    def _read_game_sans(pgn):
+        """SAN mainline of the first game in pgn, as read by chess.pgn"""
+        game = chess.pgn.read_game(io.StringIO(pgn))
+        board = game.board()
+        sans = []
+        for move in game.mainline_moves():
+            sans.append(board.san(move))
+            board.push(move)
+        return sans
+
+    def _observe(self, pgn):
+        """Rows of every learned table after observing pgn in a fresh learner"""
+        learner = MoveLearner(':memory:')
+        learner.observe_game_pgn(pgn)
+        tables = {table: learner.conn.execute(
+                      f'SELECT {columns} FROM {table} ORDER BY {columns}').fetchall()
+                  for table, columns in self.TABLES.items()}
+        learner.close()
+        return tables
+
+    def test_mainline_sans_matches_read_game(self):
+        """Test that comments, variations and NAGs are skipped"""
+        expected = self._read_game_sans(self.PGN)
+        self.assertEqual(len(expected), 19)
+        self.assertIn('bxa8=Q', expected)
+        self.assertEqual(mainline_sans(self.PGN), expected)
+
+    def test_zero_castling(self):
+        """Test that 0-0 castling is read as O-O"""
+        expected = self._read_game_sans(self.ZERO_CASTLING_PGN)
+        self.assertEqual(expected.count('O-O'), 2)
+        self.assertEqual(mainline_sans(self.ZERO_CASTLING_PGN), expected)
+        self.assertEqual(mainline_sans('1. e4 d5 2. 0-0-0 *'), ['e4', 'd5', 'O-O-O'])
+
+    def test_only_first_game_read(self):
+        """Test that reading stops at the first game's result"""
+        pgn = '[Event "a"]\n\n1. e4 e5 1-0\n\n[Event "b"]\n\n1. d4 d5 2. c4 0-1\n'
+        self.assertEqual(mainline_sans(pgn), ['e4', 'e5'])
+        self.assertEqual(mainline_sans(pgn), self._read_game_sans(pgn))
+        self.assertEqual(len(mainline_sans(self.ZERO_CASTLING_PGN)), 12)
+
+    def test_stops_at_null_move(self):
+        """Test that the mainline ends cleanly at a null move"""
+        for null in ('--', 'Z0'):
+            pgn = f'1. e4 e5 2. {null} Nc6 3. Nf3 *'
+            self.assertEqual(mainline_sans(pgn), ['e4', 'e5'])
+
+            observed = self._observe(pgn)['observed_moves']
+            self.assertEqual(sum(row[4] for row in observed), 2)
+
+    def test_observed_tables_match_read_game(self):
+        """Test that both PGN paths learn exactly the same observations"""
+        for pgn, moves in ((self.PGN, 19), (self.ZERO_CASTLING_PGN, 12)):
+            regex_tables = self._observe(pgn)
+            read_game_tables = self._observe(self._with_fen_header(pgn))
+
+            observed = sum(row[4] for row in regex_tables['observed_moves'])
+            self.assertEqual(observed, moves)
+            self.assertEqual(regex_tables, read_game_tables)
+
+
 def run_unit_tests():
     """Run the unit test suite"""
     loader = unittest.TestLoader()
@@ -348,6 +860,11 @@ def run_unit_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestCheckersBoard))
     suite.addTests(loader.loadTestsFromTestCase(TestCheckersGame))
     suite.addTests(loader.loadTestsFromTestCase(TestCheckersDifferentialScoring))
+    suite.addTests(loader.loadTestsFromTestCase(TestSQLitePool))
+    suite.addTests(loader.loadTestsFromTestCase(TestOpeningEvaluator))
+    suite.addTests(loader.loadTestsFromTestCase(TestOpeningPerformanceTracker))
+    suite.addTests(loader.loadTestsFromTestCase(TestOptimizedSearch))
+    suite.addTests(loader.loadTestsFromTestCase(TestMoveLearnerPGN))
 
     # Run tests with verbose output
     runner = unittest.TextTestRunner(verbosity=2)
@@ -43,7 +43,9 @@ class WeakSquareDetector:
             for pattern_name, weight, confidence in patterns:
                 self.weak_square_weights[pattern_name] = {
                     'weight': weight,
-                    'confidence': confidence
+                    'confidence': confidence,
+                    # Check for this pattern, resolved once from its name
+                    'matcher': self._classify(pattern_name)
                 }
 
             if self.weak_square_weights:
@@ -74,12 +76,11 @@ class WeakSquareDetector:
         score = 0.0
 
         # Check discovered weak square patterns
-        for pattern_name, data in self.weak_square_weights.items():
-            weight = data['weight']
-            confidence = data['confidence']
+        for data in self.weak_square_weights.values():
+            matcher = data['matcher']
 
-            if self._pattern_matches(pattern_name, board_part):
-                score += weight * confidence
+            if matcher is not None and matcher(board_part):
+                score += data['weight'] * data['confidence']
 
         return score
 
@@ -94,6 +95,20 @@ class WeakSquareDetector:
         Returns:
             True if pattern matches
         """
+        matcher = self._classify(pattern_name)
+        return matcher is not None and matcher(board_part)
+
+    def _classify(self, pattern_name: str):
+        """
+        Map a pattern name to the method that checks for it, or None if
+        the name is not recognized
+
+        Args:
+            pattern_name: Name of the pattern
+
+        Returns:
+            Bound check method taking the FEN board part, or None
+        """
         pattern_lower = pattern_name.lower()
 
         # Placeholder pattern matching
@@ -104,12 +119,12 @@ class WeakSquareDetector:
         # - Weak color complex
 
         if "weak_color" in pattern_lower:
-            return self._has_weak_color_complex(board_part)
+            return self._has_weak_color_complex
 
         elif "hole" in pattern_lower:
-            return self._has_pawn_holes(board_part)
+            return self._has_pawn_holes
 
-        return False
+        return None
 
     def _has_weak_color_complex(self, board_part: str) -> bool:
         """Check for weak color complex (e.g., missing light/dark squared bishop)"""